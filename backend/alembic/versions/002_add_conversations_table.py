@@ -0,0 +1,46 @@
+"""Add materialized conversations table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-08-12 10:00:00.000000
+
+Run `python backfill_conversations.py` after upgrading to populate the
+table from the existing messages.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('conversations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_a_id', sa.Integer(), nullable=False),
+    sa.Column('user_b_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('last_at', sa.DateTime(), nullable=False),
+    sa.Column('unread_count_a', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('unread_count_b', sa.Integer(), nullable=False, server_default='0'),
+    sa.CheckConstraint('user_a_id < user_b_id', name='ordered_conversation_pair'),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_a_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_b_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_a_id', 'user_b_id', name='unique_conversation_pair')
+    )
+    op.create_index(op.f('ix_conversations_id'), 'conversations', ['id'], unique=False)
+    op.create_index('ix_conversations_user_a_last_at', 'conversations', ['user_a_id', 'last_at'], unique=False)
+    op.create_index('ix_conversations_user_b_last_at', 'conversations', ['user_b_id', 'last_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversations_user_b_last_at', table_name='conversations')
+    op.drop_index('ix_conversations_user_a_last_at', table_name='conversations')
+    op.drop_index(op.f('ix_conversations_id'), table_name='conversations')
+    op.drop_table('conversations')
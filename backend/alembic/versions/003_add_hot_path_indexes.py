@@ -0,0 +1,64 @@
+"""Add composite and partial indexes for hot filter paths
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-08-14 09:30:00.000000
+
+Indexes are built with CREATE INDEX CONCURRENTLY so the tables stay
+writable during the upgrade; that statement cannot run inside a
+transaction, hence the autocommit block.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    # messages.py: inbox, threads and unread counts
+    ('ix_messages_sender_created_at', 'messages', ['sender_id', 'created_at', 'id'], None),
+    ('ix_messages_recipient_created_at', 'messages', ['recipient_id', 'created_at', 'id'], None),
+    ('ix_messages_project_created_at', 'messages', ['project_id', 'created_at', 'id'], None),
+    ('ix_messages_application_created_at', 'messages', ['application_id', 'created_at', 'id'], None),
+    ('ix_messages_recipient_unread', 'messages', ['recipient_id', 'sender_id'], 'is_read = false'),
+    # applications.py: my applications, project applications, rejecting pending ones
+    ('ix_applications_project_created_at', 'applications', ['project_id', 'created_at', 'id'], None),
+    ('ix_applications_creative_created_at', 'applications', ['creative_id', 'created_at', 'id'], None),
+    ('ix_applications_project_pending', 'applications', ['project_id'], "status = 'pending'"),
+    # payments.py: my payments, project payments, confirm by intent id
+    ('ix_payments_project_created_at', 'payments', ['project_id', 'created_at', 'id'], None),
+    ('ix_payments_client_created_at', 'payments', ['client_id', 'created_at', 'id'], None),
+    ('ix_payments_creative_created_at', 'payments', ['creative_id', 'created_at', 'id'], None),
+    ('ix_payments_stripe_payment_intent_id', 'payments', ['stripe_payment_intent_id'], None),
+    # projects.py: browse, my projects, status filters
+    ('ix_projects_created_at', 'projects', ['created_at', 'id'], None),
+    ('ix_projects_client_created_at', 'projects', ['client_id', 'created_at', 'id'], None),
+    ('ix_projects_client_status', 'projects', ['client_id', 'status'], None),
+    ('ix_projects_status_created_at', 'projects', ['status', 'created_at', 'id'], None),
+    ('ix_projects_hired_creative_id', 'projects', ['hired_creative_id'], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,48 @@
+"""Add indexes for project search
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 10:00:00.000000
+
+GET /projects/search filters on category, status, budget and
+required_skills overlap, sorted by recency or budget. The skills filter
+uses the `&&` operator, which only a GIN index can serve. Built
+concurrently, like 003.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+# (name, columns or expressions, index method)
+INDEXES = [
+    ('ix_projects_category_status_created_at', ['category', 'status', 'created_at', 'id'], 'btree'),
+    # Same expression as the budget sort key in projects.py
+    ('ix_projects_status_budget', ['status', sa.text('coalesce(budget_max, 0.0)'), 'id'], 'btree'),
+    ('ix_projects_required_skills', ['required_skills'], 'gin'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, using in INDEXES:
+            op.create_index(
+                name,
+                'projects',
+                columns,
+                unique=False,
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, using in reversed(INDEXES):
+            op.drop_index(name, table_name='projects', postgresql_concurrently=True, if_exists=True)
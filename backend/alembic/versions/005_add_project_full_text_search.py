@@ -0,0 +1,51 @@
+"""Add full-text search over project titles and descriptions
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 11:00:00.000000
+
+Adds a generated `search_vector` tsvector column (title weighted A,
+description B) and a GIN index on it for GET /projects/search?q=.
+Adding a stored generated column rewrites the projects table under an
+exclusive lock, so run this in a quiet window; the index is then built
+concurrently.
+
+PostgreSQL only: SQLite databases get an FTS5 table from
+`app.db.fulltext` when the schema is created.
+"""
+from alembic import op
+
+from app.db.fulltext import SEARCH_VECTOR_SQL
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        f"ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_search_vector',
+            'projects',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_search_vector', table_name='projects', postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,52 @@
+"""Add partial indexes for the creative directory
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 12:00:00.000000
+
+GET /users/creatives only reads active creatives, so every index is
+partial on that predicate and stays small next to clients and inactive
+accounts. Built concurrently, like 003.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+CREATIVES = "role = 'creative' AND is_active = true"
+
+# (name, columns or expressions, index method)
+INDEXES = [
+    ('ix_users_creatives_created_at', ['created_at', 'id'], 'btree'),
+    ('ix_users_creatives_type_created_at', ['creative_type', 'created_at', 'id'], 'btree'),
+    ('ix_users_creatives_hourly_rate', ['hourly_rate'], 'btree'),
+    # Case-insensitive prefix match: lower(location) LIKE 'miami%'
+    ('ix_users_creatives_location', [sa.text('lower(location) varchar_pattern_ops')], 'btree'),
+    ('ix_users_creatives_skills', ['skills'], 'gin'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, using in INDEXES:
+            op.create_index(
+                name,
+                'users',
+                columns,
+                unique=False,
+                postgresql_using=using,
+                postgresql_where=sa.text(CREATIVES),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, using in reversed(INDEXES):
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,25 @@
+"""Add content hash to project files
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 13:00:00.000000
+
+Uploads now record the SHA-256 of the stored bytes. Existing rows keep
+NULL.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('project_files', sa.Column('sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('project_files', 'sha256')
@@ -0,0 +1,42 @@
+"""Add multipart uploads
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 14:00:00.000000
+
+Multipart uploads can exceed 2GB, so project_files.file_size becomes a
+bigint.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('multipart_uploads',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('uploader_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('file_type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['uploader_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_multipart_uploads_id'), 'multipart_uploads', ['id'], unique=False)
+    op.create_index(op.f('ix_multipart_uploads_project_id'), 'multipart_uploads', ['project_id'], unique=False)
+    op.alter_column('project_files', 'file_size', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('project_files', 'file_size', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=True)
+    op.drop_index(op.f('ix_multipart_uploads_project_id'), table_name='multipart_uploads')
+    op.drop_index(op.f('ix_multipart_uploads_id'), table_name='multipart_uploads')
+    op.drop_table('multipart_uploads')
@@ -0,0 +1,52 @@
+"""Content-addressed project files
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 16:00:00.000000
+
+Project files are stored once per SHA-256 under uploads/blobs, with the
+project_files rows that carry the hash as references. Indexes sha256 and
+moves files stored by id (uploads/project_files/<id>) into the blob store.
+"""
+import os
+import shutil
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.utils.file_storage import blob_path
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def _legacy_path(file_id) -> str:
+    return os.path.join(settings.UPLOAD_DIRECTORY, "project_files", str(file_id))
+
+
+def _stored_files():
+    return op.get_bind().execute(sa.text("SELECT id, sha256 FROM project_files WHERE sha256 IS NOT NULL"))
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_project_files_sha256'), 'project_files', ['sha256'], unique=False)
+    for file_id, sha256 in _stored_files():
+        source = _legacy_path(file_id)
+        if not os.path.exists(source):
+            continue
+        destination = blob_path(sha256)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(source, destination)
+
+
+def downgrade() -> None:
+    for file_id, sha256 in _stored_files():
+        source = blob_path(sha256)
+        if os.path.exists(source):
+            os.makedirs(os.path.dirname(_legacy_path(file_id)), exist_ok=True)
+            shutil.copyfile(source, _legacy_path(file_id))
+    op.drop_index(op.f('ix_project_files_sha256'), table_name='project_files')
@@ -0,0 +1,25 @@
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.auth.dependencies import get_current_admin_user
+from app.core.timing import TimedRoute
+from app.db.database import db_manager
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(get_current_admin_user),
+) -> Dict[str, Any]:
+    """
+    Connection pool usage and checkout timings for every database engine.
+    
+    Engines without a QueuePool (e.g. SQLite in development) are not listed.
+    """
+    return db_manager.pool_report()
@@ -1,9 +1,11 @@
+import logging
 from typing import Any, List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.timing import TimedRoute
 from app.db.database import get_db
 from app.models.user import User
 from app.models.project import Project
@@ -21,8 +23,12 @@ from app.auth.dependencies import (
     get_current_client_user,
     get_current_creative_user
 )
+from app.utils.eager_loading import eager_load
+from app.utils.pagination import CursorParams, paginate
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/", response_model=ApplicationSchema)
 def create_application(
@@ -89,19 +95,23 @@ def get_my_applications(
     *,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_creative_user),
+    response: Response,
+    page: CursorParams = Depends(),
     status: Optional[str] = None,
 ) -> Any:
     """
-    Get all applications created by the current user (creative only).
+    Get applications created by the current user, newest first (creative only).
     """
-    # Base query
-    query = db.query(Application).filter(Application.creative_id == current_user.id)
+    # Base query, with the projects the response includes loaded up front
+    query = db.query(Application).options(*eager_load(Application, ApplicationWithProject)).filter(
+        Application.creative_id == current_user.id
+    )
     
     # Apply status filter if provided
     if status:
         query = query.filter(Application.status == status)
     
-    applications = query.all()
+    applications = paginate(query, Application, page, response)
     return applications
 
 @router.get("/project/{project_id}", response_model=List[ApplicationWithCreative])
@@ -110,9 +120,11 @@ def get_project_applications(
     db: Session = Depends(get_db),
     project_id: str,
     current_user: User = Depends(get_current_client_user),
+    response: Response,
+    page: CursorParams = Depends(),
 ) -> Any:
     """
-    Get all applications for a specific project (client only).
+    Get applications for a specific project, newest first (client only).
     """
     # Check if project exists and belongs to the client
     project_id_uuid = uuid.UUID(project_id)
@@ -127,8 +139,11 @@ def get_project_applications(
             detail="Project not found or you don't have permission",
         )
     
-    # Get all applications for the project
-    applications = db.query(Application).filter(Application.project_id == project_id_uuid).all()
+    # Get a page of applications for the project
+    query = db.query(Application).options(*eager_load(Application, ApplicationWithCreative)).filter(
+        Application.project_id == project_id_uuid
+    )
+    applications = paginate(query, Application, page, response)
     return applications
 
 @router.get("/{application_id}", response_model=ApplicationWithDetails)
@@ -142,7 +157,9 @@ def get_application(
     Get a specific application by id.
     """
     application_id_uuid = uuid.UUID(application_id)
-    application = db.query(Application).filter(Application.id == application_id_uuid).first()
+    application = db.query(Application).options(*eager_load(Application, ApplicationWithDetails)).filter(
+        Application.id == application_id_uuid
+    ).first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -150,8 +167,7 @@ def get_application(
         )
     
     # Check permissions (only the applicant or the project owner can view)
-    project = db.query(Project).filter(Project.id == application.project_id).first()
-    if application.creative_id != current_user.id and project.client_id != current_user.id:
+    if application.creative_id != current_user.id and application.project.client_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
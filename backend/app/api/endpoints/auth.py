@@ -5,19 +5,21 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.core.config import settings
+from app.core.timing import TimedRoute
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, Token
-from app.auth.password import get_password_hash
+from app.auth.password import get_password_hash_async
 from app.auth.providers.factory import get_provider
 from app.auth.config import get_current_auth_provider
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 # Get the authentication provider based on settings
 AUTH_PROVIDER_NAME = get_current_auth_provider()
@@ -25,7 +27,7 @@ auth_provider = get_provider(AUTH_PROVIDER_NAME)
 
 
 @router.post("/register", response_model=UserSchema)
-async def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any:
+async def register(*, db: AsyncSession = Depends(get_async_db), user_in: UserCreate) -> Any:
     """
     Register a new user.
     """
@@ -33,7 +35,7 @@ async def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any
     logger.debug(f"Registration data: first_name={user_in.first_name}, last_name={user_in.last_name}, role={user_in.role}")
     
     # Check if user with this email already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = (await db.execute(select(User).where(User.email == user_in.email))).scalars().first()
     if user:
         logger.warning(f"Registration failed: User with email {user_in.email} already exists")
         raise HTTPException(
@@ -57,10 +59,10 @@ async def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any
             detail="Invalid role. Must be 'creative', 'client', or 'admin'."
         )
     
-    # Create new user
+    # Create new user (bcrypt runs in the hashing pool)
     db_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         first_name=user_in.first_name,
         last_name=user_in.last_name,
         role=user_in.role,
@@ -72,15 +74,15 @@ async def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any
     )
     logger.info(f"User {user_in.email} registered successfully with role {user_in.role}")
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     logger.info(f"User {db_user.email} created with ID {db_user.id}")
     return db_user
 
 
 @router.post("/login", response_model=Token)
 async def login(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
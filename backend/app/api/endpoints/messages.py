@@ -1,12 +1,21 @@
+import logging
 from typing import Any, List, Optional
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc, func
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import or_, and_, select
 
-from app.db.database import get_db
+from app.core.timing import TimedRoute
+from app.db.database import get_async_db, get_async_read_db
+from app.db.conversations import (
+    INBOX_ORDER,
+    get_conversation_summaries,
+    mark_messages_read,
+    record_message
+)
 from app.models.user import User
 from app.models.message import Message
 from app.models.project import Project
@@ -17,16 +26,22 @@ from app.schemas.message import (
     MessageUpdate,
     MessageWithSender,
     MessageWithUsers,
+    MessageReadRequest,
+    MessageReadResult,
     Conversation
 )
 from app.auth.dependencies import get_current_active_user
+from app.utils.eager_loading import eager_load
+from app.utils.pagination import CursorParams, paginate_async
+
+logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/", response_model=MessageSchema)
-def create_message(
+async def create_message(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     message_in: MessageCreate,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
@@ -38,7 +53,7 @@ def create_message(
     
     # Convert recipient_id to integer (user IDs are integers, not UUIDs)
     recipient_id_int = int(message_in.recipient_id)
-    recipient = db.query(User).filter(User.id == recipient_id_int).first()
+    recipient = (await db.execute(select(User).where(User.id == recipient_id_int))).scalars().first()
     if not recipient:
         logger.warning(f"Message creation failed: Recipient {recipient_id_int} not found for sender {current_user.id}")
         raise HTTPException(
@@ -49,7 +64,7 @@ def create_message(
     # If project_id is provided, check if it exists and if both users are involved
     if message_in.project_id:
         project_id_uuid = uuid.UUID(message_in.project_id)
-        project = db.query(Project).filter(Project.id == project_id_uuid).first()
+        project = (await db.execute(select(Project).where(Project.id == project_id_uuid))).scalars().first()
         if not project:
             logger.warning(f"Message creation failed: Project {message_in.project_id} not found")
             raise HTTPException(
@@ -69,7 +84,7 @@ def create_message(
     # If application_id is provided, check if it exists and if both users are involved
     if message_in.application_id:
         application_id_uuid = uuid.UUID(message_in.application_id)
-        application = db.query(Application).filter(Application.id == application_id_uuid).first()
+        application = (await db.execute(select(Application).where(Application.id == application_id_uuid))).scalars().first()
         if not application:
             logger.warning(f"Message creation failed: Application {message_in.application_id} not found")
             raise HTTPException(
@@ -78,7 +93,7 @@ def create_message(
             )
         
         # Get the project
-        project = db.query(Project).filter(Project.id == application.project_id).first()
+        project = (await db.execute(select(Project).where(Project.id == application.project_id))).scalars().first()
         
         # Check if both users are involved in the application
         if (application.creative_id != current_user.id and project.client_id != current_user.id) or \
@@ -99,28 +114,32 @@ def create_message(
         is_read=False
     )
     db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    await db.flush()
+    await db.run_sync(record_message, db_message)
+    await db.commit()
+    await db.refresh(db_message)
     
     logger.info(f"Message created successfully with ID: {db_message.id} from user {current_user.id} to {recipient_id_int}")
     return db_message
 
 @router.get("/", response_model=List[MessageWithSender])
-def get_messages(
+async def get_messages(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
+    response: Response,
+    page: CursorParams = Depends(),
     other_user_id: Optional[str] = None,
     project_id: Optional[str] = None,
     application_id: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 50,
 ) -> Any:
     """
-    Get messages with filters.
+    Get messages with filters, newest first.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the next page.
     """
-    # Base query - messages where current user is sender or recipient
-    query = db.query(Message).filter(
+    # Base query - messages where current user is sender or recipient,
+    # with the relationships the response model needs loaded up front
+    query = select(Message).options(*eager_load(Message, MessageWithSender)).where(
         or_(
             Message.sender_id == current_user.id,
             Message.recipient_id == current_user.id
@@ -151,83 +170,44 @@ def get_messages(
         application_id_uuid = uuid.UUID(application_id)
         query = query.filter(Message.application_id == application_id_uuid)
     
-    # Order by creation time (newest first) and apply pagination
-    messages = query.order_by(desc(Message.created_at)).offset(skip).limit(limit).all()
+    # Order by creation time (newest first) and apply keyset pagination
+    messages = await paginate_async(db, query, Message, page, response)
     
-    # Mark messages as read if current user is recipient
-    for message in messages:
-        if message.recipient_id == current_user.id and not message.is_read:
-            message.is_read = True
-            db.add(message)
-    
-    db.commit()
+    # Mark messages as read if current user is recipient, in one statement
+    unread_ids = [
+        message.id for message in messages
+        if message.recipient_id == current_user.id and not message.is_read
+    ]
+    if unread_ids:
+        marked = await db.run_sync(mark_messages_read, current_user.id, Message.id.in_(unread_ids))
+        marked_ids = {row.id for row in marked}
+        await db.commit()
+        for message in messages:
+            if message.id in marked_ids:
+                set_committed_value(message, "is_read", True)
     
     return messages
 
 @router.get("/conversations", response_model=List[Conversation])
-def get_conversations(
+async def get_conversations(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    response: Response,
+    page: CursorParams = Depends(),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get all conversations for the current user.
+    Get the current user's conversations, latest message first.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the
+    next page.
     """
-    # This is a more complex query that would typically use raw SQL or complex ORM operations
-    # For simplicity, we'll use a less efficient but functional approach
-    
-    # Get all users the current user has exchanged messages with
-    user_ids = db.query(Message.sender_id).filter(Message.recipient_id == current_user.id).distinct().all()
-    user_ids.extend(db.query(Message.recipient_id).filter(Message.sender_id == current_user.id).distinct().all())
-    
-    # Flatten and deduplicate the list
-    user_ids = list(set([user_id[0] for user_id in user_ids if user_id[0] != current_user.id]))
-    
-    conversations = []
-    for user_id in user_ids:
-        # Get the other user
-        other_user = db.query(User).filter(User.id == user_id).first()
-        
-        # Get the latest message between the two users
-        latest_message = db.query(Message).filter(
-            or_(
-                and_(
-                    Message.sender_id == current_user.id,
-                    Message.recipient_id == user_id
-                ),
-                and_(
-                    Message.sender_id == user_id,
-                    Message.recipient_id == current_user.id
-                )
-            )
-        ).order_by(desc(Message.created_at)).first()
-        
-        # Count unread messages
-        unread_count = db.query(func.count(Message.id)).filter(
-            Message.sender_id == user_id,
-            Message.recipient_id == current_user.id,
-            Message.is_read == False
-        ).scalar()
-        
-        # Create conversation object
-        conversation = {
-            "user": other_user,
-            "last_message": latest_message,
-            "unread_count": unread_count,
-            "updated_at": latest_message.created_at
-        }
-        
-        conversations.append(conversation)
-    
-    # Sort by latest message time
-    conversations.sort(key=lambda x: x["updated_at"], reverse=True)
-    
-    return conversations
+    summaries = await db.run_sync(get_conversation_summaries, current_user.id, page)
+    return INBOX_ORDER.finish_page(summaries, page, response)
 
 @router.put("/{message_id}/read", response_model=MessageSchema)
-def mark_message_as_read(
+async def mark_message_as_read(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     message_id: str,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
@@ -235,7 +215,7 @@ def mark_message_as_read(
     Mark a message as read.
     """
     message_id_uuid = uuid.UUID(message_id)
-    message = db.query(Message).filter(Message.id == message_id_uuid).first()
+    message = (await db.execute(select(Message).where(Message.id == message_id_uuid))).scalars().first()
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -250,8 +230,40 @@ def mark_message_as_read(
         )
     
     # Mark as read
-    message.is_read = True
-    db.add(message)
-    db.commit()
-    db.refresh(message)
+    if not message.is_read:
+        await db.run_sync(mark_messages_read, current_user.id, Message.id == message.id)
+        await db.commit()
+        set_committed_value(message, "is_read", True)
     return message
+
+@router.post("/read", response_model=MessageReadResult)
+async def mark_messages_as_read(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    read_in: MessageReadRequest,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Mark a whole thread or project as read, optionally only up to a timestamp.
+    """
+    if read_in.other_user_id is None and read_in.project_id is None and read_in.application_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One of other_user_id, project_id or application_id is required",
+        )
+    
+    criteria = []
+    if read_in.other_user_id is not None:
+        criteria.append(Message.sender_id == read_in.other_user_id)
+    if read_in.project_id is not None:
+        criteria.append(Message.project_id == read_in.project_id)
+    if read_in.application_id is not None:
+        criteria.append(Message.application_id == read_in.application_id)
+    if read_in.up_to is not None:
+        criteria.append(Message.created_at <= read_in.up_to)
+    
+    marked = await db.run_sync(mark_messages_read, current_user.id, *criteria)
+    await db.commit()
+    
+    logger.info(f"Marked {len(marked)} messages as read for user {current_user.id}")
+    return {"marked_count": len(marked)}
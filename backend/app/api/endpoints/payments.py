@@ -3,10 +3,11 @@ from typing import Any, List, Optional
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.core.timing import TimedRoute
+from app.db.database import get_db, get_read_db
 from app.models.user import User
 from app.models.project import Project
 from app.models.payment import Payment
@@ -26,10 +27,12 @@ from app.auth.dependencies import (
     get_current_creative_user
 )
 from app.core.config import settings
+from app.utils.eager_loading import eager_load
+from app.utils.pagination import CursorParams, paginate
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/create-intent", response_model=PaymentIntentResponse)
 def create_payment_intent(
@@ -207,9 +210,11 @@ def get_project_payments(
     db: Session = Depends(get_db),
     project_id: str,
     current_user: User = Depends(get_current_active_user),
+    response: Response,
+    page: CursorParams = Depends(),
 ) -> Any:
     """
-    Get all payments for a specific project.
+    Get payments for a specific project, newest first.
     """
     # Check if project exists
     project_id_uuid = uuid.UUID(project_id)
@@ -227,19 +232,24 @@ def get_project_payments(
             detail="Not enough permissions",
         )
     
-    # Get all payments for the project
-    payments = db.query(Payment).filter(Payment.project_id == project_id_uuid).all()
+    # Get a page of payments for the project
+    query = db.query(Payment).options(*eager_load(Payment, PaymentWithDetails)).filter(
+        Payment.project_id == project_id_uuid
+    )
+    payments = paginate(query, Payment, page, response)
     return payments
 
 @router.get("/me", response_model=List[PaymentWithProject])
 def get_my_payments(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
+    response: Response,
+    page: CursorParams = Depends(),
     status: Optional[str] = None,
 ) -> Any:
     """
-    Get all payments for the current user (as client or creative).
+    Get payments for the current user (as client or creative), newest first.
     """
     # Base query
     if current_user.role == "client":
@@ -251,7 +261,8 @@ def get_my_payments(
     if status:
         query = query.filter(Payment.status == status)
     
-    payments = query.all()
+    query = query.options(*eager_load(Payment, PaymentWithProject))
+    payments = paginate(query, Payment, page, response)
     return payments
 
 @router.get("/{payment_id}", response_model=PaymentWithDetails)
@@ -265,7 +276,9 @@ def get_payment(
     Get a specific payment by id.
     """
     payment_id_uuid = uuid.UUID(payment_id)
-    payment = db.query(Payment).filter(Payment.id == payment_id_uuid).first()
+    payment = db.query(Payment).options(*eager_load(Payment, PaymentWithDetails)).filter(
+        Payment.id == payment_id_uuid
+    ).first()
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
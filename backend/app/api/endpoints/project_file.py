@@ -1,7 +1,546 @@
-from fastapi import APIRouter
+import calendar
+import logging
+import os
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, List, Optional, Tuple
+from urllib.parse import quote
 
-router = APIRouter()
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_active_user
+from app.core.config import settings
+from app.core.timing import TimedRoute
+from app.db.database import get_async_db
+from app.db.lazy_session import release_sessions, sessions_to_release
+from app.models.project import Project
+from app.models.multipart_upload import MultipartUpload
+from app.models.project_file import ProjectFile
+from app.models.user import User
+from app.schemas.project_file import (
+    MultipartUpload as MultipartUploadSchema,
+    MultipartUploadCreate,
+    ProjectFile as ProjectFileSchema,
+    UploadedPart,
+)
+from app.utils.file_storage import (
+    FileTooLargeError,
+    StoredFile,
+    assemble_parts,
+    blob_path,
+    claim_parts,
+    commit_file,
+    discard_file,
+    list_parts,
+    multipart_directory,
+    part_path,
+    receive_file,
+    release_parts,
+    remove_parts,
+    store_blob,
+    touch_blob,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/")
 def read_files():
     return {"message": "Project files endpoint is working."}
+
+
+async def get_member_project(db: AsyncSession, project_id: uuid.UUID, user: User) -> Project:
+    """
+    Load a project the user takes part in (its client or hired creative),
+    the same rule as get_project_payments.
+    """
+    project = (await db.execute(select(Project).where(Project.id == project_id))).scalar_one_or_none()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    if project.client_id != user.id and project.hired_creative_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return project
+
+
+def _too_large(max_size: int, what: str = "File") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"{what} exceeds the maximum size of {max_size} bytes",
+    )
+
+
+def _clean_filename(filename: str) -> str:
+    name = os.path.basename(filename.replace("\\", "/")).strip()
+    if not name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid filename",
+        )
+    return name
+
+
+def _declared_size(request: Request) -> int:
+    content_length = request.headers.get("content-length")
+    return int(content_length) if content_length and content_length.isdigit() else 0
+
+
+async def _release_connections(db: AsyncSession) -> None:
+    """
+    Hand every connection the request holds back to the pool before a body
+    streams in: the async session's, and those of sync sessions opened by
+    dependencies such as authentication.
+    """
+    await db.commit()
+    sessions = sessions_to_release()
+    if sessions:
+        await to_thread.run_sync(release_sessions, sessions)
+
+
+async def _add_file(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    uploader: User,
+    filename: str,
+    file_type: str,
+    size: int,
+    sha256: str,
+) -> ProjectFile:
+    file_id = uuid.uuid4()
+    project_file = ProjectFile(
+        id=file_id,
+        project_id=project_id,
+        uploader_id=uploader.id,
+        filename=filename,
+        file_url=f"{settings.API_V1_STR}/files/{file_id}/content",
+        file_size=size,
+        file_type=file_type,
+        sha256=sha256,
+    )
+    db.add(project_file)
+    await db.commit()
+    await db.refresh(project_file)
+    return project_file
+
+
+async def _record_file(
+    db: AsyncSession, stored: StoredFile, project_id: uuid.UUID, uploader: User, filename: str, file_type: str
+) -> ProjectFile:
+    """Move received bytes into the blob store and add their ProjectFile row."""
+    try:
+        created = await to_thread.run_sync(store_blob, stored)
+    except BaseException:
+        await to_thread.run_sync(discard_file, stored)
+        raise
+    # If the row is not committed, a new blob is left for the garbage collector
+    project_file = await _add_file(db, project_id, uploader, filename, file_type, stored.size, stored.sha256)
+    logger.info(
+        f"Stored file {project_file.id} ({stored.size} bytes) for project {project_id}"
+        + ("" if created else f", sharing blob {stored.sha256}")
+    )
+    return project_file
+
+
+async def _find_known_file(
+    db: AsyncSession, sha256: str, project_id: uuid.UUID, user: User
+) -> Optional[ProjectFile]:
+    """
+    A stored file with this hash that the user already has access to: one
+    they uploaded, or one in the same project. Knowing a hash alone must
+    not let someone attach another project's file to theirs.
+    """
+    query = (
+        select(ProjectFile)
+        .where(
+            ProjectFile.sha256 == sha256,
+            or_(ProjectFile.uploader_id == user.id, ProjectFile.project_id == project_id),
+        )
+        .limit(1)
+    )
+    return (await db.execute(query)).scalar_one_or_none()
+
+
+@router.post("/projects/{project_id}", response_model=ProjectFileSchema)
+async def upload_project_file(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    project_id: uuid.UUID,
+    filename: str = Query(..., min_length=1, max_length=255),
+    sha256: Optional[str] = Query(None, pattern="^[0-9a-fA-F]{64}$"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Upload a file to a project.
+
+    Send the raw bytes as the request body (not a multipart form), with the
+    file's type as `Content-Type`. The body is streamed to disk, never held
+    in memory, and rejected with 413 once it passes MAX_FILE_SIZE.
+
+    With `sha256`, the hex SHA-256 of the content: if a file with those
+    bytes is already stored, and was uploaded by you or to this project,
+    the body is not read at all and the new file shares the stored bytes.
+    Otherwise the body is checked against the hash.
+    """
+    name = _clean_filename(filename)
+    await get_member_project(db, project_id, current_user)
+    file_type = request.headers.get("content-type", "application/octet-stream")
+    if sha256:
+        sha256 = sha256.lower()
+        known = await _find_known_file(db, sha256, project_id, current_user)
+        if known and await to_thread.run_sync(touch_blob, sha256):
+            logger.info(f"Upload to project {project_id} matched stored blob {sha256}; body skipped")
+            return await _add_file(db, project_id, current_user, name, file_type, known.file_size, sha256)
+    await _release_connections(db)
+
+    if _declared_size(request) > settings.MAX_FILE_SIZE:
+        raise _too_large(settings.MAX_FILE_SIZE)
+
+    try:
+        stored = await receive_file(request.stream(), settings.MAX_FILE_SIZE)
+    except FileTooLargeError:
+        logger.warning(f"Upload to project {project_id} by user {current_user.id} exceeded {settings.MAX_FILE_SIZE} bytes")
+        raise _too_large(settings.MAX_FILE_SIZE)
+    if stored.size == 0:
+        await to_thread.run_sync(discard_file, stored)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty file",
+        )
+    if sha256 and stored.sha256 != sha256:
+        await to_thread.run_sync(discard_file, stored)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Content does not match sha256",
+        )
+
+    return await _record_file(db, stored, project_id, current_user, name, file_type)
+
+
+@router.delete("/{file_id}")
+async def delete_project_file(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    file_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Delete a project file (its uploader or the project's client).
+    Stored bytes no other file shares are removed by the next garbage
+    collection sweep.
+    """
+    project_file = await db.get(ProjectFile, file_id)
+    if not project_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+    project = await get_member_project(db, project_file.project_id, current_user)
+    if project_file.uploader_id != current_user.id and project.client_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    await db.delete(project_file)
+    await db.commit()
+    logger.info(f"Deleted file {file_id} from project {project_file.project_id}")
+    return {"message": "File deleted"}
+
+
+# Downloads. A file's bytes never change (they are stored under their
+# hash), so the hash is a strong ETag and the upload time its Last-Modified.
+
+# Types a browser may render in place; anything else (HTML, SVG, ...) is
+# sent as an attachment so it cannot run script on the API's origin
+_INLINE_TYPES = ("image/png", "image/jpeg", "image/gif", "image/webp", "image/avif", "video/", "audio/", "application/pdf")
+
+
+def _last_modified(project_file: ProjectFile) -> Optional[str]:
+    if project_file.created_at is None:
+        return None
+    return formatdate(calendar.timegm(project_file.created_at.utctimetuple()), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is sent
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+@router.api_route("/{file_id}/content", methods=["GET", "HEAD"])
+async def download_project_file(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    file_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Download a project file (the project's client or hired creative).
+
+    Supports `Range` requests (206, e.g. for seeking in a video or resuming
+    a download) and conditional requests: `If-None-Match` with the ETag, or
+    `If-Modified-Since`, get a 304 when the client's copy is current.
+
+    The bytes are not read by this worker. With FILE_ACCEL_REDIRECT_PREFIX
+    set, the response tells the proxy in front (nginx `X-Accel-Redirect`) to
+    send the blob itself, using sendfile. Otherwise the file is handed to
+    the ASGI server as a path (`http.response.pathsend`) when it supports
+    that, or streamed in UPLOAD_CHUNK_SIZE blocks.
+    """
+    project_file = await db.get(ProjectFile, file_id)
+    if not project_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+    await get_member_project(db, project_file.project_id, current_user)
+    await db.commit()
+
+    path = blob_path(project_file.sha256) if project_file.sha256 else None
+    try:
+        stat_result = await to_thread.run_sync(os.stat, path) if path else None
+    except FileNotFoundError:
+        stat_result = None
+    if stat_result is None:
+        logger.warning(f"Content of file {file_id} is missing from storage")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File content not available",
+        )
+
+    etag = f'"{project_file.sha256}"'
+    last_modified = _last_modified(project_file)
+    headers = {
+        "ETag": etag,
+        # Revalidate every time, so access is checked on each use; unchanged
+        # files cost a 304
+        "Cache-Control": "private, no-cache",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = project_file.file_type or "application/octet-stream"
+    disposition = "inline" if media_type.startswith(_INLINE_TYPES) else "attachment"
+    headers["Content-Disposition"] = f"{disposition}; filename*=utf-8''{quote(project_file.filename)}"
+    if settings.FILE_ACCEL_REDIRECT_PREFIX:
+        relative = os.path.relpath(path, settings.UPLOAD_DIRECTORY).replace(os.sep, "/")
+        headers["X-Accel-Redirect"] = f"{settings.FILE_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{relative}"
+        return Response(media_type=media_type, headers=headers)
+
+    response = FileResponse(path, headers=headers, media_type=media_type, stat_result=stat_result)
+    response.chunk_size = settings.UPLOAD_CHUNK_SIZE
+    return response
+
+
+# Multipart uploads: initiate, send numbered parts (in parallel, retrying
+# any that fail), check which parts arrived, then complete. Parts can be
+# up to MULTIPART_MAX_PART_SIZE and the whole file MULTIPART_MAX_FILE_SIZE.
+
+async def _upload_status(upload: MultipartUpload) -> dict:
+    parts = await to_thread.run_sync(list_parts, multipart_directory(upload.id))
+    return {
+        "id": upload.id,
+        "project_id": upload.project_id,
+        "filename": upload.filename,
+        "file_type": upload.file_type,
+        "created_at": upload.created_at,
+        "max_part_size": settings.MULTIPART_MAX_PART_SIZE,
+        "max_parts": settings.MULTIPART_MAX_PARTS,
+        "parts": [{"part_number": number, "size": size} for number, size in parts],
+        "received_bytes": sum(size for _, size in parts),
+    }
+
+
+async def _get_own_upload(db: AsyncSession, upload_id: uuid.UUID, user: User) -> MultipartUpload:
+    upload = await db.get(MultipartUpload, upload_id)
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found",
+        )
+    if upload.uploader_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return upload
+
+
+@router.post("/projects/{project_id}/uploads", response_model=MultipartUploadSchema)
+async def create_multipart_upload(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    project_id: uuid.UUID,
+    upload_in: MultipartUploadCreate,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Start a multipart upload to a project.
+    """
+    await get_member_project(db, project_id, current_user)
+    upload = MultipartUpload(
+        project_id=project_id,
+        uploader_id=current_user.id,
+        filename=_clean_filename(upload_in.filename),
+        file_type=upload_in.file_type or "application/octet-stream",
+    )
+    db.add(upload)
+    await db.commit()
+    await db.refresh(upload)
+    logger.info(f"Started multipart upload {upload.id} for project {project_id}")
+    return await _upload_status(upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=MultipartUploadSchema)
+async def get_multipart_upload(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    upload_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a multipart upload with the parts received so far.
+    After a dropped connection, send only the parts missing here.
+    """
+    upload = await _get_own_upload(db, upload_id, current_user)
+    return await _upload_status(upload)
+
+
+@router.put("/uploads/{upload_id}/parts/{part_number}", response_model=UploadedPart)
+async def upload_part(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    upload_id: uuid.UUID,
+    part_number: int = Path(..., ge=1, le=settings.MULTIPART_MAX_PARTS),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Upload one part as the raw request body.
+    Parts may arrive in any order and in parallel; sending a part again
+    replaces it.
+    """
+    await _get_own_upload(db, upload_id, current_user)
+    await _release_connections(db)
+
+    if _declared_size(request) > settings.MULTIPART_MAX_PART_SIZE:
+        raise _too_large(settings.MULTIPART_MAX_PART_SIZE, "Part")
+    try:
+        stored = await receive_file(request.stream(), settings.MULTIPART_MAX_PART_SIZE)
+    except FileTooLargeError:
+        raise _too_large(settings.MULTIPART_MAX_PART_SIZE, "Part")
+
+    # Parallel parts can each pass this check; complete checks the total again
+    parts = await to_thread.run_sync(list_parts, multipart_directory(upload_id))
+    others = sum(size for number, size in parts if number != part_number)
+    if others + stored.size > settings.MULTIPART_MAX_FILE_SIZE:
+        await to_thread.run_sync(discard_file, stored)
+        raise _too_large(settings.MULTIPART_MAX_FILE_SIZE)
+
+    await to_thread.run_sync(commit_file, stored, part_path(upload_id, part_number))
+    logger.debug(f"Received part {part_number} ({stored.size} bytes) of upload {upload_id}")
+    return {"part_number": part_number, "size": stored.size, "sha256": stored.sha256}
+
+
+def _check_parts(parts: List[Tuple[int, int]]) -> None:
+    """Parts 1..N are all there and add up to at most MULTIPART_MAX_FILE_SIZE."""
+    received = {number for number, _ in parts}
+    missing = sorted(set(range(1, max(received, default=0) + 1)) - received)
+    if not parts or missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Missing parts: {missing}" if parts else "No parts received",
+        )
+    if sum(size for _, size in parts) > settings.MULTIPART_MAX_FILE_SIZE:
+        raise _too_large(settings.MULTIPART_MAX_FILE_SIZE)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=ProjectFileSchema)
+async def complete_multipart_upload(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    upload_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Assemble parts 1..N into the project file.
+    Every part number up to the highest one must have been received.
+    """
+    upload = await _get_own_upload(db, upload_id, current_user)
+    _check_parts(await to_thread.run_sync(list_parts, multipart_directory(upload_id)))
+    await db.commit()
+
+    try:
+        claimed = await to_thread.run_sync(claim_parts, upload_id)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is already being completed",
+        )
+    try:
+        # Checked again on what was claimed: parts may have been added
+        # (in parallel, each under the limit on its own) since
+        parts = await to_thread.run_sync(list_parts, claimed)
+        _check_parts(parts)
+        stored = await to_thread.run_sync(assemble_parts, claimed, parts)
+    except BaseException:
+        await to_thread.run_sync(release_parts, upload_id, claimed)
+        raise
+
+    try:
+        await db.delete(upload)
+        project_file = await _record_file(
+            db, stored, upload.project_id, current_user, upload.filename, upload.file_type
+        )
+    except BaseException:
+        # The parts are still intact; let the upload be completed again
+        await to_thread.run_sync(release_parts, upload_id, claimed)
+        raise
+    await to_thread.run_sync(remove_parts, claimed)
+    return project_file
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_multipart_upload(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    upload_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Abort a multipart upload and discard its parts.
+    """
+    upload = await _get_own_upload(db, upload_id, current_user)
+    await db.delete(upload)
+    await db.commit()
+    await to_thread.run_sync(remove_parts, multipart_directory(upload_id))
+    return {"message": "Upload aborted"}
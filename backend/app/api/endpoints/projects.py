@@ -1,35 +1,142 @@
-from typing import Any, List
+from typing import Any, List, Literal, Optional
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Float, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, with_expression
 
-from app.db.database import get_db
+from app.core.timing import TimedRoute
+from app.db.array_ops import array_overlap
+from app.db.database import get_db, get_async_db, get_async_read_db
+from app.db.fulltext import project_matches, project_rank, project_snippet, search_terms
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate, Project as ProjectSchema
+from app.schemas.project import ProjectCreate, ProjectUpdate, Project as ProjectSchema, ProjectSearchResult
 from app.auth.dependencies import get_current_active_user_dependency, get_current_client_user_dependency
 from app.models.user import User
+from app.utils.pagination import CursorParams, Keyset, paginate_async
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Budget sort key: projects without a maximum budget sort as 0. The literal
+# must be inlined for the planner to use ix_projects_status_budget.
+BUDGET_SORT = func.coalesce(Project.budget_max, literal_column("0.0", Float))
+
+SEARCH_ORDERS = {
+    "recent": Keyset.newest_first(Project),
+    "budget_desc": Keyset(BUDGET_SORT, Project.id, lambda project: project.budget_max or 0.0),
+    "budget_asc": Keyset(BUDGET_SORT, Project.id, lambda project: project.budget_max or 0.0, descending=False),
+}
 
 @router.get("/", response_model=List[ProjectSchema])
-def get_projects(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+async def get_projects(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    page: CursorParams = Depends(),
     current_user: User = Depends(get_current_active_user_dependency)
 ) -> Any:
     """
-    Retrieve projects.
+    Retrieve projects, newest first.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the next page.
     """
     logger.info(f"Fetching projects for user {current_user.id}")
-    projects = db.query(Project).offset(skip).limit(limit).all()
+    projects = await paginate_async(db, select(Project), Project, page, response)
     logger.debug(f"Found {len(projects)} projects")
     return projects
 
 
+@router.get("/search", response_model=List[ProjectSearchResult])
+async def search_projects(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    response: Response,
+    page: CursorParams = Depends(),
+    q: Optional[str] = Query(None, max_length=200, description="Words to find in the title or description"),
+    category: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None, description="Projects requiring any of these skills"),
+    min_budget: Optional[float] = Query(None, ge=0, description="Projects whose maximum budget reaches this"),
+    max_budget: Optional[float] = Query(None, ge=0, description="Projects whose minimum budget is at most this"),
+    max_timeline_weeks: Optional[int] = Query(None, ge=1),
+    project_status: Literal["draft", "active", "hired", "completed", "cancelled"] = Query("active", alias="status"),
+    sort: Optional[Literal["relevance", "recent", "budget_desc", "budget_asc"]] = None,
+    current_user: User = Depends(get_current_active_user_dependency)
+) -> Any:
+    """
+    Search projects with server-side filters, active ones by default.
+    With `q`, only projects containing every word are returned, best
+    matches first (title matches rank higher), each with a highlighted
+    `search_snippet` of its description. Without `q`, newest first.
+    Pass the `X-Next-Cursor` response header back as `cursor`, with the
+    same filters and sort, to get the next page.
+    """
+    logger.info(f"Searching projects for user {current_user.id}")
+    
+    terms = search_terms(q) if q else []
+    if q and not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query has no searchable words"
+        )
+    sort = sort or ("relevance" if terms else "recent")
+    if sort == "relevance" and not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sorting by relevance requires a search query"
+        )
+    
+    query = select(Project).where(Project.status == project_status)
+    if terms:
+        rank = project_rank(terms)
+        query = query.where(project_matches(terms)).options(
+            with_expression(Project.search_rank, rank),
+            with_expression(Project.search_snippet, project_snippet(terms)),
+        )
+    if category:
+        query = query.where(Project.category == category)
+    if skills:
+        query = query.where(array_overlap(Project.required_skills, skills))
+    if min_budget is not None:
+        query = query.where(Project.budget_max >= min_budget)
+    if max_budget is not None:
+        query = query.where(Project.budget_min <= max_budget)
+    if max_timeline_weeks is not None:
+        query = query.where(Project.timeline_weeks <= max_timeline_weeks)
+    
+    if sort == "relevance":
+        keyset = Keyset(rank, Project.id, lambda project: project.search_rank)
+    else:
+        keyset = SEARCH_ORDERS[sort]
+    projects = await paginate_async(db, query, Project, page, response, keyset=keyset)
+    logger.debug(f"Found {len(projects)} projects")
+    return projects
+
+
+@router.get("/my-projects", response_model=List[ProjectSchema])
+async def get_my_projects(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    response: Response,
+    page: CursorParams = Depends(),
+    status: str = None,
+    current_user: User = Depends(get_current_client_user_dependency)
+) -> Any:
+    """
+    Get current user's projects, newest first.
+    Only clients can view their own projects.
+    """
+    logger.info(f"Fetching projects for client user {current_user.id}")
+    
+    query = select(Project).where(Project.client_id == current_user.id)
+    if status:
+        query = query.where(Project.status == status)
+    
+    projects = await paginate_async(db, query, Project, page, response)
+    logger.debug(f"Found {len(projects)} projects for client user {current_user.id}")
+    return projects
+
+
 @router.post("/", response_model=ProjectSchema)
 def create_project(
     *,
@@ -170,25 +277,3 @@ def delete_project(
     
     logger.info(f"Project {project_id} deleted successfully")
     return project
-
-
-@router.get("/my-projects", response_model=List[ProjectSchema])
-def get_my_projects(
-    *,
-    db: Session = Depends(get_db),
-    status: str = None,
-    current_user: User = Depends(get_current_client_user_dependency)
-) -> Any:
-    """
-    Get current user's projects.
-    Only clients can view their own projects.
-    """
-    logger.info(f"Fetching projects for client user {current_user.id}")
-    
-    query = db.query(Project).filter(Project.client_id == current_user.id)
-    if status:
-        query = query.filter(Project.status == status)
-    
-    projects = query.all()
-    logger.debug(f"Found {len(projects)} projects for client user {current_user.id}")
-    return projects
@@ -0,0 +1,28 @@
+def test_register_and_login(client):
+    response = client.post("/api/v1/auth/register", json={
+        "email": "new.creative@example.com",
+        "password": "password123",
+        "confirm_password": "password123",
+        "first_name": "New",
+        "last_name": "Creative",
+        "role": "creative",
+    })
+    assert response.status_code == 200
+    assert response.json()["email"] == "new.creative@example.com"
+
+    duplicate = client.post("/api/v1/auth/register", json={
+        "email": "new.creative@example.com",
+        "password": "password123",
+        "confirm_password": "password123",
+        "first_name": "New",
+        "last_name": "Creative",
+        "role": "creative",
+    })
+    assert duplicate.status_code == 400
+
+    login = client.post("/api/v1/auth/login", data={"username": "new.creative@example.com", "password": "password123"})
+    assert login.status_code == 200
+    assert login.json()["token_type"] == "bearer"
+
+    wrong = client.post("/api/v1/auth/login", data={"username": "new.creative@example.com", "password": "nope"})
+    assert wrong.status_code == 401
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+
+from app.db.conversations import rebuild_conversations
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def _send(db, sender, recipient, content, minutes, is_read=False):
+    message = Message(
+        sender_id=sender.id,
+        recipient_id=recipient.id,
+        content=content,
+        is_read=is_read,
+        created_at=datetime(2025, 1, 1) + timedelta(minutes=minutes),
+    )
+    db.add(message)
+    db.commit()
+    return message
+
+
+def test_conversations_single_query(client, db, make_user, login, query_log):
+    me = make_user()
+    alice = make_user(role="creative")
+    bob = make_user(role="creative")
+    carol = make_user(role="creative")
+
+    _send(db, alice, me, "hi", 1)
+    _send(db, alice, me, "are you there?", 2)
+    _send(db, me, alice, "yes", 3)
+    _send(db, bob, me, "portfolio attached", 4)
+    _send(db, bob, me, "seen it?", 5, is_read=True)
+    _send(db, me, carol, "interested?", 6)
+    _send(db, alice, bob, "not mine", 7)
+    assert rebuild_conversations(db, batch_size=2) == 4
+
+    login(me)
+    query_log.clear()
+    response = client.get("/api/v1/messages/conversations")
+
+    assert response.status_code == 200
+    assert len(query_log) == 1
+
+    conversations = response.json()
+    assert [c["user"]["id"] for c in conversations] == [carol.id, bob.id, alice.id]
+    assert [c["last_message"]["content"] for c in conversations] == ["interested?", "seen it?", "yes"]
+    assert [c["unread_count"] for c in conversations] == [0, 1, 2]
+
+
+def test_conversations_paging(client, db, make_user, login):
+    me = make_user()
+    others = [make_user(role="creative") for _ in range(4)]
+    for minutes, other in enumerate(others):
+        _send(db, other, me, f"message {minutes}", minutes)
+    rebuild_conversations(db)
+    # Two conversations whose last messages share a timestamp, across the
+    # page boundary
+    tied = db.query(Conversation).filter(Conversation.user_b_id.in_([others[1].id, others[2].id])).all()
+    for conversation in tied:
+        conversation.last_at = datetime(2025, 1, 1, 0, 2)
+    db.commit()
+
+    login(me)
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/api/v1/messages/conversations", params=params)
+        assert response.status_code == 200
+        seen.append([c["user"]["id"] for c in response.json()])
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert seen[0][0] == others[3].id
+    assert sorted(user_id for page in seen for user_id in page) == sorted(other.id for other in others)
+    assert len(seen) == 2
+
+
+def test_conversations_maintained_on_write(client, db, make_user, login):
+    me = make_user()
+    alice = make_user(role="creative")
+
+    login(alice)
+    for content in ("first", "second"):
+        response = client.post("/api/v1/messages/", json={"recipient_id": str(me.id), "content": content})
+        assert response.status_code == 200
+    last_message_id = response.json()["id"]
+
+    login(me)
+    [conversation] = client.get("/api/v1/messages/conversations").json()
+    assert conversation["last_message"]["id"] == last_message_id
+    assert conversation["unread_count"] == 2
+
+    client.put(f"/api/v1/messages/{last_message_id}/read")
+    assert client.get("/api/v1/messages/conversations").json()[0]["unread_count"] == 1
+
+    client.get("/api/v1/messages/", params={"other_user_id": str(alice.id)})
+    assert client.get("/api/v1/messages/conversations").json()[0]["unread_count"] == 0
+
+    login(alice)
+    [conversation] = client.get("/api/v1/messages/conversations").json()
+    assert conversation["user"]["id"] == me.id
+    assert conversation["unread_count"] == 0
+    assert db.query(Conversation).count() == 1
+
+
+def test_get_messages_marks_read_in_one_statement(client, db, make_user, login, query_log):
+    me = make_user()
+    alice = make_user(role="creative")
+    for minutes in range(5):
+        _send(db, alice, me, f"message {minutes}", minutes)
+    rebuild_conversations(db)
+
+    login(me)
+    query_log.clear()
+    messages = client.get("/api/v1/messages/", params={"other_user_id": str(alice.id)}).json()
+    updates = [statement for statement in query_log if statement.startswith("UPDATE messages")]
+
+    assert all(message["is_read"] for message in messages)
+    assert len(updates) == 1
+    assert db.query(Message).filter(Message.is_read == False).count() == 0
+
+    query_log.clear()
+    client.get("/api/v1/messages/", params={"other_user_id": str(alice.id)})
+    assert not [statement for statement in query_log if statement.startswith("UPDATE")]
+
+
+def test_mark_thread_read_up_to(client, db, make_user, login):
+    me = make_user()
+    alice = make_user(role="creative")
+    bob = make_user(role="creative")
+    for minutes in range(4):
+        _send(db, alice, me, f"message {minutes}", minutes)
+    _send(db, bob, me, "other thread", 5)
+    rebuild_conversations(db)
+
+    login(me)
+    response = client.post(
+        "/api/v1/messages/read",
+        json={"other_user_id": str(alice.id), "up_to": "2025-01-01T00:02:00"},
+    )
+    assert response.json() == {"marked_count": 3}
+
+    unread = {c["user"]["id"]: c["unread_count"] for c in client.get("/api/v1/messages/conversations").json()}
+    assert unread == {alice.id: 1, bob.id: 1}
+
+    assert client.post("/api/v1/messages/read", json={}).status_code == 400
+    assert client.post("/api/v1/messages/read", json={"other_user_id": "alice"}).status_code == 422
+
+
+def test_rebuild_updates_in_place(db, make_user):
+    me = make_user()
+    alice = make_user(role="creative")
+    bob = make_user(role="creative")
+    _send(db, alice, me, "hi", 1)
+    _send(db, bob, me, "hello", 2)
+    rebuild_conversations(db)
+    # Drifted counters, and a pair whose messages are gone
+    db.query(Conversation).update({"unread_count_a": 7, "unread_count_b": 7})
+    db.query(Message).filter(Message.sender_id == bob.id).delete()
+    db.commit()
+
+    assert rebuild_conversations(db, batch_size=1) == 1
+    conversations = db.query(Conversation).all()
+    assert len(conversations) == 1
+    assert (conversations[0].unread_count_a, conversations[0].unread_count_b) == (1, 0)
@@ -0,0 +1,349 @@
+import hashlib
+import importlib
+import uuid
+
+import pytest
+
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.dependencies import get_current_user
+from app.core.config import settings
+from app.db.lazy_session import LazySession
+from app.main import app as fastapi_app
+from app.models.project import Project
+from app.models.project_file import ProjectFile
+from app.models.user import User
+
+# app.api.endpoints re-exports the router under the module's name
+project_file = importlib.import_module("app.api.endpoints.project_file")
+from app.utils.file_storage import blob_path, part_path
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 1024)
+    return tmp_path / "uploads"
+
+
+@pytest.fixture
+def project(db, make_user):
+    client_user = make_user(role="client")
+    creative = make_user(role="creative")
+    project = Project(
+        client_id=client_user.id,
+        hired_creative_id=creative.id,
+        title="Shoot",
+        description="A shoot",
+        category="photography",
+    )
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _upload(client, project, body, filename="raw.cr2", **headers):
+    return client.post(
+        f"/api/v1/files/projects/{project.id}",
+        params={"filename": filename},
+        content=body,
+        headers={"Content-Type": "image/x-canon-cr2", **headers},
+    )
+
+
+def test_upload_streams_to_disk_and_records_file(client, db, project, login):
+    login(project.hired_creative)
+    body = bytes(range(256)) * 40
+    response = _upload(client, project, body, filename="../shots/raw.cr2")
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["filename"] == "raw.cr2"
+    assert data["file_size"] == len(body)
+    assert data["file_type"] == "image/x-canon-cr2"
+    assert data["sha256"] == hashlib.sha256(body).hexdigest()
+    assert data["file_url"] == f"/api/v1/files/{data['id']}/content"
+
+    stored = db.get(ProjectFile, uuid.UUID(data["id"]))
+    assert stored.uploader_id == project.hired_creative_id
+    with open(blob_path(stored.sha256), "rb") as f:
+        assert f.read() == body
+
+
+def test_upload_releases_request_sessions_before_streaming(client, engine, project, monkeypatch):
+    # Authentication reads the user through a sync LazySession, like get_db
+    sessions = []
+
+    def _current_user():
+        sessions.append(LazySession(sessionmaker(bind=engine, expire_on_commit=False)))
+        return sessions[-1].get(User, project.hired_creative_id)
+
+    fastapi_app.dependency_overrides[get_current_user] = _current_user
+    holding = []
+    receive_file = project_file.receive_file
+
+    async def _receive_file(stream, max_size):
+        holding.append(sessions[-1].in_transaction())
+        return await receive_file(stream, max_size)
+
+    monkeypatch.setattr(project_file, "receive_file", _receive_file)
+    try:
+        assert _upload(client, project, b"raw bytes").status_code == 200
+        upload_id = _start_upload(client, project)
+        assert _put_part(client, upload_id, 1, b"part").status_code == 200
+    finally:
+        for session in sessions:
+            session.close()
+    assert holding == [False, False]
+
+
+def test_upload_over_limit_is_rejected(client, db, project, login, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 2000)
+    login(project.client)
+
+    # Declared too large: rejected before reading the body
+    assert _upload(client, project, b"x" * 2001).status_code == 413
+
+    # Chunked body without Content-Length: rejected while streaming
+    def body():
+        for _ in range(3):
+            yield b"x" * 1000
+
+    assert _upload(client, project, body()).status_code == 413
+    assert db.query(ProjectFile).count() == 0
+    assert list((upload_dir / "tmp").iterdir()) == []
+
+
+def test_upload_requires_project_membership(client, project, make_user, login):
+    login(make_user(role="creative"))
+    assert _upload(client, project, b"data").status_code == 403
+
+
+def _blobs(upload_dir):
+    return sorted(path.name for path in (upload_dir / "blobs").glob("*/*"))
+
+
+def test_identical_uploads_share_one_blob(client, db, project, login, upload_dir):
+    login(project.client)
+    body = b"%PDF brief" * 100
+    sha256 = hashlib.sha256(body).hexdigest()
+
+    first = _upload(client, project, body, filename="brief.pdf").json()
+    second = _upload(client, project, body, filename="brief-v1.pdf").json()
+    assert first["id"] != second["id"]
+    assert _blobs(upload_dir) == [sha256]
+
+    # A known hash short-circuits: the body is not read
+    response = client.post(
+        f"/api/v1/files/projects/{project.id}",
+        params={"filename": "brief-copy.pdf", "sha256": sha256.upper()},
+        content=b"",
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["file_size"] == len(body)
+    assert response.json()["sha256"] == sha256
+    assert db.query(ProjectFile).filter(ProjectFile.sha256 == sha256).count() == 3
+    assert _blobs(upload_dir) == [sha256]
+
+
+def test_known_hash_needs_access_to_the_file(client, db, project, make_user, login):
+    login(project.client)
+    body = b"confidential cut"
+    sha256 = hashlib.sha256(body).hexdigest()
+    assert _upload(client, project, body).status_code == 200
+
+    # Someone else's project: the hash alone does not attach the file
+    other_client = make_user(role="client")
+    other = Project(client_id=other_client.id, title="Other", description="Other", category="video")
+    db.add(other)
+    db.commit()
+    login(other_client)
+    params = {"filename": "stolen.mov", "sha256": sha256}
+    response = client.post(f"/api/v1/files/projects/{other.id}", params=params, content=b"")
+    assert response.status_code == 400
+    # The body, when sent, must match the hash
+    response = client.post(f"/api/v1/files/projects/{other.id}", params=params, content=b"something else")
+    assert response.json()["detail"] == "Content does not match sha256"
+    response = client.post(f"/api/v1/files/projects/{other.id}", params=params, content=body)
+    assert response.status_code == 200
+
+
+def test_delete_file(client, db, project, login, upload_dir):
+    login(project.hired_creative)
+    file_id = _upload(client, project, b"draft").json()["id"]
+
+    login(project.client)
+    other_id = _upload(client, project, b"notes").json()["id"]
+    login(project.hired_creative)
+    assert client.delete(f"/api/v1/files/{other_id}").status_code == 403
+    assert client.delete(f"/api/v1/files/{file_id}").status_code == 200
+    assert client.delete(f"/api/v1/files/{file_id}").status_code == 404
+    login(project.client)
+    assert client.delete(f"/api/v1/files/{other_id}").status_code == 200
+    assert db.query(ProjectFile).count() == 0
+    # The bytes stay until the garbage collector sweeps them
+    assert len(_blobs(upload_dir)) == 2
+
+
+def _start_upload(client, project, filename="cut.mov"):
+    response = client.post(
+        f"/api/v1/files/projects/{project.id}/uploads",
+        json={"filename": filename, "file_type": "video/quicktime"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _put_part(client, upload_id, number, body):
+    return client.put(f"/api/v1/files/uploads/{upload_id}/parts/{number}", content=body)
+
+
+def test_multipart_upload_resumes_and_assembles(client, db, project, login, upload_dir, monkeypatch):
+    # Bigger than a single upload may be
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1000)
+    login(project.hired_creative)
+    parts = [bytes([n]) * 700 for n in range(1, 4)]
+    upload_id = _start_upload(client, project)
+
+    # Parts out of order; part 2 "drops" and is resent after checking status
+    assert _put_part(client, upload_id, 3, parts[2]).json()["sha256"] == hashlib.sha256(parts[2]).hexdigest()
+    assert _put_part(client, upload_id, 1, parts[0]).status_code == 200
+    status = client.get(f"/api/v1/files/uploads/{upload_id}").json()
+    assert status["parts"] == [{"part_number": 1, "size": 700, "sha256": None}, {"part_number": 3, "size": 700, "sha256": None}]
+    assert status["received_bytes"] == 1400
+
+    incomplete = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+    assert incomplete.status_code == 400
+    assert incomplete.json()["detail"] == "Missing parts: [2]"
+
+    assert _put_part(client, upload_id, 2, parts[1]).status_code == 200
+    response = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+    assert response.status_code == 200, response.text
+    data = response.json()
+    body = b"".join(parts)
+    assert data["file_size"] == len(body)
+    assert data["sha256"] == hashlib.sha256(body).hexdigest()
+    assert data["file_type"] == "video/quicktime"
+    with open(blob_path(data["sha256"]), "rb") as f:
+        assert f.read() == body
+
+    # The upload and its parts are gone
+    assert client.get(f"/api/v1/files/uploads/{upload_id}").status_code == 404
+    assert list((upload_dir / "multipart").iterdir()) == []
+
+
+def test_failed_completion_can_be_retried(client, project, login, monkeypatch):
+    login(project.hired_creative)
+    upload_id = _start_upload(client, project)
+    assert _put_part(client, upload_id, 1, b"only part").status_code == 200
+
+    async def _add_file(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    add_file = project_file._add_file
+    monkeypatch.setattr(project_file, "_add_file", _add_file)
+    with pytest.raises(RuntimeError):
+        client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+
+    # The parts were handed back instead of staying claimed (409)
+    monkeypatch.setattr(project_file, "_add_file", add_file)
+    response = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+    assert response.status_code == 200, response.text
+    assert response.json()["file_size"] == len(b"only part")
+
+
+def test_multipart_limits(client, project, login, monkeypatch):
+    monkeypatch.setattr(settings, "MULTIPART_MAX_PART_SIZE", 100)
+    monkeypatch.setattr(settings, "MULTIPART_MAX_FILE_SIZE", 150)
+    login(project.client)
+    upload_id = _start_upload(client, project)
+
+    assert _put_part(client, upload_id, 1, b"x" * 101).status_code == 413
+    assert _put_part(client, upload_id, 1, b"x" * 100).status_code == 200
+    assert _put_part(client, upload_id, 2, b"x" * 51).status_code == 413
+    # Replacing a part only counts its new size
+    assert _put_part(client, upload_id, 1, b"x" * 50).status_code == 200
+    assert _put_part(client, upload_id, 2, b"x" * 100).status_code == 200
+
+
+def test_complete_checks_the_total_size_again(client, project, login, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "MULTIPART_MAX_FILE_SIZE", 150)
+    login(project.client)
+    upload_id = _start_upload(client, project)
+    assert _put_part(client, upload_id, 1, b"x" * 100).status_code == 200
+    # A parallel part that passed its own check before part 1 was stored
+    with open(part_path(uuid.UUID(upload_id), 2), "wb") as f:
+        f.write(b"x" * 100)
+
+    response = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+    assert response.status_code == 413
+    # Handed back, so a smaller part 2 can still be sent
+    assert _put_part(client, upload_id, 2, b"x" * 50).status_code == 200
+    assert client.post(f"/api/v1/files/uploads/{upload_id}/complete").status_code == 200
+
+
+def test_multipart_upload_belongs_to_uploader(client, project, login):
+    login(project.client)
+    upload_id = _start_upload(client, project)
+
+    login(project.hired_creative)
+    assert _put_part(client, upload_id, 1, b"data").status_code == 403
+    assert client.delete(f"/api/v1/files/uploads/{upload_id}").status_code == 403
+
+    login(project.client)
+    assert _put_part(client, upload_id, 1, b"data").status_code == 200
+    assert client.delete(f"/api/v1/files/uploads/{upload_id}").status_code == 200
+    assert client.get(f"/api/v1/files/uploads/{upload_id}").status_code == 404
+
+
+def test_download_with_range_and_conditional_requests(client, project, make_user, login):
+    login(project.client)
+    body = bytes(range(256)) * 8
+    uploaded = _upload(client, project, body, filename="reel.mp4", **{"Content-Type": "video/mp4"}).json()
+    url = f"/api/v1/files/{uploaded['id']}/content"
+
+    login(project.hired_creative)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == body
+    assert response.headers["content-type"] == "video/mp4"
+    assert response.headers["content-disposition"] == "inline; filename*=utf-8''reel.mp4"
+    assert response.headers["accept-ranges"] == "bytes"
+    etag = response.headers["etag"]
+    assert etag == f'"{uploaded["sha256"]}"'
+    last_modified = response.headers["last-modified"]
+
+    partial = client.get(url, headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206
+    assert partial.content == body[100:200]
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(body)}"
+    # A stale If-Range gets the whole file
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'}).status_code == 200
+
+    assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+    not_modified = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+    assert client.get(url, headers={"If-Modified-Since": "Thu, 01 Jan 2015 00:00:00 GMT"}).status_code == 200
+
+    head = client.head(url)
+    assert head.status_code == 200
+    assert head.headers["content-length"] == str(len(body))
+
+    login(make_user(role="creative"))
+    assert client.get(url).status_code == 403
+
+
+def test_download_offloaded_to_proxy(client, project, login, monkeypatch):
+    login(project.client)
+    uploaded = _upload(client, project, b"<svg onload=alert(1)>", filename="logo.svg", **{"Content-Type": "image/svg+xml"}).json()
+    monkeypatch.setattr(settings, "FILE_ACCEL_REDIRECT_PREFIX", "/protected-files/")
+
+    response = client.get(f"/api/v1/files/{uploaded['id']}/content")
+    assert response.status_code == 200
+    sha256 = uploaded["sha256"]
+    assert response.headers["x-accel-redirect"] == f"/protected-files/blobs/{sha256[:2]}/{sha256}"
+    assert response.headers["content-disposition"].startswith("attachment;")
+    assert response.content == b""
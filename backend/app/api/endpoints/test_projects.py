@@ -0,0 +1,196 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.project import Project
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def _make_projects(db, client_user, count):
+    projects = []
+    for n in range(count):
+        project = Project(
+            client_id=client_user.id,
+            title=f"Project {n}",
+            description="A shoot",
+            category="photography",
+            required_skills=["lighting"],
+            status="active",
+            created_at=datetime(2025, 1, 1) + timedelta(hours=n),
+        )
+        db.add(project)
+        projects.append(project)
+    db.commit()
+    return projects
+
+
+def test_projects_keyset_pages(client, db, make_user, login):
+    owner = make_user(role="client")
+    projects = _make_projects(db, owner, 5)
+
+    login(owner)
+    seen = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/projects/", params=params)
+        assert response.status_code == 200
+        seen.extend(p["title"] for p in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert seen == [p.title for p in reversed(projects)]
+    assert cursor is None
+
+
+def test_page_size_is_capped(client, db, make_user, login, monkeypatch):
+    owner = make_user(role="client")
+    _make_projects(db, owner, 4)
+    monkeypatch.setattr(settings, "MAX_PAGE_SIZE", 3)
+
+    login(owner)
+    response = client.get("/api/v1/projects/my-projects", params={"limit": 1000})
+    assert len(response.json()) == 3
+    assert NEXT_CURSOR_HEADER in response.headers
+
+
+def test_invalid_cursor_rejected(client, make_user, login):
+    login(make_user())
+    response = client.get("/api/v1/projects/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    # Well-formed JSON, but not a (created_at, UUID) position
+    for position, id in [("2024-01-01T00:00:00", 5), (5, "4f1c3a64-0a35-4c1c-9d4e-5a7e3bd8a0f2"), ([], "x")]:
+        cursor = base64.urlsafe_b64encode(json.dumps([position, id]).encode()).decode()
+        response = client.get("/api/v1/projects/", params={"cursor": cursor})
+        assert response.status_code == 400, (position, id)
+
+
+def _add_project(db, owner, title, **fields):
+    data = {
+        "client_id": owner.id,
+        "title": title,
+        "description": "A shoot",
+        "category": "photography",
+        "required_skills": ["lighting"],
+        "status": "active",
+    }
+    data.update(fields)
+    project = Project(**data)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _search(client, **params):
+    response = client.get("/api/v1/projects/search", params=params)
+    assert response.status_code == 200, response.text
+    return [p["title"] for p in response.json()]
+
+
+def test_search_filters(client, db, make_user, login):
+    owner = make_user(role="client")
+    _add_project(db, owner, "Portraits", required_skills=["lighting", "retouching"], budget_min=500, budget_max=900, timeline_weeks=2)
+    _add_project(db, owner, "Wedding film", category="video", required_skills=["editing"], budget_min=2000, budget_max=4000, timeline_weeks=6)
+    _add_project(db, owner, "Draft", status="draft", required_skills=["editing"])
+
+    login(make_user(role="creative"))
+    assert sorted(_search(client)) == ["Portraits", "Wedding film"]
+    assert _search(client, category="video") == ["Wedding film"]
+    assert _search(client, skills=["retouching", "color"]) == ["Portraits"]
+    assert sorted(_search(client, skills=["editing", "lighting"])) == ["Portraits", "Wedding film"]
+    assert _search(client, min_budget=1000) == ["Wedding film"]
+    assert _search(client, max_budget=1000) == ["Portraits"]
+    assert _search(client, max_timeline_weeks=4) == ["Portraits"]
+    assert _search(client, status="draft") == ["Draft"]
+
+
+def test_search_sorted_by_budget_pages(client, db, make_user, login):
+    owner = make_user(role="client")
+    for title, budget in [("A", 300), ("B", None), ("C", 1200), ("D", 300), ("E", 800)]:
+        _add_project(db, owner, title, budget_max=budget)
+
+    login(owner)
+    pages = []
+    params = {"sort": "budget_desc", "limit": 2}
+    while True:
+        response = client.get("/api/v1/projects/search", params=params)
+        pages.append([(p["title"], p["budget_max"]) for p in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    budgets = [budget or 0 for page in pages for _, budget in page]
+    assert len(pages) == 3
+    assert budgets == [1200, 800, 300, 300, 0]
+    assert sorted(_search(client, sort="budget_asc", limit=10)) == ["A", "B", "C", "D", "E"]
+    assert _search(client, sort="budget_asc", limit=10)[0] == "B"
+
+
+def test_search_rejects_unknown_sort(client, make_user, login):
+    login(make_user())
+    assert client.get("/api/v1/projects/search", params={"sort": "title"}).status_code == 422
+
+
+def test_search_text_ranks_and_highlights(client, db, make_user, login):
+    owner = make_user(role="client")
+    _add_project(db, owner, "Fashion photographer in Miami", description="Editorial shoot on the beach")
+    _add_project(db, owner, "Lookbook", description="Miami fashion label needs a <b>photographer</b> for a lookbook")
+    _add_project(db, owner, "Fashion film", description="Short film in Miami")
+    _add_project(db, owner, "Food photographer", description="Restaurant menu in Miami", status="draft")
+
+    login(make_user(role="creative"))
+    response = client.get("/api/v1/projects/search", params={"q": "fashion photographer, Miami!"})
+    assert response.status_code == 200
+    results = response.json()
+    # Every word must match; the title hit ranks first
+    assert [p["title"] for p in results] == ["Fashion photographer in Miami", "Lookbook"]
+    assert results[0]["search_rank"] > results[1]["search_rank"]
+    snippet = results[1]["search_snippet"]
+    assert "<mark>Miami</mark>" in snippet
+    assert "&lt;b&gt;<mark>photographer</mark>&lt;/b&gt;" in snippet
+
+    assert _search(client, q="film", category="photography") == ["Fashion film"]
+    assert _search(client, q="photographer", status="draft") == ["Food photographer"]
+
+
+def test_search_text_pages_by_relevance(client, db, make_user, login):
+    owner = make_user(role="client")
+    for n in range(5):
+        _add_project(db, owner, f"Shoot {n}", description="portrait " * (n + 1))
+
+    login(owner)
+    seen = []
+    params = {"q": "portrait", "limit": 2}
+    while True:
+        response = client.get("/api/v1/projects/search", params=params)
+        seen.extend(p["title"] for p in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert sorted(seen) == [f"Shoot {n}" for n in range(5)]
+    assert len(seen) == 5
+
+
+def test_search_text_without_searchable_words(client, db, make_user, login):
+    owner = make_user(role="client")
+    _add_project(db, owner, "The shoot", description="Portrait session")
+
+    login(owner)
+    for q in ("!!!", "the", "The, and of!"):
+        response = client.get("/api/v1/projects/search", params={"q": q})
+        assert response.status_code == 400
+    # Stop words are dropped, as PostgreSQL's plainto_tsquery does
+    assert _search(client, q="the shoot") == _search(client, q="shoot") == ["The shoot"]
+
+
+def test_relevance_sort_requires_query(client, make_user, login):
+    login(make_user())
+    response = client.get("/api/v1/projects/search", params={"sort": "relevance"})
+    assert response.status_code == 400
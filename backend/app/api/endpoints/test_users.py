@@ -0,0 +1,137 @@
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.endpoints import users
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def _make_creatives(db, make_user):
+    creatives = [
+        make_user(role="creative", first_name="Ana", creative_type="Photographer",
+                  skills=["portrait", "fashion"], location="Miami, FL", hourly_rate=80),
+        make_user(role="creative", first_name="Ben", creative_type="Photographer",
+                  skills=["fashion", "drone"], location="miami beach", hourly_rate=120, is_verified=False),
+        make_user(role="creative", first_name="Cat", creative_type="DJ",
+                  skills=["house"], location="Austin, TX", hourly_rate=60),
+        make_user(role="creative", first_name="Dee", creative_type="Model", skills=None, location="Miami_1"),
+        make_user(role="creative", first_name="Eve", creative_type="DJ", is_active=False),
+        make_user(role="client", first_name="Fay", creative_type="DJ"),
+    ]
+    # Distinct signup times, like real traffic, for a stable keyset order
+    for n, user in enumerate(creatives):
+        user.created_at = datetime(2025, 1, 1) + timedelta(hours=n)
+    db.commit()
+    return creatives
+
+
+def _names(client, **params):
+    response = client.get("/api/v1/users/creatives", params=params)
+    assert response.status_code == 200, response.text
+    return sorted(u["first_name"] for u in response.json()["items"])
+
+
+def test_creatives_filters(client, db, make_user, login):
+    _make_creatives(db, make_user)
+    login(make_user(role="client"))
+
+    assert _names(client) == ["Ana", "Ben", "Cat", "Dee"]
+    assert _names(client, creative_type="DJ") == ["Cat"]
+    assert _names(client, skills=["fashion", "house"]) == ["Ana", "Ben", "Cat"]
+    assert _names(client, location="MIAMI") == ["Ana", "Ben", "Dee"]
+    # LIKE wildcards in the input are matched literally
+    assert _names(client, location="miami_") == ["Dee"]
+    assert _names(client, min_rate=70, max_rate=100) == ["Ana"]
+    assert _names(client, is_verified=False) == ["Ben"]
+
+
+def test_creatives_facets_in_one_query(client, db, make_user, login, query_budget):
+    _make_creatives(db, make_user)
+    login(make_user(role="client"))
+
+    # One statement for the page, one for every facet
+    with query_budget(2):
+        response = client.get("/api/v1/users/creatives", params={"location": "miami"})
+    body = response.json()
+    assert "email" not in body["items"][0]
+    assert body["facets"] == {
+        "total": 3,
+        "creative_type": [{"value": "Photographer", "count": 2}, {"value": "Model", "count": 1}],
+        "skills": [
+            {"value": "fashion", "count": 2},
+            {"value": "drone", "count": 1},
+            {"value": "portrait", "count": 1},
+        ],
+    }
+
+
+def test_creatives_skill_facet_keeps_most_common(client, db, make_user, login, monkeypatch):
+    monkeypatch.setattr(users, "SKILL_FACET_LIMIT", 2)
+    _make_creatives(db, make_user)
+    login(make_user(role="client"))
+
+    response = client.get("/api/v1/users/creatives", params={"location": "miami"})
+    assert response.json()["facets"]["skills"] == [
+        {"value": "fashion", "count": 2},
+        {"value": "drone", "count": 1},
+    ]
+
+
+def test_creatives_keyset_pages_without_repeating_facets(client, db, make_user, login):
+    _make_creatives(db, make_user)
+    login(make_user(role="client"))
+
+    first = client.get("/api/v1/users/creatives", params={"limit": 3})
+    assert first.json()["facets"]["total"] == 4
+    second = client.get(
+        "/api/v1/users/creatives", params={"limit": 3, "cursor": first.headers[NEXT_CURSOR_HEADER]}
+    )
+    assert second.json()["facets"] is None
+    assert NEXT_CURSOR_HEADER not in second.headers
+    names = [u["first_name"] for u in first.json()["items"] + second.json()["items"]]
+    assert sorted(names) == ["Ana", "Ben", "Cat", "Dee"]
+
+
+def _png(width, height):
+    # Solid RGB PNG, written without Pillow
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + bytes([200, 40, 90]) * width for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+def test_upload_avatar_publishes_derivative_manifest(client, make_user, login, tmp_path, monkeypatch):
+    pytest.importorskip("PIL")
+    from app.core.config import settings
+    from app.core.process_pool import shutdown_process_pool
+
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path))
+    user = make_user(role="creative")
+    login(user)
+
+    assert client.post(
+        "/api/v1/users/upload-avatar", files={"file": ("cv.pdf", b"%PDF", "application/pdf")}
+    ).status_code == 400
+
+    try:
+        response = client.post("/api/v1/users/upload-avatar", files={"file": ("me.png", _png(600, 450), "image/png")})
+    finally:
+        shutdown_process_pool()
+    assert response.status_code == 200, response.text
+    manifest_url = response.json()["profile_image_url"]
+    assert manifest_url.startswith(f"/api/v1/users/{user.id}/avatar/") and manifest_url.endswith("/manifest.json")
+    # The original is kept but never served
+    assert client.get(manifest_url.replace("manifest.json", "original")).status_code == 404
+
+    # Background processing has finished by the time the test client returns
+    manifest = client.get(manifest_url).json()
+    assert manifest["status"] == "ready"
+    assert manifest["derivatives"]["thumbnail"]["width"] == 128
+    assert manifest["derivatives"]["full"]["width"] == 600
+    thumbnail = client.get(manifest["derivatives"]["thumbnail"]["urls"]["webp"])
+    assert thumbnail.headers["content-type"] == "image/webp"
+    assert "immutable" in thumbnail.headers["cache-control"]
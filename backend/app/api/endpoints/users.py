@@ -1,12 +1,22 @@
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 import logging
+import os
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from anyio import to_thread
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status, UploadFile, File
+from fastapi.responses import FileResponse
+from sqlalchemy import func, literal, null, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.timing import TimedRoute
+from app.db.array_ops import array_elements, array_overlap
+from app.db.database import get_db, get_read_db, get_async_read_db
 from app.models.user import User
-from app.schemas.user import User as UserSchema, UserUpdate
+from app.schemas.user import User as UserSchema, UserUpdate, CreativeDirectory
+from app.utils.images import MANIFEST, avatar_file_path, avatar_url, process_avatar, save_avatar_original
+from app.utils.pagination import CursorParams, paginate_async
 from app.auth.dependencies import (
     get_current_active_user_dependency,
     get_current_user_dependency
@@ -14,7 +24,10 @@ from app.auth.dependencies import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Most common skills returned in the directory's skill facet
+SKILL_FACET_LIMIT = 50
 
 @router.get("/me", response_model=UserSchema)
 def get_current_user_info(
@@ -67,36 +80,146 @@ def update_current_user(
 async def upload_avatar(
     *,
     db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user_dependency),
 ) -> Any:
     """
     Upload a profile avatar.
+
+    The original is stored as is; thumbnail, card and full size versions in
+    AVIF and WebP are generated in the background. `profile_image_url`
+    points at their manifest, whose `status` turns from "processing" to
+    "ready" (or "failed" for an unreadable image).
     """
-    # TODO: Implement file upload to S3 or other storage
-    # For now, we'll just update the URL with a placeholder
-    
     # Validate file type
-    if not file.content_type.startswith("image/"):
+    if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be an image",
         )
-    
-    # Update user with placeholder URL
-    # In a real implementation, we would upload the file and get the URL
-    current_user.profile_image_url = f"https://example.com/avatars/{current_user.id}"
+    if file.size is not None and file.size > settings.AVATAR_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"File exceeds the maximum size of {settings.AVATAR_MAX_SIZE} bytes",
+        )
+
+    version = await to_thread.run_sync(save_avatar_original, current_user.id, file.file)
+    current_user.profile_image_url = avatar_url(current_user.id, version)
     
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    background_tasks.add_task(process_avatar, current_user.id, version)
+    logger.info(f"Stored avatar {version} for user ID: {current_user.id}")
     return current_user
 
 
+@router.get("/{user_id}/avatar/{version}/{filename}")
+async def get_avatar_file(user_id: int, version: str, filename: str) -> Any:
+    """
+    Avatar manifest or derivative. Public, like the profiles that show them.
+    """
+    path = avatar_file_path(user_id, version, filename)
+    if path is None or not await to_thread.run_sync(os.path.isfile, path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Avatar not found",
+        )
+    if filename == MANIFEST:
+        # Changes once, when processing finishes
+        return FileResponse(path, media_type="application/json", headers={"Cache-Control": "no-cache"})
+    # A version's derivatives never change
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+async def _creative_facets(db: AsyncSession, criteria: List[Any]) -> Dict[str, Any]:
+    """
+    Count the matching creatives in total, per creative_type and per skill,
+    in a single aggregate query over the filtered rows.
+    """
+    filtered = select(User.creative_type, User.skills).where(*criteria).cte("filtered")
+    skill = array_elements(filtered.c.skills, db.get_bind().dialect.name)
+    # Only the most common skills are returned, so rank and cut them in SQL
+    skill_count = func.count().label("count")
+    top_skills = (
+        select(skill.c.value, skill_count)
+        .select_from(filtered)
+        .join(skill, true())
+        .where(skill.c.value.is_not(None))
+        .group_by(skill.c.value)
+        .order_by(skill_count.desc(), skill.c.value)
+        .limit(SKILL_FACET_LIMIT)
+        .subquery("top_skills")
+    )
+    stmt = union_all(
+        select(literal("total").label("facet"), null().label("value"), func.count().label("count"))
+        .select_from(filtered),
+        select(literal("creative_type"), filtered.c.creative_type, func.count())
+        .where(filtered.c.creative_type.is_not(None))
+        .group_by(filtered.c.creative_type),
+        select(literal("skill"), top_skills.c.value, top_skills.c.count),
+    )
+    
+    facets = {"total": 0, "creative_type": [], "skills": []}
+    for facet, value, count in (await db.execute(stmt)).all():
+        if facet == "total":
+            facets["total"] = count
+        else:
+            facets["creative_type" if facet == "creative_type" else "skills"].append({"value": value, "count": count})
+    for name in ("creative_type", "skills"):
+        facets[name].sort(key=lambda entry: (-entry["count"], entry["value"]))
+    return facets
+
+
+@router.get("/creatives", response_model=CreativeDirectory)
+async def list_creatives(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    response: Response,
+    page: CursorParams = Depends(),
+    creative_type: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None, description="Creatives with any of these skills"),
+    location: Optional[str] = Query(None, max_length=100, description="Location prefix, case-insensitive"),
+    min_rate: Optional[float] = Query(None, ge=0),
+    max_rate: Optional[float] = Query(None, ge=0),
+    is_verified: Optional[bool] = None,
+    current_user: User = Depends(get_current_active_user_dependency),
+) -> Any:
+    """
+    Directory of active creatives, newest first.
+    The first page (no `cursor`) also returns facet counts for the same
+    filters. Pass the `X-Next-Cursor` response header back as `cursor` to
+    get the next page.
+    """
+    logger.info(f"Listing creatives for user {current_user.id}")
+    
+    # Matches the predicate of the ix_users_creatives_* partial indexes
+    criteria = [User.role == "creative", User.is_active == True]
+    if creative_type:
+        criteria.append(User.creative_type == creative_type)
+    if skills:
+        criteria.append(array_overlap(User.skills, skills))
+    if location:
+        escaped = location.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        criteria.append(func.lower(User.location).like(escaped + "%", escape="\\"))
+    if min_rate is not None:
+        criteria.append(User.hourly_rate >= min_rate)
+    if max_rate is not None:
+        criteria.append(User.hourly_rate <= max_rate)
+    if is_verified is not None:
+        criteria.append(User.is_verified == is_verified)
+    
+    creatives = await paginate_async(db, select(User).where(*criteria), User, page, response)
+    facets = await _creative_facets(db, criteria) if page.cursor is None else None
+    logger.debug(f"Found {len(creatives)} creatives")
+    return {"items": creatives, "facets": facets}
+
+
 @router.get("/{user_id}", response_model=UserSchema)
 def get_user_by_id(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user_dependency),
 ) -> Any:
     """
@@ -1,8 +1,14 @@
-from app.auth.password import verify_password, get_password_hash
+from app.auth.password import (
+    verify_password,
+    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+)
 from app.auth.jwt import create_access_token, decode_access_token
 from app.auth.dependencies import (
     get_current_user,
     get_current_active_user,
     get_current_creative_user,
     get_current_client_user,
+    get_current_admin_user,
 )
@@ -1,52 +1,32 @@
 import logging
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.models.user import User
 from app.auth.middleware import (
     get_current_user,
     get_current_active_user,
     get_current_creative_user,
-    get_current_client_user
+    get_current_client_user,
+    get_current_admin_user
 )
 
 logger = logging.getLogger(__name__)
 
 # Export the dependency functions for backward compatibility
-# These now use the new middleware system which can support multiple providers
-
-def get_current_user_dependency(
-    user: User = Depends(get_current_user)
-) -> User:
-    """
-    Get the current authenticated user
-    """
-    return user
-
-
-def get_current_active_user_dependency(
-    user: User = Depends(get_current_active_user)
-) -> User:
-    """
-    Get the current active user
-    """
-    return user
-
-
-def get_current_creative_user_dependency(
-    user: User = Depends(get_current_creative_user)
-) -> User:
-    """
-    Get the current creative user
-    """
-    return user
-
-
-def get_current_client_user_dependency(
-    user: User = Depends(get_current_client_user)
-) -> User:
-    """
-    Get the current client user
-    """
-    return user
+# These now use the new middleware system which can support multiple providers.
+# They are plain aliases so FastAPI resolves one dependency instead of a
+# wrapper around it on every request.
+
+# Get the current authenticated user
+get_current_user_dependency = get_current_user
+
+# Get the current active user
+get_current_active_user_dependency = get_current_active_user
+
+# Get the current creative user
+get_current_creative_user_dependency = get_current_creative_user
+
+# Get the current client user
+get_current_client_user_dependency = get_current_client_user
+
+
+# Get the current admin user
+get_current_admin_user_dependency = get_current_admin_user
@@ -4,6 +4,8 @@ from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
+from app.core.context import current_user_id_var
+from app.core.timing import timed
 from app.db.database import get_db
 from app.models.user import User
 from app.auth.providers.factory import get_provider
@@ -28,9 +30,7 @@ async def get_current_user(
     Get the current authenticated user using the configured authentication provider.
     Supports both Bearer token in Authorization header and token in access_token cookie.
     """
-    logger.debug(f"Authenticating user with token. Request path: {request.url.path}")
-    logger.debug(f"Request headers: {dict(request.headers)}")
-    logger.debug(f"Request cookies: {dict(request.cookies)}")
+    logger.debug("Authenticating user with token. Request path: %s", request.url.path)
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,15 +57,17 @@ async def get_current_user(
         raise credentials_exception
     
     try:
-        user = await auth_provider.get_user_by_token(db, token)
+        with timed("auth"):
+            user = await auth_provider.get_user_by_token(db, token)
         if user is None:
             logger.warning("Invalid token: User not found or inactive")
             raise credentials_exception
+        current_user_id_var.set(user.id)
             
-        logger.info(f"User authenticated successfully: {user.email} (ID: {user.id})")
+        logger.debug("User authenticated successfully: %s", user.id)
         return user
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         raise credentials_exception
 
 
@@ -89,16 +91,16 @@ async def get_current_creative_user(
     """
     Get the current creative user
     """
-    logger.debug(f"Checking if user {current_user.id} is a creative user")
+    logger.debug("Checking if user %s is a creative user", current_user.id)
     
     if current_user.role != "creative":
-        logger.warning(f"Access denied: User {current_user.id} is not a creative user (role: {current_user.role})")
+        logger.warning("Access denied: User %s is not a creative user (role: %s)", current_user.id, current_user.role)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a creative user"
         )
     
-    logger.debug(f"User {current_user.id} authorized as creative")
+    logger.debug("User %s authorized as creative", current_user.id)
     return current_user
 
 
@@ -108,14 +110,32 @@ async def get_current_client_user(
     """
     Get the current client user
     """
-    logger.debug(f"Checking if user {current_user.id} is a client user")
+    logger.debug("Checking if user %s is a client user", current_user.id)
     
     if current_user.role != "client":
-        logger.warning(f"Access denied: User {current_user.id} is not a client user (role: {current_user.role})")
+        logger.warning("Access denied: User %s is not a client user (role: %s)", current_user.id, current_user.role)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a client user"
         )
     
-    logger.debug(f"User {current_user.id} authorized as client")
-    return current_user
\ No newline at end of file
+    logger.debug("User %s authorized as client", current_user.id)
+    return current_user
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """
+    Get the current admin user
+    """
+    logger.debug("Checking if user %s is an admin user", current_user.id)
+    
+    if current_user.role != "admin":
+        logger.warning("Access denied: User %s is not an admin user (role: %s)", current_user.id, current_user.role)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not an admin user"
+        )
+    
+    logger.debug("User %s authorized as admin", current_user.id)
+    return current_user
@@ -1,8 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
 # Create password context using bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Dedicated, bounded pool for bcrypt work. bcrypt releases the GIL, so a
+# few threads keep hashing off the event loop without starving other
+# requests of the default threadpool.
+_hashing_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash
@@ -14,3 +28,22 @@ def get_password_hash(password: str) -> str:
     Hash a password
     """
     return pwd_context.hash(password)
+
+async def run_in_hashing_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a password hashing function in the dedicated hashing pool
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hashing_executor, func, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash without blocking the event loop
+    """
+    return await run_in_hashing_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop
+    """
+    return await run_in_hashing_pool(get_password_hash, password)
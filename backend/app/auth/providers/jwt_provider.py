@@ -1,12 +1,16 @@
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import JWTError
+from starlette.concurrency import run_in_threadpool
 
 from app.models.user import User
 from app.auth.providers.base import AuthProvider
-from app.auth.password import verify_password
+from app.auth.password import verify_password_async
 from app.auth.jwt import create_access_token, decode_access_token
+from app.auth.user_cache import user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +18,10 @@ logger = logging.getLogger(__name__)
 class JWTAuthProvider(AuthProvider):
     """JWT-based authentication provider"""
     
-    async def authenticate(self, db: Session, credentials: Dict[str, Any]) -> Optional[User]:
+    async def authenticate(self, db: Union[Session, AsyncSession], credentials: Dict[str, Any]) -> Optional[User]:
         """
-        Authenticate a user with email and password
+        Authenticate a user with email and password.
+        Accepts a sync or an async session.
         """
         email = credentials.get("email")
         password = credentials.get("password")
@@ -26,14 +31,17 @@ class JWTAuthProvider(AuthProvider):
             
         logger.info(f"Authenticating user: {email}")
         
-        # Find user by email
-        user = db.query(User).filter(User.email == email).first()
+        # Find user by email (off the event loop)
+        if isinstance(db, AsyncSession):
+            user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+        else:
+            user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
         if not user:
             logger.warning(f"Authentication failed: User {email} not found")
             return None
         
-        # Check if password is correct
-        if not verify_password(password, user.hashed_password):
+        # Check if password is correct (bcrypt runs in the hashing pool)
+        if not await verify_password_async(password, user.hashed_password):
             logger.warning(f"Authentication failed: Incorrect password for user {email}")
             return None
         
@@ -62,7 +70,9 @@ class JWTAuthProvider(AuthProvider):
             logger.warning(f"JWT decoding error: {str(e)}")
             return None
         
-        user = db.query(User).filter(User.id == user_id).first()
+        # Cache misses query the sync session and the Redis tier may block,
+        # so the lookup runs off the event loop
+        user = await run_in_threadpool(self._load_user, db, int(user_id))
         if user is None:
             logger.warning(f"User not found for ID: {user_id}")
             return None
@@ -74,6 +84,15 @@ class JWTAuthProvider(AuthProvider):
         logger.info(f"User authenticated successfully: {user.email} (ID: {user.id})")
         return user
     
+    @staticmethod
+    def _load_user(db: Session, user_id: int) -> Optional[User]:
+        user = user_cache.get(db, user_id)
+        if user is None:
+            user = db.query(User).filter(User.id == user_id).first()
+            if user is not None:
+                user_cache.set(user)
+        return user
+    
     async def create_token(self, user: User) -> str:
         """
         Create a JWT token for a user
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.auth.jwt import create_access_token
+from app.auth.providers.jwt_provider import JWTAuthProvider
+from app.auth.user_cache import UserCache, user_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def _authenticate(db, user):
+    token = create_access_token(subject=str(user.id))
+    return asyncio.run(JWTAuthProvider().get_user_by_token(db, token))
+
+
+def test_second_lookup_skips_users_query(db, make_user, query_log):
+    user = make_user()
+    db.expunge_all()
+
+    query_log.clear()
+    assert _authenticate(db, user).id == user.id
+    assert len(query_log) == 1
+
+    db.expunge_all()
+    query_log.clear()
+    cached = _authenticate(db, user)
+    assert cached.email == user.email
+    assert query_log == []
+
+
+def test_cached_user_can_be_updated(client, db, make_user, login):
+    user = make_user()
+    cached = _authenticate(db, user)
+    db.expunge_all()
+    cached = _authenticate(db, user)
+
+    login(cached)
+    response = client.put("/api/v1/users/me", json={"bio": "Film photographer"})
+    assert response.status_code == 200
+    assert response.json()["bio"] == "Film photographer"
+
+    db.expunge_all()
+    assert _authenticate(db, user).bio == "Film photographer"
+
+
+def test_deactivation_invalidates(db, make_user):
+    user = make_user()
+    assert _authenticate(db, user) is not None
+
+    user.is_active = False
+    db.commit()
+
+    db.expunge_all()
+    assert _authenticate(db, user) is None
+
+
+def test_lru_bound_and_ttl(db, make_user):
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    users = [make_user() for _ in range(3)]
+    for user in users:
+        cache.set(user)
+    db.expunge_all()
+
+    assert cache.get(db, users[0].id) is None
+    assert cache.get(db, users[2].id).id == users[2].id
+
+    expired = UserCache(max_size=2, ttl_seconds=-1)
+    expired.set(users[0])
+    assert expired.get(db, users[0].id) is None
+    assert (expired.hits, expired.misses) == (0, 1)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    def delete(self, key):
+        pass
+
+    def publish(self, channel, message):
+        self.published.append(message)
+
+
+def test_invalidation_reaches_other_workers(db, make_user):
+    user = make_user()
+    this_worker, other_worker = UserCache(max_size=10, ttl_seconds=60), UserCache(max_size=10, ttl_seconds=60)
+    this_worker._redis = _FakeRedis()
+    this_worker._invalidate_remote(user.id)
+    other_worker.set(user)
+
+    for message in this_worker._redis.published:
+        other_worker._handle_invalidation({"type": "message", "data": message.encode()})
+    db.expunge_all()
+    assert other_worker.get(db, user.id) is None
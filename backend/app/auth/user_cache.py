@@ -0,0 +1,234 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import DateTime, event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Columns that are never cached (not needed to authorize a request)
+_EXCLUDED_COLUMNS = {"hashed_password"}
+_DATETIME_COLUMNS = {c.key for c in User.__table__.columns if isinstance(c.type, DateTime)}
+# Every worker subscribes; a published user id is dropped from all of them
+_INVALIDATION_CHANNEL = "beacon:user-invalidations"
+
+
+def _snapshot(user: User) -> Dict[str, Any]:
+    """Copy the cacheable column values of a user."""
+    return {
+        column.key: getattr(user, column.key)
+        for column in User.__table__.columns
+        if column.key not in _EXCLUDED_COLUMNS
+    }
+
+
+class UserCache:
+    """
+    Bounded TTL cache of authenticated-user snapshots, keyed by user id.
+
+    The first tier is an in-process LRU; when `redis_url` is given a shared
+    Redis tier sits behind it so workers warm each other. A snapshot is a
+    plain dict of column values, re-attached to the request's session on
+    hit, so handlers keep receiving a regular persistent `User`.
+
+    With Redis, invalidations are also published to every worker, which
+    drop the user from their LRU. Without it, other workers only notice a
+    change when their entry expires, so keep `ttl_seconds` short when
+    running several workers without Redis.
+
+    `get` and `set` may block on Redis; call them from a worker thread.
+    `invalidate` runs from commit hooks, possibly on the event loop, so its
+    Redis calls are queued to a background thread.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, redis_url: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_writer: Optional[ThreadPoolExecutor] = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.1)
+                self._redis_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-cache")
+                # Blocking reads wait for messages, so they get their own client
+                listener = redis.Redis.from_url(redis_url)
+                threading.Thread(
+                    target=self._listen, args=(listener,), name="user-cache-invalidations", daemon=True
+                ).start()
+                logger.info("User cache Redis tier enabled")
+            except Exception as e:
+                logger.error(f"Could not set up user cache Redis tier: {str(e)}")
+
+    def _redis_key(self, user_id: int) -> str:
+        return f"beacon:user:{user_id}"
+
+    def _get_local(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def _set_local(self, user_id: int, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _get_remote(self, user_id: int) -> Optional[Dict[str, Any]]:
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(self._redis_key(user_id))
+        except Exception as e:
+            logger.warning(f"User cache Redis read failed: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        snapshot = json.loads(raw)
+        for key in _DATETIME_COLUMNS:
+            if snapshot.get(key):
+                snapshot[key] = datetime.fromisoformat(snapshot[key])
+        return snapshot
+
+    def _set_remote(self, user_id: int, snapshot: Dict[str, Any]) -> None:
+        if self._redis is None:
+            return
+        try:
+            self._redis.set(
+                self._redis_key(user_id),
+                json.dumps(snapshot, default=lambda value: value.isoformat()),
+                ex=max(int(self.ttl_seconds), 1),
+            )
+        except Exception as e:
+            logger.warning(f"User cache Redis write failed: {str(e)}")
+
+    def get(self, db: Session, user_id: int) -> Optional[User]:
+        """Return the cached user attached to `db`, or None on a miss."""
+        snapshot = self._get_local(user_id)
+        if snapshot is None:
+            snapshot = self._get_remote(user_id)
+            if snapshot is not None:
+                self._set_local(user_id, snapshot)
+        if snapshot is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def set(self, user: User) -> None:
+        """Cache a snapshot of a user loaded from the database."""
+        snapshot = _snapshot(user)
+        self._set_local(user.id, snapshot)
+        self._set_remote(user.id, snapshot)
+
+    def _drop_local(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def _invalidate_remote(self, user_id: int) -> None:
+        try:
+            self._redis.delete(self._redis_key(user_id))
+            self._redis.publish(_INVALIDATION_CHANNEL, str(user_id))
+        except Exception as e:
+            logger.warning(f"User cache Redis invalidation failed: {str(e)}")
+
+    def _handle_invalidation(self, message: Dict[str, Any]) -> None:
+        try:
+            self._drop_local(int(message["data"]))
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed user cache invalidation: {message!r}")
+
+    def _listen(self, listener) -> None:
+        """Apply invalidations published by other workers, reconnecting on errors."""
+        while True:
+            try:
+                pubsub = listener.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(_INVALIDATION_CHANNEL)
+                # Invalidations may have been missed while disconnected
+                self.clear()
+                for message in pubsub.listen():
+                    self._handle_invalidation(message)
+            except Exception as e:
+                logger.warning(f"User cache invalidation listener failed: {str(e)}")
+                time.sleep(1)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user from every tier and from the other workers' LRUs."""
+        self._drop_local(user_id)
+        if self._redis_writer is not None:
+            self._redis_writer.submit(self._invalidate_remote, user_id)
+
+    def clear(self) -> None:
+        """Drop every locally cached user."""
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL if settings.USER_CACHE_REDIS_ENABLED else None,
+)
+
+
+@registry.collector("auth_user_cache_hits_total", "Authenticated-user cache hits", kind="counter")
+def _user_cache_hits():
+    return [({}, user_cache.hits)]
+
+
+@registry.collector("auth_user_cache_misses_total", "Authenticated-user cache misses", kind="counter")
+def _user_cache_misses():
+    return [({}, user_cache.misses)]
+
+
+@registry.collector("auth_user_cache_hit_ratio", "Share of user lookups served from the cache")
+def _user_cache_hit_ratio():
+    lookups = user_cache.hits + user_cache.misses
+    return [({}, user_cache.hits / lookups if lookups else 0)]
+
+
+# Invalidate on every committed ORM change to a user row (profile updates,
+# avatar changes, deactivation). Bulk UPDATE statements bypass these events
+# and must call `user_cache.invalidate` themselves.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_changed_user(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
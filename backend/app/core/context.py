@@ -0,0 +1,27 @@
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Per-request values, set by LoggingMiddleware and read wherever needed
+# (log records, response headers) without threading them through calls.
+# Each request runs in its own context, and sync endpoints inherit it in
+# their worker thread.
+
+# Short id correlating every log line of one request
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Whether DEBUG records of the current request are kept (see
+# app.core.logging_config.should_sample_debug)
+debug_sampled_var: ContextVar[bool] = ContextVar("debug_sampled", default=True)
+
+# Milliseconds spent per phase (auth, db, serialization) of the current
+# request, reported in the Server-Timing response header; None outside
+# a request
+request_timings_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+# Id of the authenticated user, set by get_current_user; used to route
+# reads after the user's own writes to the primary
+current_user_id_var: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
+# Lazy DB sessions started by the current request's endpoint and its
+# dependencies, released by TimedRoute once the endpoint returns
+request_sessions_var: ContextVar[Optional[list]] = ContextVar("request_sessions", default=None)
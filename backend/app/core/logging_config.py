@@ -0,0 +1,143 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.context import debug_sampled_var, request_id_var
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamp records with the current request id and drop DEBUG records of
+    requests that were not sampled. Runs in the thread that logs, where
+    the request's contextvars are visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and not debug_sampled_var.get():
+            return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The plain `TEXT_FORMAT` line, for local development."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "N/A"
+        return super().format(record)
+
+
+class _ContextQueueHandler(QueueHandler):
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now (both may reference
+        # mutable or unpicklable objects); full formatting is left to the
+        # listener thread, which keeps the exception as its own field
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+@lru_cache(maxsize=None)
+def _sample_rates(overrides: str) -> List[Tuple[str, float]]:
+    rates = []
+    for item in filter(None, (part.strip() for part in overrides.split(","))):
+        prefix, _, rate = item.partition("=")
+        rates.append((prefix.strip(), float(rate)))
+    # Longest prefix first so the most specific override wins
+    return sorted(rates, key=lambda entry: len(entry[0]), reverse=True)
+
+
+def should_sample_debug(path: str) -> bool:
+    """Decide once per request whether its DEBUG lines are logged."""
+    rate = settings.LOG_DEBUG_SAMPLE_RATE
+    for prefix, prefix_rate in _sample_rates(settings.LOG_DEBUG_SAMPLE_RATES):
+        if path.startswith(prefix):
+            rate = prefix_rate
+            break
+    return rate >= 1 or random.random() < rate
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    stream: IO[str] = sys.stdout,
+) -> QueueListener:
+    """
+    Route every log record through a queue to a background writer thread.
+
+    Callers only pay for building the record and putting it on the queue;
+    formatting and the blocking write to `stream` happen on the listener
+    thread. Replaces any handlers on the root logger and returns the
+    started listener (stopped at interpreter exit, or by `stop_logging`).
+    """
+    global _listener
+    stop_logging()
+
+    handler = logging.StreamHandler(stream)
+    if (log_format or settings.LOG_FORMAT).lower() == "text":
+        handler.setFormatter(TextFormatter(TEXT_FORMAT))
+    else:
+        handler.setFormatter(JSONFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _ContextQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    root_logger = logging.getLogger()
+    for existing in list(root_logger.handlers):
+        root_logger.removeHandler(existing)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level or settings.LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
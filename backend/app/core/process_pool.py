@@ -0,0 +1,49 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Worker processes for CPU-bound jobs (image decoding and encoding) that
+    would otherwise hold the GIL and stall the event loop and its threads.
+
+    Created on first use. Workers are spawned rather than forked, so they
+    do not inherit the server's threads, sockets or DB connections.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Process pool started with {settings.PROCESS_POOL_WORKERS} workers")
+    return _pool
+
+
+def discard_broken_process_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool whose worker died, so the next job starts a fresh one.
+
+    Only `pool` itself is dropped: a job that failed with it may find it
+    already replaced, and must not stop the new pool others are using. Its
+    pending jobs have failed already, so nothing is cancelled or awaited.
+    """
+    global _pool
+    if _pool is pool:
+        _pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,80 @@
+import io
+import json
+import logging
+
+import pytest
+
+from app.core import logging_config
+from app.core.config import settings
+from app.core.context import debug_sampled_var, request_id_var
+from app.core.logging_config import setup_logging, should_sample_debug, stop_logging
+
+
+@pytest.fixture
+def log_stream():
+    """Route logging to an in-memory stream; restore the app's pipeline after."""
+    root_logger = logging.getLogger()
+    level = root_logger.level
+    stream = io.StringIO()
+    setup_logging(level="DEBUG", log_format="json", stream=stream)
+
+    def _lines():
+        stop_logging()  # flushes the queue
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield _lines
+    setup_logging(level=logging.getLevelName(level))
+
+
+def test_records_are_json_with_request_id_from_context(log_stream):
+    logger = logging.getLogger("test.logging")
+    token = request_id_var.set("abc12345")
+    try:
+        logger.info("hello %s", "world")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        request_id_var.reset(token)
+    logger.warning("outside")
+
+    hello, failed, outside = [line for line in log_stream() if line["logger"] == "test.logging"]
+    assert hello["message"] == "hello world"
+    assert hello["level"] == "INFO"
+    assert hello["request_id"] == "abc12345"
+    assert "ValueError: boom" in failed["exc_info"]
+    assert outside["request_id"] is None
+
+
+def test_unsampled_requests_drop_debug_only(log_stream):
+    logger = logging.getLogger("test.logging")
+    token = debug_sampled_var.set(False)
+    try:
+        logger.debug("dropped")
+        logger.info("kept")
+    finally:
+        debug_sampled_var.reset(token)
+
+    assert [line["message"] for line in log_stream() if line["logger"] == "test.logging"] == ["kept"]
+
+
+def test_debug_sample_rate_uses_longest_matching_prefix(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_DEBUG_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "LOG_DEBUG_SAMPLE_RATES", "/api/v1=0, /api/v1/messages/conversations=1")
+    logging_config._sample_rates.cache_clear()
+
+    assert should_sample_debug("/api/v1/messages/conversations")
+    assert not should_sample_debug("/api/v1/projects")
+    assert should_sample_debug("/")
+
+
+def test_get_current_user_does_not_log_headers_or_cookies(client, make_user, log_stream):
+    user = make_user()
+    client.cookies.set("access_token", "secret-session-cookie")
+    client.get(f"/api/v1/users/{user.id}", headers={"Authorization": "Bearer secret-token"})
+
+    output = json.dumps(log_stream())
+    assert "Authenticating user" in output
+    assert "secret-session-cookie" not in output
+    assert "secret-token" not in output
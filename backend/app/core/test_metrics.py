@@ -0,0 +1,64 @@
+from starlette.routing import compile_path
+
+from app.auth.user_cache import user_cache
+from app.core.metrics import MetricsRegistry
+from app.middleware.metrics_middleware import UNMATCHED_ROUTE, route_template
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, route="/items/{id}")
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/items/{id}",le="0.1"} 1',
+        'latency_seconds_bucket{route="/items/{id}",le="1"} 3',
+        'latency_seconds_bucket{route="/items/{id}",le="+Inf"} 4',
+        'latency_seconds_sum{route="/items/{id}"} 4.05',
+        'latency_seconds_count{route="/items/{id}"} 4',
+    ]
+
+
+def test_failing_collector_is_skipped():
+    registry = MetricsRegistry()
+
+    @registry.collector("broken", "Always fails")
+    def broken():
+        raise RuntimeError("boom")
+
+    assert registry.render().splitlines() == ["# HELP broken Always fails", "# TYPE broken gauge"]
+
+
+def test_metrics_endpoint_labels_requests_by_route_template(client, db, login, make_user, monkeypatch):
+    login(make_user())
+    client.get("/api/v1/projects/123456")
+    client.get("/api/v1/projects/654321")
+    client.get("/does-not-exist")
+    monkeypatch.setattr(user_cache, "hits", 3)
+    monkeypatch.setattr(user_cache, "misses", 1)
+
+    response = client.get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'http_requests_total{method="GET",route="/api/v1/projects/{project_id}",status="404"} 2' in lines
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in lines
+    assert not any("123456" in line for line in lines)
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/projects/{project_id}"} 2' in lines
+    # The scrape itself is in flight while the registry is rendered
+    assert "http_requests_in_flight 1" in lines
+    assert "auth_user_cache_hits_total 3" in lines
+    assert "auth_user_cache_hit_ratio 0.75" in lines
+
+
+def test_route_template_uses_matched_route():
+    path_regex, path_format, _ = compile_path("/{file_id:uuid}/content")
+    route = type("Route", (), {"path": "/{file_id:uuid}/content", "path_format": path_format, "path_regex": path_regex})()
+    file_path = "/api/v1/files/0b6f3a59-9c4b-4c53-9a3e-1a2b3c4d5e6f/content"
+    assert route_template({"route": route, "path": file_path}) == "/api/v1/files/{file_id}/content"
+    assert route_template({"route": route, "path": "/api/v1/files/7/content"}) == UNMATCHED_ROUTE
+    assert route_template({"path": "/nope"}) == UNMATCHED_ROUTE
@@ -0,0 +1,15 @@
+from app.core.process_pool import discard_broken_process_pool, get_process_pool, shutdown_process_pool
+
+
+def test_only_the_broken_pool_is_discarded():
+    broken = get_process_pool()
+    try:
+        discard_broken_process_pool(broken)
+        fresh = get_process_pool()
+        assert fresh is not broken
+
+        # Another job that ran on the broken pool notices it later
+        discard_broken_process_pool(broken)
+        assert get_process_pool() is fresh
+    finally:
+        shutdown_process_pool()
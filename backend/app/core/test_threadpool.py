@@ -0,0 +1,63 @@
+import threading
+import time
+
+from fastapi import APIRouter
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.threadpool import default_thread_tokens
+from app.main import app
+
+
+def test_default_tokens_match_db_pool_capacity(monkeypatch):
+    monkeypatch.setattr(settings, "THREADPOOL_TOKENS", None)
+    assert default_thread_tokens() == settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+    monkeypatch.setattr(settings, "THREADPOOL_TOKENS", 7)
+    assert default_thread_tokens() == 7
+
+
+def test_startup_sizes_limiter_and_reports_usage(monkeypatch):
+    monkeypatch.setattr(settings, "THREADPOOL_TOKENS", 3)
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    router = APIRouter()
+
+    @router.get("/_test/blocking")
+    def blocking():
+        started.release()
+        release.wait(5)
+        return {}
+
+    app.include_router(router)
+    try:
+        with TestClient(app) as client:
+            assert client.get("/api/v1/health/threadpool").json() == {
+                "total_tokens": 3,
+                "borrowed_tokens": 0,
+                "available_tokens": 3,
+                "waiting": 0,
+            }
+
+            # Occupy every token plus one queued call, then inspect the limiter
+            workers = [threading.Thread(target=client.get, args=("/_test/blocking",)) for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            for _ in range(3):
+                assert started.acquire(timeout=5)
+            deadline = time.monotonic() + 5
+            stats = client.get("/api/v1/health/threadpool").json()
+            while stats["waiting"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+                stats = client.get("/api/v1/health/threadpool").json()
+            release.set()
+            for worker in workers:
+                worker.join(5)
+
+        assert stats["borrowed_tokens"] == 3
+        assert stats["available_tokens"] == 0
+        assert stats["waiting"] == 1
+    finally:
+        release.set()
+        app.router.routes[:] = [r for r in app.router.routes if getattr(r, "path", None) != "/_test/blocking"]
@@ -0,0 +1,54 @@
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.auth.jwt import create_access_token
+from app.auth.user_cache import user_cache
+
+
+def _phases(response):
+    header = response.headers["server-timing"]
+    return {name: float(duration) for name, duration in re.findall(r"(\w+);dur=([\d.]+)", header)}
+
+
+def test_server_timing_breaks_down_authenticated_async_request(client, make_user):
+    user_cache.clear()
+    user = make_user()
+    token = create_access_token(str(user.id))
+
+    response = client.get("/api/v1/messages/conversations", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    phases = _phases(response)
+    assert set(phases) == {"auth", "db", "serialization", "total"}
+    assert phases["db"] > 0
+    assert max(phases["auth"], phases["db"], phases["serialization"]) <= phases["total"]
+    assert re.fullmatch(r"[0-9a-f]{8}", response.headers["x-request-id"])
+
+
+def test_server_timing_counts_queries_run_in_worker_threads(client, login, make_user):
+    login(make_user())
+
+    response = client.get("/api/v1/projects/999")
+
+    assert response.status_code == 404
+    phases = _phases(response)
+    assert phases["db"] > 0
+    assert "auth" not in phases
+
+
+def test_requests_get_distinct_ids(client):
+    first = client.get("/api/v1/health").headers["x-request-id"]
+    second = client.get("/api/v1/health").headers["x-request-id"]
+    assert first != second
+
+
+def test_failed_statements_do_not_leak_timers(engine):
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("query_start_times") == []
@@ -0,0 +1,63 @@
+import logging
+from typing import Dict, Optional
+
+from anyio.to_thread import current_default_thread_limiter
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.pool_stats import pool_limits
+
+logger = logging.getLogger(__name__)
+
+
+def default_thread_tokens() -> int:
+    """
+    Number of worker threads for sync endpoints.
+
+    Defaults to the sync DB pool capacity (pool_size + max_overflow from
+    `pool_limits`): with more threads than connections, the extra threads
+    only block inside the pool's checkout instead of doing useful work.
+    """
+    if settings.THREADPOOL_TOKENS:
+        return settings.THREADPOOL_TOKENS
+    pool_size, max_overflow = pool_limits()
+    return pool_size + max_overflow
+
+
+def configure_thread_limiter(total_tokens: Optional[int] = None) -> int:
+    """
+    Resize AnyIO's default thread limiter, which runs every `def` endpoint
+    and dependency. The limiter is per event loop, so this must be called
+    from the serving loop (the application startup hook).
+    """
+    limiter = current_default_thread_limiter()
+    limiter.total_tokens = total_tokens or default_thread_tokens()
+    logger.info(f"Thread limiter sized to {limiter.total_tokens} tokens")
+    return int(limiter.total_tokens)
+
+
+def thread_limiter_stats() -> Dict[str, int]:
+    """Live token usage and queue depth of the default thread limiter."""
+    limiter = current_default_thread_limiter()
+    stats = limiter.statistics()
+    return {
+        "total_tokens": int(stats.total_tokens),
+        "borrowed_tokens": stats.borrowed_tokens,
+        "available_tokens": int(limiter.available_tokens),
+        "waiting": stats.tasks_waiting,
+    }
+
+
+@registry.collector("threadpool_tokens_total", "Worker threads available to sync endpoints")
+def _threadpool_total():
+    return [({}, thread_limiter_stats()["total_tokens"])]
+
+
+@registry.collector("threadpool_tokens_borrowed", "Worker threads currently running sync endpoints")
+def _threadpool_borrowed():
+    return [({}, thread_limiter_stats()["borrowed_tokens"])]
+
+
+@registry.collector("threadpool_queue_depth", "Sync calls waiting for a worker thread")
+def _threadpool_waiting():
+    return [({}, thread_limiter_stats()["waiting"])]
@@ -0,0 +1,136 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.context import request_timings_var
+from app.db.lazy_session import release_sessions, sessions_to_release, track_request_sessions
+
+# Key under which TimedRoute stores when the endpoint returned; the rest
+# of the time until the response starts is spent on serialization
+ENDPOINT_DONE = "_endpoint_done"
+
+
+def record_timing(name: str, milliseconds: float) -> None:
+    """Add time to a phase of the current request (no-op outside requests)."""
+    timings = request_timings_var.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + milliseconds
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Time the enclosed block as part of the `name` phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, (time.perf_counter() - start) * 1000)
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """Render phase durations as a Server-Timing header value."""
+    return ", ".join(
+        f"{name};dur={milliseconds:.1f}" for name, milliseconds in timings.items() if not name.startswith("_")
+    )
+
+
+# Every engine (sync, and the sync core of async engines) reports statement
+# time into the request that ran it. The timings dict is shared by
+# reference, so worker threads and SQLAlchemy's greenlets, which copy the
+# request context, write into the same one.
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+    if context is not None:
+        context._timing_started = True
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start_times"].pop()
+    record_timing("db", (time.perf_counter() - start) * 1000)
+
+
+# A statement that raises never reaches after_cursor_execute; drop its start
+# time so entries do not pile up on pooled connections
+@event.listens_for(Engine, "handle_error")
+def _stop_failed_query_timer(exception_context):
+    conn = exception_context.connection
+    context = exception_context.execution_context
+    # Only errors raised after before_cursor_execute have a start time
+    if conn is None or not getattr(context, "_timing_started", False):
+        return
+    start_times = conn.info.get("query_start_times")
+    if start_times:
+        start = start_times.pop()
+        record_timing("db", (time.perf_counter() - start) * 1000)
+
+
+def _mark_endpoint_done() -> None:
+    timings = request_timings_var.get()
+    if timings is not None:
+        timings[ENDPOINT_DONE] = time.perf_counter()
+
+
+def _time_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            try:
+                result = await endpoint(*args, **kwargs)
+                sessions = sessions_to_release()
+                if sessions:
+                    await run_in_threadpool(release_sessions, sessions)
+                return result
+            finally:
+                _mark_endpoint_done()
+    else:
+        @functools.wraps(endpoint)
+        def timed_endpoint(*args, **kwargs):
+            try:
+                result = endpoint(*args, **kwargs)
+                release_sessions(sessions_to_release())
+                return result
+            finally:
+                _mark_endpoint_done()
+    return timed_endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that notes when its endpoint returns, so LoggingMiddleware can
+    report response validation and encoding as the `serialization` phase.
+    Use as `APIRouter(route_class=TimedRoute)`.
+
+    It also releases the lazy DB sessions (`get_db`, `get_read_db`) the
+    request started, so their connections go back to the pool before
+    serialization rather than after the response is sent.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _time_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        @functools.wraps(handler)
+        async def route_handler(request):
+            with track_request_sessions():
+                return await handler(request)
+
+        return route_handler
+
+
+def serialization_ms(timings: Dict[str, float], response_start: float) -> Optional[float]:
+    """Time from the endpoint returning to the response starting, if known."""
+    endpoint_done = timings.get(ENDPOINT_DONE)
+    if endpoint_done is None:
+        return None
+    return (response_start - endpoint_done) * 1000
@@ -0,0 +1,54 @@
+from typing import Any, Iterable
+
+from sqlalchemy import Boolean, bindparam, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement, TableValuedAlias
+
+
+class array_overlap(FunctionElement):
+    """
+    True when the string array `column` shares at least one element with
+    `values`.
+
+    PostgreSQL compiles it to `column && ARRAY[...]`, which a GIN index on
+    the column serves. SQLite (development and tests), where the column is
+    stored as JSON, scans it with `json_each`.
+    """
+
+    type = Boolean()
+    name = "array_overlap"
+    inherit_cache = True
+
+    def __init__(self, column: Any, values: Iterable[str]):
+        super().__init__(column, *(bindparam(None, value) for value in values))
+
+
+def _split(element, compiler, **kw):
+    column, *values = element.clauses
+    return compiler.process(column, **kw), [compiler.process(value, **kw) for value in values]
+
+
+@compiles(array_overlap)
+def _compile_array_overlap(element, compiler, **kw):
+    column, values = _split(element, compiler, **kw)
+    # The cast matches the column's varchar[] so the GIN operator class applies
+    return f"{column} && CAST(ARRAY[{', '.join(values)}] AS VARCHAR[])"
+
+
+@compiles(array_overlap, "sqlite")
+def _compile_array_overlap_sqlite(element, compiler, **kw):
+    column, values = _split(element, compiler, **kw)
+    return f"EXISTS (SELECT 1 FROM json_each({column}) WHERE json_each.value IN ({', '.join(values)}))"
+
+
+def array_elements(column: Any, dialect_name: str) -> TableValuedAlias:
+    """
+    One row per element of the string array `column`, in a `value` column,
+    for use in FROM next to the table that holds `column`.
+
+    `unnest` on PostgreSQL, `json_each` on SQLite; pass the dialect of the
+    session that runs the query (`session.get_bind().dialect.name`).
+    """
+    if dialect_name == "sqlite":
+        return func.json_each(column).table_valued("value")
+    return func.unnest(column).table_valued("value").render_derived()
@@ -0,0 +1,268 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, literal, or_, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.user import User
+from app.utils.pagination import CursorParams, Keyset
+
+logger = logging.getLogger(__name__)
+
+# Inbox order: latest message first; the id breaks ties between
+# conversations whose last messages share a timestamp
+INBOX_ORDER = Keyset(
+    Conversation.last_at,
+    Conversation.id,
+    lambda summary: summary["last_at"],
+    row_id=lambda summary: summary["id"],
+)
+
+
+def conversation_pair(user_id: int, other_user_id: int) -> Tuple[int, int]:
+    """Return the (user_a_id, user_b_id) key under which a pair is stored."""
+    return (user_id, other_user_id) if user_id < other_user_id else (other_user_id, user_id)
+
+
+def _upsert(db: Session):
+    """Pick the dialect-specific INSERT that supports ON CONFLICT."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+def record_message(db: Session, message: Message) -> None:
+    """
+    Fold a newly created message into its conversation row.
+
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE inside the caller's
+    transaction, so the summary commits (or rolls back) with the message.
+    """
+    if message.sender_id == message.recipient_id:
+        return
+
+    user_a_id, user_b_id = conversation_pair(message.sender_id, message.recipient_id)
+    table = Conversation.__table__
+    stmt = _upsert(db)(table).values(
+        user_a_id=user_a_id,
+        user_b_id=user_b_id,
+        last_message_id=message.id,
+        last_at=message.created_at,
+        unread_count_a=0 if message.is_read or message.recipient_id != user_a_id else 1,
+        unread_count_b=0 if message.is_read or message.recipient_id != user_b_id else 1,
+    )
+    newer = stmt.excluded.last_at >= table.c.last_at
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_a_id, table.c.user_b_id],
+        set_={
+            "last_message_id": case((newer, stmt.excluded.last_message_id), else_=table.c.last_message_id),
+            "last_at": case((newer, stmt.excluded.last_at), else_=table.c.last_at),
+            "unread_count_a": table.c.unread_count_a + stmt.excluded.unread_count_a,
+            "unread_count_b": table.c.unread_count_b + stmt.excluded.unread_count_b,
+        },
+    )
+    db.execute(stmt)
+
+
+def mark_conversations_read(db: Session, reader_id: int, read_counts: Dict[int, int]) -> None:
+    """
+    Decrement the reader's unread counters after messages were marked read.
+
+    ``read_counts`` maps each sender to the number of their messages that
+    were just marked read by ``reader_id``.
+    """
+    for sender_id, count in read_counts.items():
+        if not count or sender_id == reader_id:
+            continue
+        user_a_id, user_b_id = conversation_pair(reader_id, sender_id)
+        column = Conversation.unread_count_a if reader_id == user_a_id else Conversation.unread_count_b
+        db.execute(
+            update(Conversation)
+            .where(Conversation.user_a_id == user_a_id, Conversation.user_b_id == user_b_id)
+            .values({column: case((column > count, column - count), else_=0)})
+        )
+
+
+def mark_messages_read(db: Session, reader_id: int, *criteria) -> List[Any]:
+    """
+    Mark the reader's unread messages matching ``criteria`` as read.
+
+    Issues a single ``UPDATE ... RETURNING`` restricted to unread messages
+    addressed to ``reader_id`` and folds the result into the conversation
+    counters. Returns the ``(id, sender_id)`` rows that were updated; the
+    caller owns the commit.
+    """
+    marked = db.execute(
+        update(Message)
+        .where(Message.recipient_id == reader_id, Message.is_read == False, *criteria)
+        .values(is_read=True)
+        .returning(Message.id, Message.sender_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    read_counts: Dict[int, int] = {}
+    for row in marked:
+        read_counts[row.sender_id] = read_counts.get(row.sender_id, 0) + 1
+    mark_conversations_read(db, reader_id, read_counts)
+    return marked
+
+
+def get_conversation_summaries(
+    db: Session,
+    user_id: int,
+    page: Optional[CursorParams] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read the conversation inbox for a user from the ``conversations`` table.
+
+    The rows are found through the (user_a_id, last_at) and
+    (user_b_id, last_at) indexes and joined with their last message and
+    counterpart in the same statement, so the cost depends on the number of
+    conversations returned, not on the size of the message history.
+
+    With ``page``, one page in ``INBOX_ORDER`` is read, plus one extra row;
+    pass the result to ``INBOX_ORDER.finish_page``. Without it, the whole
+    inbox is returned.
+    """
+    is_user_a = Conversation.user_a_id == user_id
+    counterpart_id = case((is_user_a, Conversation.user_b_id), else_=Conversation.user_a_id)
+    unread_count = case((is_user_a, Conversation.unread_count_a), else_=Conversation.unread_count_b)
+
+    query = (
+        select(Conversation.id, Conversation.last_at, Message, User, unread_count)
+        .select_from(Conversation)
+        .join(Message, Message.id == Conversation.last_message_id)
+        .join(User, User.id == counterpart_id)
+        .where(or_(Conversation.user_a_id == user_id, Conversation.user_b_id == user_id))
+    )
+    if page is not None:
+        query = INBOX_ORDER.apply(query, page)
+    else:
+        query = query.order_by(Conversation.last_at.desc(), Conversation.id.desc())
+
+    conversations = [
+        {
+            "id": conversation_id,
+            "last_at": last_at,
+            "user": other_user,
+            "last_message": last_message,
+            "unread_count": unread,
+            "updated_at": last_message.created_at,
+        }
+        for conversation_id, last_at, last_message, other_user, unread in db.execute(query).all()
+    ]
+    logger.debug(f"Loaded {len(conversations)} conversation summaries for user {user_id}")
+    return conversations
+
+
+def _pair_messages(first_user_id: int, last_user_id: int):
+    """
+    Messages of every pair whose lower user id is in the given range, with
+    the pair key and the message's contribution to each unread counter.
+
+    One branch per side, so each uses the (sender_id, ...) or
+    (recipient_id, ...) index instead of computing the pair per row.
+    """
+    unread = case((Message.is_read == False, 1), else_=0)
+    sent_by_a = select(
+        Message.id, Message.created_at,
+        Message.sender_id.label("user_a_id"), Message.recipient_id.label("user_b_id"),
+        literal(0).label("unread_a"), unread.label("unread_b"),
+    ).where(
+        Message.sender_id.between(first_user_id, last_user_id),
+        Message.recipient_id > Message.sender_id,
+    )
+    received_by_a = select(
+        Message.id, Message.created_at,
+        Message.recipient_id.label("user_a_id"), Message.sender_id.label("user_b_id"),
+        unread.label("unread_a"), literal(0).label("unread_b"),
+    ).where(
+        Message.recipient_id.between(first_user_id, last_user_id),
+        Message.sender_id > Message.recipient_id,
+    )
+    return union_all(sent_by_a, received_by_a).subquery()
+
+
+def rebuild_conversations(db: Session, batch_size: int = 1000) -> int:
+    """
+    Rebuild the ``conversations`` table from ``messages``.
+
+    Users are walked in id order, ``batch_size`` per batch, and each batch
+    recomputes the pairs whose lower user id falls in it: a window function
+    picks each pair's latest message and sums the unread messages for both
+    sides. Rows are upserted in place, so inboxes stay readable during the
+    backfill and pairs created meanwhile by ``record_message`` are merged
+    instead of conflicting. Conversations left without messages are
+    deleted. Every batch is committed on its own so a large backfill never
+    holds one long transaction.
+    Returns the number of conversations written.
+    """
+    table = Conversation.__table__
+    written = 0
+    last_user_id = 0
+    while True:
+        user_ids = db.execute(
+            select(User.id).where(User.id > last_user_id).order_by(User.id).limit(batch_size)
+        ).scalars().all()
+        if not user_ids:
+            break
+        first_id, last_id = user_ids[0], user_ids[-1]
+
+        messages = _pair_messages(first_id, last_id)
+        pair = (messages.c.user_a_id, messages.c.user_b_id)
+        ranked = select(
+            messages.c.id.label("last_message_id"),
+            messages.c.created_at.label("last_at"),
+            messages.c.user_a_id,
+            messages.c.user_b_id,
+            func.row_number().over(
+                partition_by=pair,
+                order_by=(messages.c.created_at.desc(), messages.c.id.desc()),
+            ).label("position"),
+            func.sum(messages.c.unread_a).over(partition_by=pair).label("unread_count_a"),
+            func.sum(messages.c.unread_b).over(partition_by=pair).label("unread_count_b"),
+        ).subquery()
+        rows = db.execute(
+            select(
+                ranked.c.user_a_id,
+                ranked.c.user_b_id,
+                ranked.c.last_message_id,
+                ranked.c.last_at,
+                ranked.c.unread_count_a,
+                ranked.c.unread_count_b,
+            ).where(ranked.c.position == 1)
+        ).mappings().all()
+
+        if rows:
+            stmt = _upsert(db)(table)
+            # A message recorded while the batch ran may be newer than its result
+            newer = stmt.excluded.last_at >= table.c.last_at
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.user_a_id, table.c.user_b_id],
+                set_={
+                    "last_message_id": case((newer, stmt.excluded.last_message_id), else_=table.c.last_message_id),
+                    "last_at": case((newer, stmt.excluded.last_at), else_=table.c.last_at),
+                    "unread_count_a": stmt.excluded.unread_count_a,
+                    "unread_count_b": stmt.excluded.unread_count_b,
+                },
+            )
+            db.execute(stmt, [dict(row) for row in rows])
+
+        has_messages = select(Message.id).where(or_(
+            and_(Message.sender_id == Conversation.user_a_id, Message.recipient_id == Conversation.user_b_id),
+            and_(Message.sender_id == Conversation.user_b_id, Message.recipient_id == Conversation.user_a_id),
+        )).exists()
+        db.execute(
+            delete(Conversation)
+            .where(Conversation.user_a_id.between(first_id, last_id), ~has_messages)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        written += len(rows)
+        last_user_id = last_id
+        logger.info(f"Rebuilt {written} conversations so far")
+
+    return written
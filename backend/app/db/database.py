@@ -1,53 +1,102 @@
 import logging
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional, Tuple
 
 from sqlalchemy import create_engine, pool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
 
 from app.core.config import settings
+from app.core.metrics import registry
+from app.db.lazy_session import LazySession
+from app.db.pool_stats import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolStats,
+    TimedCheckoutPool,
+    instrument_pool,
+    pool_limits,
+)
+from app.db.replicas import ReadSession, ReplicaRouter, write_tracker
 
 logger = logging.getLogger(__name__)
 
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching asyncio driver."""
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
 class DatabaseManager:
     """Enhanced database manager with connection pooling and better session management."""
     
     def __init__(self):
         self.engine: Engine = None
         self.SessionLocal = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.AsyncSessionLocal = None
+        self.replica_engines: List[Engine] = []
+        self.async_replica_engines: List[AsyncEngine] = []
+        self.ReadSessionLocal = None
+        self.AsyncReadSessionLocal = None
+        # engine name -> (engine, PoolStats), for instrumented pools
+        self.pool_stats: Dict[str, Tuple[Engine, PoolStats]] = {}
         self._setup_engine()
         self._setup_session_factory()
+        self._setup_async_engine()
+        self._setup_read_replicas()
     
     def _setup_engine(self):
         """Set up SQLAlchemy engine with connection pooling."""
         logger.info("Creating SQLAlchemy engine with connection pooling")
-        
+        self.engine = self._create_engine(settings.DATABASE_URL, "sync")
+        logger.info(f"Database engine created successfully for: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+    
+    def _pool_kwargs(self) -> dict:
+        """Pool settings shared by every PostgreSQL engine (see `pool_limits`)."""
+        pool_size, max_overflow = pool_limits()
+        return {
+            "pool_size": pool_size,  # Number of connections to maintain in the pool
+            "max_overflow": max_overflow,  # Additional connections that can be created on demand
+            "pool_timeout": settings.DB_POOL_TIMEOUT,  # Seconds to wait for a connection before failing
+            "pool_recycle": settings.DB_POOL_RECYCLE,  # Recycle connections after this many seconds
+        }
+    
+    def _instrument(self, engine: Engine, name: str) -> None:
+        """Record checkout telemetry for QueuePool engines."""
+        if isinstance(engine.pool, TimedCheckoutPool):
+            _, max_overflow = pool_limits()
+            self.pool_stats[name] = (engine, instrument_pool(engine.pool, name, max_overflow))
+    
+    def _create_engine(self, url: str, name: str) -> Engine:
+        """Create a pooled sync engine for the primary or a replica."""
         # Enhanced engine configuration with connection pooling
         engine_kwargs = {
             "echo": False,  # Set to True for SQL logging in development
-            "pool_size": 20,  # Number of connections to maintain in the pool
-            "max_overflow": 30,  # Additional connections that can be created on demand
-            "pool_pre_ping": True,  # Validate connections before use
-            "pool_recycle": 3600,  # Recycle connections every hour
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Validate connections before use
             "connect_args": {}
         }
         
         # PostgreSQL specific optimizations
-        if "postgresql" in settings.DATABASE_URL:
+        if "postgresql" in url:
+            engine_kwargs.update(self._pool_kwargs())
             engine_kwargs["connect_args"] = {
                 "connect_timeout": 10,
                 "application_name": "beacon_backend"
             }
-            engine_kwargs["poolclass"] = pool.QueuePool
+            engine_kwargs["poolclass"] = InstrumentedQueuePool
         # SQLite specific settings (for development)
-        elif "sqlite" in settings.DATABASE_URL:
+        elif "sqlite" in url:
             engine_kwargs["connect_args"] = {"check_same_thread": False}
             engine_kwargs["poolclass"] = pool.StaticPool
         
-        self.engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
-        logger.info(f"Database engine created successfully for: {settings.DATABASE_URL.split('@')[-1] if '@' in settings.DATABASE_URL else 'local'}")
+        engine = create_engine(url, **engine_kwargs)
+        self._instrument(engine, name)
+        return engine
     
     def _setup_session_factory(self):
         """Set up session factory with optimized settings."""
@@ -59,6 +108,92 @@ class DatabaseManager:
             expire_on_commit=False  # Keep objects accessible after commit
         )
     
+    def _setup_async_engine(self):
+        """
+        Set up the asyncio engine (asyncpg for PostgreSQL, aiosqlite for SQLite).
+        The sync engine stays the one used for migrations and seeding.
+        """
+        try:
+            self.async_engine = self._create_async_engine(settings.DATABASE_URL, "async")
+        except ImportError as e:
+            logger.warning(f"Async database driver not installed, async sessions disabled: {str(e)}")
+            return
+        
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine,
+            autoflush=False,
+            expire_on_commit=False  # Objects are serialized after the handler commits
+        )
+        logger.info("Async database engine created successfully")
+    
+    def _create_async_engine(self, url: str, name: str) -> AsyncEngine:
+        """Create a pooled asyncio engine for the primary or a replica."""
+        async_url = get_async_database_url(url)
+        engine_kwargs = {
+            "echo": False,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "connect_args": {}
+        }
+        
+        if "postgresql" in async_url:
+            engine_kwargs.update(self._pool_kwargs())
+            engine_kwargs.update({
+                "poolclass": InstrumentedAsyncAdaptedQueuePool,
+                "connect_args": {
+                    "timeout": 10,
+                    "server_settings": {"application_name": "beacon_backend"}
+                }
+            })
+        elif "sqlite" in async_url:
+            engine_kwargs["poolclass"] = pool.StaticPool
+        
+        engine = create_async_engine(async_url, **engine_kwargs)
+        self._instrument(engine.sync_engine, name)
+        return engine
+    
+    def _setup_read_replicas(self):
+        """
+        Set up read-only session factories routed by ReplicaRouter.
+        Without DATABASE_REPLICA_URLS they read from the primary.
+        """
+        for index, url in enumerate(settings.DATABASE_REPLICA_URLS):
+            self.replica_engines.append(self._create_engine(url, f"replica{index}"))
+            if self.async_engine is not None:
+                self.async_replica_engines.append(self._create_async_engine(url, f"async_replica{index}"))
+        if settings.DATABASE_REPLICA_URLS:
+            logger.info(f"Configured {len(settings.DATABASE_REPLICA_URLS)} read replica(s)")
+            if settings.WEB_CONCURRENCY > 1 and not settings.DATABASE_REPLICA_STICKY_REDIS_ENABLED:
+                logger.warning(
+                    "Read-your-writes only covers the worker that handled a write; "
+                    "set DATABASE_REPLICA_STICKY_REDIS_ENABLED to share writes between workers"
+                )
+        
+        self.ReadSessionLocal = sessionmaker(
+            class_=ReadSession,
+            router=ReplicaRouter(
+                self.engine,
+                self.replica_engines,
+                write_tracker,
+                health_check_seconds=settings.DATABASE_REPLICA_HEALTH_CHECK_SECONDS,
+            ),
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        if self.async_engine is not None:
+            self.AsyncReadSessionLocal = async_sessionmaker(
+                sync_session_class=ReadSession,
+                router=ReplicaRouter(
+                    self.async_engine.sync_engine,
+                    [replica.sync_engine for replica in self.async_replica_engines],
+                    write_tracker,
+                    health_check_seconds=settings.DATABASE_REPLICA_HEALTH_CHECK_SECONDS,
+                    ping_engines=self.replica_engines,
+                ),
+                autoflush=False,
+                expire_on_commit=False
+            )
+    
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
         """Context manager for database sessions with automatic cleanup."""
@@ -77,15 +212,68 @@ class DatabaseManager:
         """Get a new database session (for dependency injection)."""
         return self.SessionLocal()
     
+    def get_async_db_session(self) -> AsyncSession:
+        """Get a new async database session (for dependency injection)."""
+        if self.AsyncSessionLocal is None:
+            raise RuntimeError("Async database engine is not configured")
+        return self.AsyncSessionLocal()
+    
+    def get_read_db_session(self) -> Session:
+        """Get a new read-only session on a replica (for dependency injection)."""
+        return self.ReadSessionLocal()
+    
+    def get_async_read_db_session(self) -> AsyncSession:
+        """Get a new async read-only session on a replica (for dependency injection)."""
+        if self.AsyncReadSessionLocal is None:
+            raise RuntimeError("Async database engine is not configured")
+        return self.AsyncReadSessionLocal()
+    
+    def pool_report(self) -> Dict[str, Dict[str, Any]]:
+        """Checkout telemetry and current usage of every instrumented pool."""
+        return {name: stats.report(engine.pool) for name, (engine, stats) in self.pool_stats.items()}
+    
     def close_engine(self):
         """Close the database engine and all connections."""
         if self.engine:
             logger.info("Closing database engine")
             self.engine.dispose()
+        for replica in self.replica_engines:
+            replica.dispose()
+    
+    async def close_async_engine(self):
+        """Close the async database engine and all its connections."""
+        if self.async_engine:
+            logger.info("Closing async database engine")
+            await self.async_engine.dispose()
+        for replica in self.async_replica_engines:
+            await replica.dispose()
 
 # Global database manager instance
 db_manager = DatabaseManager()
 
+def _pool_samples(measure):
+    """Read one QueuePool statistic from every engine, replicas included."""
+    engines = [("sync", db_manager.engine), ("async", db_manager.async_engine)]
+    engines += [(f"replica{index}", replica) for index, replica in enumerate(db_manager.replica_engines)]
+    engines += [(f"async_replica{index}", replica) for index, replica in enumerate(db_manager.async_replica_engines)]
+    for name, engine in engines:
+        pool_ = getattr(engine, "pool", None)
+        # StaticPool/NullPool (SQLite) keep no checkout statistics
+        if isinstance(pool_, pool.QueuePool):
+            yield {"engine": name}, measure(pool_)
+
+@registry.collector("db_pool_size", "Configured number of persistent connections")
+def _pool_size():
+    return _pool_samples(lambda p: p.size())
+
+@registry.collector("db_pool_checked_out", "Connections currently checked out of the pool")
+def _pool_checked_out():
+    return _pool_samples(lambda p: p.checkedout())
+
+@registry.collector("db_pool_overflow", "Overflow connections open beyond pool_size (negative while the pool is not full)")
+def _pool_overflow():
+    return _pool_samples(lambda p: p.overflow())
+
 # Create base class for models
 Base = declarative_base()
 
@@ -97,8 +285,12 @@ def get_db() -> Generator[Session, None, None]:
     """
     FastAPI dependency to get database session.
     Provides automatic session management with proper cleanup.
+    
+    The session is created on first use, and a read-only transaction's
+    connection is returned to the pool when the endpoint returns (see
+    `LazySession`), before the response is serialized.
     """
-    session = db_manager.get_db_session()
+    session = LazySession(db_manager.get_db_session)
     try:
         yield session
     except Exception as e:
@@ -112,6 +304,45 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         session.close()
 
+# Dependency to get an async DB session (FastAPI dependency injection)
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency to get an async database session.
+    Use with `async def` endpoints so DB waits don't occupy a worker thread.
+    """
+    session = db_manager.get_async_db_session()
+    try:
+        yield session
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Async database session error in dependency: {str(e)}")
+        raise
+    finally:
+        await session.close()
+
+# Dependency to get a read-only DB session (FastAPI dependency injection)
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    FastAPI dependency for endpoints that only read.
+    Queries go to a healthy read replica (round-robin), or to the primary
+    when none is configured or the current user wrote recently.
+    Created lazily like `get_db`.
+    """
+    session = LazySession(db_manager.get_read_db_session)
+    try:
+        yield session
+    finally:
+        session.close()
+
+# Dependency to get an async read-only DB session (FastAPI dependency injection)
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """`get_read_db` for `async def` endpoints."""
+    session = db_manager.get_async_read_db_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
 # Context manager for manual session handling
 def get_db_context():
     """Context manager for database sessions outside of FastAPI."""
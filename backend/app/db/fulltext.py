@@ -0,0 +1,182 @@
+import html
+import re
+from typing import List, Optional
+
+from sqlalchemy import DDL, Boolean, Float, String, bindparam, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+# Full-text search over projects.title (weight A) and projects.description
+# (weight B).
+#
+# PostgreSQL: a generated `search_vector` tsvector column with a GIN index
+# (migration 005), queried with plainto_tsquery.
+# SQLite (development and tests): an external-content FTS5 table kept in
+# sync by triggers, ranked with bm25.
+#
+# Both are created by the DDL below when the projects table is created
+# with `Base.metadata.create_all`.
+
+TEXT_SEARCH_CONFIG = "english"
+
+# Delimiters the database wraps matched terms in; `render_snippet` turns
+# them into <mark> tags after escaping the rest of the text
+_MATCH_START = "\x02"
+_MATCH_STOP = "\x03"
+_SNIPPET_WORDS = 24
+
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+_POSTGRES_DDL = [
+    f"ALTER TABLE projects ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX ix_projects_search_vector ON projects USING gin (search_vector)",
+]
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE projects_fts USING fts5("
+    "title, description, content='projects', tokenize='porter unicode61')",
+    "CREATE TRIGGER projects_fts_insert AFTER INSERT ON projects BEGIN "
+    "INSERT INTO projects_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER projects_fts_delete AFTER DELETE ON projects BEGIN "
+    "INSERT INTO projects_fts(projects_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER projects_fts_update AFTER UPDATE OF title, description ON projects BEGIN "
+    "INSERT INTO projects_fts(projects_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO projects_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+]
+
+
+def install_project_search(table) -> None:
+    """Create the search column/index or FTS5 table along with `table`."""
+    for statement in _POSTGRES_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in _SQLITE_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL("DROP TABLE IF EXISTS projects_fts").execute_if(dialect="sqlite"))
+
+
+# PostgreSQL's `english` stop words, which plainto_tsquery drops. FTS5 has
+# no stop words, so they are dropped here to make both backends agree.
+STOPWORDS = frozenset("""
+    i me my myself we our ours ourselves you your yours yourself yourselves
+    he him his himself she her hers herself it its itself they them their
+    theirs themselves what which who whom this that these those am is are was
+    were be been being have has had having do does did doing a an the and but
+    if or because as until while of at by for with about against between into
+    through during before after above below to from up down in out on off
+    over under again further then once here there when where why how all any
+    both each few more most other some such no nor not only own same so than
+    too very s t can will just don should now
+""".split())
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of a search box query, without FTS operators, punctuation or stop words."""
+    return [term for term in re.findall(r"\w+", q.lower()) if term not in STOPWORDS]
+
+
+def _fts5_query(terms: List[str]) -> str:
+    # Quoted terms are plain tokens to FTS5; adjacent ones must all match
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class _ProjectSearch(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, terms: List[str]):
+        # The same words reach both backends, so "fashion photographer Miami"
+        # requires every word on PostgreSQL and SQLite alike
+        value = " ".join(terms)
+        super().__init__(bindparam(None, value, type_=String), bindparam(None, _fts5_query(terms), type_=String))
+
+
+class project_matches(_ProjectSearch):
+    """True for projects whose title or description contain every term."""
+
+    name = "project_matches"
+    type = Boolean()
+
+
+class project_rank(_ProjectSearch):
+    """Relevance of a matching project; higher is better, title hits count more."""
+
+    name = "project_rank"
+    type = Float()
+
+
+class project_snippet(_ProjectSearch):
+    """Excerpt of the description around the matched terms (see `render_snippet`)."""
+
+    name = "project_snippet"
+    type = String()
+
+
+def _query(element, compiler, **kw) -> str:
+    # Render only the bind this dialect uses, so positional paramstyles
+    # (asyncpg, sqlite) get exactly one parameter per placeholder
+    return compiler.process(element.clauses.clauses[0], **kw)
+
+
+def _fts5(element, compiler, **kw) -> str:
+    return compiler.process(element.clauses.clauses[1], **kw)
+
+
+def _tsquery(query: str) -> str:
+    return f"plainto_tsquery('{TEXT_SEARCH_CONFIG}', {query})"
+
+
+@compiles(project_matches)
+def _compile_matches(element, compiler, **kw):
+    query = _query(element, compiler, **kw)
+    return f"projects.search_vector @@ {_tsquery(query)}"
+
+
+@compiles(project_rank)
+def _compile_rank(element, compiler, **kw):
+    query = _query(element, compiler, **kw)
+    return f"ts_rank_cd(projects.search_vector, {_tsquery(query)})"
+
+
+@compiles(project_snippet)
+def _compile_snippet(element, compiler, **kw):
+    query = _query(element, compiler, **kw)
+    options = f"StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, MaxWords={_SNIPPET_WORDS}, MinWords=8"
+    return f"ts_headline('{TEXT_SEARCH_CONFIG}', projects.description, {_tsquery(query)}, '{options}')"
+
+
+def _fts5_subquery(expression: str, fts5_query: str) -> str:
+    return (
+        f"(SELECT {expression} FROM projects_fts "
+        f"WHERE projects_fts MATCH {fts5_query} AND projects_fts.rowid = projects.rowid)"
+    )
+
+
+@compiles(project_matches, "sqlite")
+def _compile_matches_sqlite(element, compiler, **kw):
+    fts5_query = _fts5(element, compiler, **kw)
+    return f"(projects.rowid IN (SELECT rowid FROM projects_fts WHERE projects_fts MATCH {fts5_query}))"
+
+
+@compiles(project_rank, "sqlite")
+def _compile_rank_sqlite(element, compiler, **kw):
+    fts5_query = _fts5(element, compiler, **kw)
+    # bm25 is lower for better matches; weights mirror ts_rank's A (1.0) vs B (0.4)
+    return _fts5_subquery("-bm25(projects_fts, 2.5, 1.0)", fts5_query)
+
+
+@compiles(project_snippet, "sqlite")
+def _compile_snippet_sqlite(element, compiler, **kw):
+    fts5_query = _fts5(element, compiler, **kw)
+    snippet = f"snippet(projects_fts, 1, '{_MATCH_START}', '{_MATCH_STOP}', '…', {_SNIPPET_WORDS})"
+    return _fts5_subquery(snippet, fts5_query)
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a snippet and wrap its matched terms in <mark> tags."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MATCH_START, "<mark>").replace(_MATCH_STOP, "</mark>")
@@ -0,0 +1,105 @@
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+from sqlalchemy.orm import Session
+
+from app.core.context import request_sessions_var
+
+logger = logging.getLogger(__name__)
+
+
+class LazySession:
+    """
+    Stand-in for a `Session` that builds it on first use.
+
+    Requests that fail auth early, hit the user cache or return before
+    touching the database never create a session, let alone check out a
+    connection. Once created, the session registers itself with the
+    current request so `release_request_sessions` can hand its connection
+    back to the pool as soon as the endpoint returns.
+    """
+
+    def __init__(self, factory: Callable[[], Session]):
+        self._factory = factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def _get_session(self) -> Session:
+        if self._session is None:
+            self._session = self._factory()
+            sessions = request_sessions_var.get()
+            if sessions is not None:
+                sessions.append(self)
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get_session(), name)
+
+    def __contains__(self, instance) -> bool:
+        return instance in self._get_session()
+
+    def __iter__(self):
+        return iter(self._get_session())
+
+    def can_release(self) -> bool:
+        """Whether the session holds a connection for a read-only transaction."""
+        session = self._session
+        if session is None or not session.in_transaction():
+            return False
+        # Uncommitted writes are left for the dependency to roll back
+        return not (session.new or session.dirty or session.deleted or session.info.get("has_writes"))
+
+    def release(self) -> None:
+        """
+        End a read-only transaction and return its connection to the pool.
+
+        Loaded objects are not expired, so the response can still be
+        serialized from them; a lazy load afterwards simply checks out a
+        connection again.
+        """
+        if not self.can_release():
+            return
+        session = self._session
+        expire_on_commit = session.expire_on_commit
+        session.expire_on_commit = False
+        try:
+            session.commit()
+        finally:
+            session.expire_on_commit = expire_on_commit
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+@contextmanager
+def track_request_sessions() -> Iterator[List[LazySession]]:
+    """Collect the lazy sessions started while handling one request."""
+    sessions: List[LazySession] = []
+    token = request_sessions_var.set(sessions)
+    try:
+        yield sessions
+    finally:
+        request_sessions_var.reset(token)
+
+
+def sessions_to_release() -> List[LazySession]:
+    """Sessions of the current request still holding a read-only connection."""
+    return [session for session in request_sessions_var.get() or () if session.can_release()]
+
+
+def release_sessions(sessions: List[LazySession]) -> None:
+    for session in sessions:
+        try:
+            session.release()
+        except Exception as e:
+            # The dependency still closes the session afterwards
+            logger.warning("Could not release DB session early: %s", e)
@@ -0,0 +1,222 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Recent samples kept per engine for percentiles in the admin report
+_RECENT_SAMPLES = 1000
+# connection_record.info key set by the pool's "connect" event
+_NEW_CONNECTION = "pool_stats_new_connection"
+# QueuePool._do_get retries by calling itself; only the outer call is timed.
+# A context variable, since async checkouts of one thread interleave.
+_timing_checkout: ContextVar[bool] = ContextVar("timing_checkout", default=False)
+
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_checkout_duration_seconds = registry.histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time a connection stays checked out of the pool",
+    ("engine",),
+)
+db_pool_connect_seconds = registry.histogram(
+    "db_pool_connect_seconds",
+    "Time spent opening a new connection for a checkout",
+    ("engine",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+db_pool_checkout_timeouts_total = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ("engine",),
+)
+db_pool_overflow_checkouts_total = registry.counter(
+    "db_pool_overflow_checkouts_total",
+    "Checkouts served while the pool was beyond pool_size",
+    ("engine",),
+)
+
+
+def pool_limits() -> Tuple[int, int]:
+    """
+    Return (pool_size, max_overflow) for each engine in this process.
+
+    With DB_POOL_AUTO_SIZE, the server's connection budget
+    (DB_MAX_CONNECTIONS) is split across every pool that can connect to
+    it: WEB_CONCURRENCY worker processes, each holding a sync and an async
+    engine. 40% of each share is kept open and the rest is overflow,
+    the same ratio as the 20 + 30 default.
+    """
+    if not settings.DB_POOL_AUTO_SIZE:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    pools = max(settings.WEB_CONCURRENCY, 1) * 2
+    per_pool = max(settings.DB_MAX_CONNECTIONS // pools, 2)
+    pool_size = max(per_pool * 2 // 5, 1)
+    return pool_size, per_pool - pool_size
+
+
+class PoolStats:
+    """Checkout counters and recent timings of one engine's pool."""
+
+    def __init__(self, name: str, max_overflow: int):
+        self.name = name
+        self.max_overflow = max_overflow
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.peak_overflow = 0
+        self.waits: Deque[float] = deque(maxlen=_RECENT_SAMPLES)
+        self.connects: Deque[float] = deque(maxlen=_RECENT_SAMPLES)
+        self.durations: Deque[float] = deque(maxlen=_RECENT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record_checkout(self, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if overflow > 0:
+                self.overflow_checkouts += 1
+                self.peak_overflow = max(self.peak_overflow, overflow)
+        if overflow > 0:
+            db_pool_overflow_checkouts_total.inc(engine=self.name)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits.append(seconds)
+        db_pool_checkout_wait_seconds.observe(seconds, engine=self.name)
+
+    def record_connect(self, seconds: float) -> None:
+        with self._lock:
+            self.connects.append(seconds)
+        db_pool_connect_seconds.observe(seconds, engine=self.name)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        db_pool_checkout_timeouts_total.inc(engine=self.name)
+
+    def record_duration(self, seconds: float) -> None:
+        with self._lock:
+            self.durations.append(seconds)
+        db_pool_checkout_duration_seconds.observe(seconds, engine=self.name)
+
+    @staticmethod
+    def _summary(samples) -> Dict[str, Optional[float]]:
+        ordered = sorted(samples)
+        if not ordered:
+            return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+
+        def percentile(fraction: float) -> float:
+            return round(ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)] * 1000, 3)
+
+        return {"p50_ms": percentile(0.5), "p99_ms": percentile(0.99), "max_ms": round(ordered[-1] * 1000, 3)}
+
+    def report(self, pool: QueuePool) -> Dict[str, Any]:
+        with self._lock:
+            waits, connects, durations = list(self.waits), list(self.connects), list(self.durations)
+            counters = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "peak_overflow": self.peak_overflow,
+            }
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": self.max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            **counters,
+            "checkout_wait": self._summary(waits),
+            "connect": self._summary(connects),
+            "checkout_duration": self._summary(durations),
+        }
+
+
+class TimedCheckoutPool:
+    """
+    Times `_do_get`, where a checkout waits for a connection to come back
+    when the pool is full, and counts checkouts and overflow on the pool
+    that served them (`recreate()` replaces the pool, not its listeners).
+
+    Pool events fire only once a connection is in hand, so the wait and a
+    pool_timeout can't be seen from a listener. Pre-ping and reconnects
+    happen after `_do_get` and are not counted as waiting. When `_do_get`
+    opened a new connection instead (room for overflow), it did not wait:
+    its time is recorded as connect time.
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        if self.stats is None or _timing_checkout.get():
+            return super()._do_get()
+        token = _timing_checkout.set(True)
+        start = time.perf_counter()
+        try:
+            connection_record = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            _timing_checkout.reset(token)
+        elapsed = time.perf_counter() - start
+        if connection_record.info.pop(_NEW_CONNECTION, False):
+            self.stats.record_connect(elapsed)
+            self.stats.record_wait(0.0)
+        else:
+            self.stats.record_wait(elapsed)
+        self.stats.record_checkout(self.overflow())
+        return connection_record
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(TimedCheckoutPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(TimedCheckoutPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(pool: TimedCheckoutPool, name: str, max_overflow: int) -> PoolStats:
+    """Attach stats and connect/checkout/checkin listeners to an instrumented pool."""
+    stats = PoolStats(name, max_overflow)
+    pool.stats = stats
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info[_NEW_CONNECTION] = True
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        # Set by reconnects outside `_do_get` too; only that checkout counts it
+        connection_record.info.pop(_NEW_CONNECTION, None)
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            stats.record_duration(time.perf_counter() - checked_out_at)
+
+    return stats
@@ -0,0 +1,50 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements executed within one `count_queries` block."""
+
+    __slots__ = ("count", "statements")
+
+    def __init__(self):
+        self.count = 0
+        # SQL text -> executions; bound parameters are not part of the text,
+        # so the same query for different rows counts as one shape
+        self.statements: Counter = Counter()
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (N+1 candidates)."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+# Stats of the block currently counting, shared with the worker threads and
+# greenlets that run its queries
+request_queries_var: ContextVar[Optional[QueryStats]] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count every statement executed, on any engine, inside the block."""
+    stats = QueryStats()
+    token = request_queries_var.set(stats)
+    try:
+        yield stats
+    finally:
+        request_queries_var.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    stats = request_queries_var.get()
+    if stats is not None:
+        stats.count += 1
+        stats.statements[statement] += 1
@@ -0,0 +1,254 @@
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.context import current_user_id_var
+
+logger = logging.getLogger(__name__)
+
+
+# Every worker subscribes; a published user id counts as a write everywhere
+_WRITES_CHANNEL = "beacon:user-writes"
+
+
+class WriteTracker:
+    """
+    When each user last committed a write, for read-your-writes.
+
+    Writes are recorded in-process. With `redis_url`, each one is also
+    published to every worker, which records it as well, so the user's
+    next request reads from the primary whichever worker takes it. Without
+    Redis only the worker that saw the write knows about it: with several
+    workers, a read landing elsewhere may still hit a lagging replica.
+
+    `record` runs from commit hooks, possibly on the event loop, so its
+    Redis call is queued to a background thread.
+    """
+
+    def __init__(self, sticky_seconds: float, max_entries: int = 100000, redis_url: Optional[str] = None):
+        self.sticky_seconds = sticky_seconds
+        self.max_entries = max_entries
+        self._writes: Dict[int, float] = {}
+        # Every user reads from the primary until then (monotonic time)
+        self._primary_until = 0.0
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_writer: Optional[ThreadPoolExecutor] = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.1)
+                self._redis_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="write-tracker")
+                # Blocking reads wait for messages, so they get their own client
+                listener = redis.Redis.from_url(redis_url)
+                threading.Thread(
+                    target=self._listen, args=(listener,), name="write-tracker-writes", daemon=True
+                ).start()
+                logger.info("Read-your-writes shared through Redis")
+            except Exception as e:
+                logger.error(f"Could not share read-your-writes through Redis: {str(e)}")
+
+    def _record_local(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._writes[user_id] = now
+            if len(self._writes) > self.max_entries:
+                cutoff = now - self.sticky_seconds
+                self._writes = {uid: at for uid, at in self._writes.items() if at >= cutoff}
+
+    def _publish(self, user_id: int) -> None:
+        try:
+            self._redis.publish(_WRITES_CHANNEL, str(user_id))
+        except Exception as e:
+            logger.warning(f"Could not publish write of user {user_id}: {str(e)}")
+
+    def _handle_write(self, message: Dict[str, Any]) -> None:
+        try:
+            self._record_local(int(message["data"]))
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed write notification: {message!r}")
+
+    def _listen(self, listener) -> None:
+        """Record writes published by other workers, reconnecting on errors."""
+        while True:
+            try:
+                pubsub = listener.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(_WRITES_CHANNEL)
+                # Writes may have been missed while disconnected
+                self._primary_until = time.monotonic() + self.sticky_seconds
+                for message in pubsub.listen():
+                    self._handle_write(message)
+            except Exception as e:
+                logger.warning(f"Write notification listener failed: {str(e)}")
+                time.sleep(1)
+
+    def record(self, user_id: int) -> None:
+        """Note a committed write here and, with Redis, on every other worker."""
+        self._record_local(user_id)
+        if self._redis_writer is not None:
+            self._redis_writer.submit(self._publish, user_id)
+
+    def wrote_recently(self, user_id: Optional[int]) -> bool:
+        if user_id is None or self.sticky_seconds <= 0:
+            return False
+        now = time.monotonic()
+        if now < self._primary_until:
+            return True
+        written_at = self._writes.get(user_id)
+        return written_at is not None and now - written_at < self.sticky_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes.clear()
+            self._primary_until = 0.0
+
+
+class ReplicaRouter:
+    """
+    Pick the engine for a read-only session.
+
+    Replicas are used round-robin. Each one is pinged at most every
+    `health_check_seconds`, from a background thread, so no request waits
+    on a ping: requests use the last known state (healthy until the first
+    check says otherwise), and the one that finds it stale schedules the
+    next check. A replica that fails the ping is skipped until a later
+    check succeeds. Reads fall back to the primary when no replica is
+    configured or healthy, and for users who wrote within the
+    `write_tracker` window, so they always see their own changes.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: List[Engine],
+        write_tracker: WriteTracker,
+        health_check_seconds: float = 30,
+        ping_engines: Optional[List[Engine]] = None,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        # Engines for the same servers that can connect from a plain thread;
+        # the sync cores of async engines cannot, outside their event loop
+        self.ping_engines = ping_engines or replicas
+        self.write_tracker = write_tracker
+        self.health_check_seconds = health_check_seconds
+        self._next = itertools.cycle(range(len(replicas))) if replicas else None
+        # replica index -> (healthy, monotonic time of the check)
+        self._health: Dict[int, tuple] = {}
+        # Replicas whose check is running
+        self._checking: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def _ping(self, index: int) -> bool:
+        replica = self.ping_engines[index]
+        try:
+            with replica.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.warning(f"Read replica {replica.url.render_as_string(hide_password=True)} failed health check: {str(e)}")
+            return False
+
+    def _refresh(self, index: int) -> None:
+        healthy = False
+        try:
+            healthy = self._ping(index)
+        finally:
+            with self._lock:
+                self._health[index] = (healthy, time.monotonic())
+                self._checking.discard(index)
+
+    def check_health(self) -> None:
+        """Ping every replica now (blocking; startup, tests)."""
+        for index in range(len(self.replicas)):
+            self._refresh(index)
+
+    def _is_healthy(self, index: int) -> bool:
+        with self._lock:
+            healthy, checked_at = self._health.get(index, (True, None))
+            due = checked_at is None or time.monotonic() - checked_at >= self.health_check_seconds
+            start_check = due and index not in self._checking
+            if start_check:
+                self._checking.add(index)
+        if start_check:
+            threading.Thread(
+                target=self._refresh, args=(index,), name=f"replica-health-{index}", daemon=True
+            ).start()
+        return healthy
+
+    def choose(self, user_id: Optional[int] = None) -> Engine:
+        """Return a healthy replica, or the primary."""
+        if self._next is None or self.write_tracker.wrote_recently(user_id):
+            return self.primary
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                index = next(self._next)
+            if self._is_healthy(index):
+                return self.replicas[index]
+        logger.warning("No healthy read replica, reading from the primary")
+        return self.primary
+
+
+class ReadSession(Session):
+    """
+    Session for read-only endpoints, bound to the engine `router` picks.
+
+    The engine is chosen on the first statement rather than when the
+    session is created, so the authenticated user is known by then and
+    read-your-writes can apply.
+    """
+
+    def __init__(self, router: ReplicaRouter, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+        self._read_bind: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._read_bind is None:
+            self._read_bind = self.router.choose(current_user_id_var.get())
+        return self._read_bind
+
+
+write_tracker = WriteTracker(
+    sticky_seconds=settings.DATABASE_REPLICA_STICKY_SECONDS,
+    # Only worth a subscription when reads can go to a replica
+    redis_url=(
+        settings.REDIS_URL
+        if settings.DATABASE_REPLICA_URLS and settings.DATABASE_REPLICA_STICKY_REDIS_ENABLED
+        else None
+    ),
+)
+
+
+# Remember which users committed writes. ORM flushes and bulk/Core
+# statements run through a session both count.
+@event.listens_for(Session, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_write_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_writer(session):
+    if session.info.pop("has_writes", False):
+        user_id = current_user_id_var.get()
+        if user_id is not None:
+            write_tracker.record(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session):
+    session.info.pop("has_writes", None)
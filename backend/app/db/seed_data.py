@@ -5,7 +5,9 @@ from app.models.application import Application
 from app.models.message import Message
 from app.models.payment import Payment
 from app.models.project_file import ProjectFile
+from app.models.conversation import Conversation
 from app.auth.password import get_password_hash
+from app.db.conversations import rebuild_conversations
 import uuid
 from datetime import datetime, timedelta
 
@@ -40,6 +42,7 @@ def seed_mock_data(db: Session):
     """Seed the database with mock data for development and testing"""
     
     # Clear existing data
+    db.query(Conversation).delete()
     db.query(Payment).delete()
     db.query(ProjectFile).delete()
     db.query(Message).delete()
@@ -469,6 +472,9 @@ def seed_mock_data(db: Session):
     
     db.commit()
     
+    # Build conversation summaries for the seeded messages
+    rebuild_conversations(db)
+    
     # Create mock payments
     payments_data = [
         # Payment for DJ services (accepted application)
@@ -0,0 +1,63 @@
+import re
+
+from sqlalchemy import event
+
+from app.db.seed_data import seed_mock_data
+from app.models.project import Project
+from app.models.user import User
+
+# A bare "SCAN <table>" in SQLite's plan is a full table scan
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+INDEXED_TABLES = {"messages", "applications", "payments", "projects", "conversations"}
+
+
+def test_endpoint_queries_use_indexes(client, db, engine, async_engine, login):
+    seed_mock_data(db)
+    client_user = db.query(User).filter(User.email == "john.smith@stylemagzine.com").one()
+    creative_user = db.query(User).filter(User.email == "sarah.johnson@example.com").one()
+    project = db.query(Project).filter(Project.client_id == client_user.id).first()
+
+    executed = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            executed.append((statement, parameters))
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _record)
+    try:
+        login(client_user)
+        for url in (
+            "/api/v1/projects/",
+            "/api/v1/projects/my-projects?status=active",
+            f"/api/v1/applications/project/{project.id}",
+            f"/api/v1/payments/project/{project.id}",
+            "/api/v1/payments/me",
+            "/api/v1/messages/conversations",
+            f"/api/v1/messages/?other_user_id={creative_user.id}",
+            f"/api/v1/messages/?project_id={project.id}",
+        ):
+            assert client.get(url).status_code == 200, url
+
+        login(creative_user)
+        for url in (
+            "/api/v1/applications/me",
+            "/api/v1/payments/me",
+            "/api/v1/messages/",
+        ):
+            assert client.get(url).status_code == 200, url
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", _record)
+
+    assert executed
+    with engine.connect() as connection:
+        for statement, parameters in executed:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            scanned = {
+                match.group(1)
+                for row in plan
+                for match in [FULL_SCAN.match(row[-1])]
+                if match and match.group(1) in INDEXED_TABLES
+            }
+            assert not scanned, f"Full scan of {scanned} in:\n{statement}\n{plan}"
@@ -0,0 +1,104 @@
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, model_validator
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.timing import TimedRoute
+from app.db.database import db_manager, get_db
+from app.db.lazy_session import LazySession
+from app.models.user import User
+
+
+def _add_user(engine):
+    with sessionmaker(bind=engine)() as session:
+        session.add(User(email="a@example.com", hashed_password="x", first_name="A", last_name="B", role="client"))
+        session.commit()
+
+
+@pytest.fixture
+def factory(engine):
+    _add_user(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_session_is_created_on_first_use(factory):
+    created = []
+    lazy = LazySession(lambda: created.append(1) or factory())
+    lazy.close()
+    assert created == []
+
+    lazy.execute(select(User.id))
+    assert created == [1]
+    lazy.close()
+
+
+def test_release_returns_connection_and_keeps_objects(engine, factory):
+    lazy = LazySession(factory)
+    user = lazy.scalars(select(User)).one()
+    assert engine.pool.checkedout() == 1
+
+    lazy.release()
+    assert engine.pool.checkedout() == 0
+    # Not expired: readable without another checkout
+    assert user.email == "a@example.com"
+    assert engine.pool.checkedout() == 0
+    lazy.close()
+
+
+def test_release_leaves_uncommitted_writes_alone(engine, factory):
+    lazy = LazySession(factory)
+    lazy.scalars(select(User)).one().first_name = "Changed"
+    lazy.flush()
+
+    lazy.release()
+    assert engine.pool.checkedout() == 1
+    lazy.close()
+    with sessionmaker(bind=engine)() as session:
+        assert session.scalars(select(User.first_name)).one() == "A"
+
+
+class CheckedOut(BaseModel):
+    email: str
+    checked_out: int = -1
+
+    @model_validator(mode="after")
+    def _note_pool(self):
+        # Runs during response validation, after the endpoint returned
+        self.checked_out = db_manager.engine.pool.checkedout()
+        return self
+
+
+@pytest.fixture
+def lazy_app(engine, factory, monkeypatch):
+    monkeypatch.setattr(db_manager, "engine", engine)
+    monkeypatch.setattr(db_manager, "SessionLocal", factory)
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/sync", response_model=CheckedOut)
+    def sync_endpoint(db=Depends(get_db)):
+        return {"email": db.scalars(select(User.email)).one()}
+
+    @router.get("/async", response_model=CheckedOut)
+    async def async_endpoint(db=Depends(get_db)):
+        return {"email": db.scalars(select(User.email)).one()}
+
+    @router.get("/unused")
+    def unused_endpoint(db=Depends(get_db)):
+        return {"started": db.started}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/sync", "/async"])
+def test_connection_released_before_serialization(lazy_app, path):
+    response = lazy_app.get(path)
+    assert response.status_code == 200
+    assert response.json() == {"email": "a@example.com", "checked_out": 0}
+
+
+def test_unused_session_is_never_created(lazy_app):
+    assert lazy_app.get("/unused").json() == {"started": False}
@@ -0,0 +1,130 @@
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.db.database import db_manager
+from app.db.pool_stats import InstrumentedQueuePool, instrument_pool, pool_limits
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    stats = instrument_pool(engine.pool, "test", max_overflow=1)
+    yield engine, stats
+    engine.dispose()
+
+
+def test_pool_limits_use_settings_without_auto_size(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_AUTO_SIZE", False)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    assert pool_limits() == (7, 3)
+
+
+def test_pool_limits_split_connection_budget(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_AUTO_SIZE", True)
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 100)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    # 4 pools (2 workers x sync/async) share 100 connections
+    pool_size, max_overflow = pool_limits()
+    assert (pool_size, max_overflow) == (10, 15)
+    assert (pool_size + max_overflow) * 4 <= 100
+
+
+def test_checkouts_record_wait_duration_and_overflow(pooled_engine):
+    engine, stats = pooled_engine
+    first = engine.connect()
+    second = engine.connect()
+    second.execute(text("SELECT 1"))
+    second.close()
+    first.close()
+
+    report = stats.report(engine.pool)
+    assert report["checkouts"] == 2
+    assert report["overflow_checkouts"] == 1
+    assert report["peak_overflow"] == 1
+    assert len(stats.durations) == 2
+    assert report["max_overflow"] == 1
+    assert report["checkout_wait"]["max_ms"] is not None
+
+
+def test_checkout_timeout_is_counted(pooled_engine):
+    engine, stats = pooled_engine
+    held = [engine.connect(), engine.connect()]
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    for connection in held:
+        connection.close()
+
+    assert stats.report(engine.pool)["timeouts"] == 1
+
+
+def test_connect_and_pre_ping_are_not_waiting(tmp_path, monkeypatch):
+    path = tmp_path / "slow.db"
+
+    def slow_connect():
+        time.sleep(0.05)
+        return sqlite3.connect(path, check_same_thread=False)
+
+    engine = create_engine(
+        "sqlite://", creator=slow_connect, poolclass=InstrumentedQueuePool,
+        pool_size=1, max_overflow=1, pool_pre_ping=True,
+    )
+    stats = instrument_pool(engine.pool, "test", max_overflow=1)
+
+    def slow_ping(dbapi_connection):
+        time.sleep(0.05)
+        return True
+
+    monkeypatch.setattr(engine.dialect, "do_ping", slow_ping)
+    try:
+        for _ in range(2):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
+
+    report = stats.report(engine.pool)
+    assert report["checkouts"] == 2
+    assert len(stats.connects) == 1 and stats.connects[0] >= 0.05
+    # Neither opening the connection nor pinging it counted as waiting
+    assert report["checkout_wait"]["max_ms"] < 50
+
+
+def test_stats_follow_a_recreated_pool(pooled_engine):
+    engine, stats = pooled_engine
+    engine.dispose()
+    held = [engine.connect(), engine.connect()]
+    for connection in held:
+        connection.close()
+
+    report = stats.report(engine.pool)
+    assert report["checkouts"] == 2
+    assert report["overflow_checkouts"] == 1
+
+
+def test_db_pool_endpoint_requires_admin(client, make_user, login):
+    login(make_user(role="client"))
+    assert client.get("/api/v1/admin/db-pool").status_code == 403
+
+
+def test_db_pool_endpoint_reports_instrumented_pools(client, make_user, login, pooled_engine, monkeypatch):
+    engine, stats = pooled_engine
+    monkeypatch.setattr(db_manager, "pool_stats", {"test": (engine, stats)})
+    with engine.connect():
+        pass
+
+    login(make_user(role="admin"))
+    response = client.get("/api/v1/admin/db-pool")
+    assert response.status_code == 200
+    assert response.json()["test"]["checkouts"] == 1
@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import db_n_plus_one_total
+from app.middleware.query_counter_middleware import QueryCounterMiddleware
+from app.models.application import Application
+from app.models.project import Project
+
+
+@pytest.fixture
+def loop_app(engine):
+    """App whose only route runs one statement per item, like a lazy load per row."""
+    app = FastAPI()
+    app.add_middleware(QueryCounterMiddleware)
+
+    @app.get("/items/{count}")
+    def items(count: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1 FROM users"))
+            for item_id in range(count):
+                conn.execute(text("SELECT id FROM users WHERE id = :id"), {"id": item_id})
+        return {}
+
+    return TestClient(app)
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(loop_app, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 5)
+    flagged = db_n_plus_one_total.value(method="GET", route="/items/{count}")
+
+    with caplog.at_level(logging.WARNING, logger="backend.middleware"):
+        below = loop_app.get("/items/4")
+        above = loop_app.get("/items/6")
+
+    assert below.headers["x-db-queries"] == "5"
+    assert above.headers["x-db-queries"] == "7"
+    warnings = [r.getMessage() for r in caplog.records if "Possible N+1" in r.getMessage()]
+    assert warnings == [
+        "Possible N+1 query on GET /items/{count}: 6 identical statements: SELECT ... FROM users WHERE id = ?"
+    ]
+    assert db_n_plus_one_total.value(method="GET", route="/items/{count}") == flagged + 1
+
+
+def test_query_count_header_only_in_debug_mode(loop_app, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", False)
+
+    assert "x-db-queries" not in loop_app.get("/items/1").headers
+
+
+def test_query_budget_fails_when_exceeded(client, db, login, make_user, query_budget):
+    client_user = make_user()
+    project = Project(client_id=client_user.id, title="Logo", description="New logo", category="design")
+    db.add(project)
+    db.commit()
+    login(client_user)
+
+    with pytest.raises(pytest.fail.Exception, match=r"Ran 2 SQL statements, budget is 1"):
+        with query_budget(1):
+            client.get(f"/api/v1/applications/project/{project.id}")
+
+    with query_budget(2):
+        client.get(f"/api/v1/applications/project/{project.id}")
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.context import current_user_id_var
+from app.db.database import Base
+from app.db.replicas import ReadSession, ReplicaRouter, WriteTracker, write_tracker
+from app.models.user import User
+
+
+def _database(path, email):
+    """A SQLite database holding one user, so reads reveal which database served them."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(User(email=email, hashed_password="x", first_name="A", last_name="B", role="client"))
+        session.commit()
+    return engine
+
+
+@pytest.fixture
+def databases(tmp_path):
+    engines = {
+        name: _database(tmp_path / f"{name}.db", f"{name}@example.com")
+        for name in ("primary", "replica1", "replica2")
+    }
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+def _served_by(session):
+    return session.execute(select(User.email)).scalar_one().split("@")[0]
+
+
+def test_reads_round_robin_across_replicas(databases):
+    router = ReplicaRouter(databases["primary"], [databases["replica1"], databases["replica2"]], WriteTracker(10))
+    ReadSessionLocal = sessionmaker(class_=ReadSession, router=router)
+
+    served = []
+    for _ in range(4):
+        with ReadSessionLocal() as session:
+            served.append(_served_by(session))
+
+    assert served == ["replica1", "replica2", "replica1", "replica2"]
+
+
+def test_unhealthy_replicas_are_skipped_then_primary_is_used(databases, tmp_path):
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(databases["primary"], [broken, databases["replica1"]], WriteTracker(10))
+    router.check_health()
+    assert [router.choose() for _ in range(3)] == [databases["replica1"]] * 3
+
+    router = ReplicaRouter(databases["primary"], [broken], WriteTracker(10))
+    router.check_health()
+    assert router.choose() is databases["primary"]
+
+    router = ReplicaRouter(databases["primary"], [], WriteTracker(10))
+    assert router.choose() is databases["primary"]
+
+
+def test_health_checks_run_off_the_request_path(databases, tmp_path, monkeypatch):
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(databases["primary"], [broken], WriteTracker(10), health_check_seconds=60)
+    threads = []
+    monkeypatch.setattr(threading, "Thread", lambda **kwargs: threads.append(kwargs) or type("T", (), {"start": lambda self: None})())
+
+    # Unknown state counts as healthy; the check is only scheduled, once
+    assert router.choose() is broken
+    assert router.choose() is broken
+    assert len(threads) == 1
+
+    threads[0]["target"](*threads[0]["args"])
+    assert router.choose() is databases["primary"]
+
+
+def test_users_read_their_own_writes_from_the_primary(databases, monkeypatch):
+    router = ReplicaRouter(databases["primary"], [databases["replica1"]], write_tracker)
+    ReadSessionLocal = sessionmaker(class_=ReadSession, router=router)
+    monkeypatch.setattr(write_tracker, "sticky_seconds", 60)
+    write_tracker.clear()
+
+    token = current_user_id_var.set(42)
+    try:
+        with ReadSessionLocal() as session:
+            assert _served_by(session) == "replica1"
+
+        with sessionmaker(bind=databases["primary"])() as session:
+            session.get(User, 1).first_name = "Changed"
+            session.commit()
+
+        with ReadSessionLocal() as session:
+            assert _served_by(session) == "primary"
+
+        # Other users keep reading from replicas
+        current_user_id_var.set(7)
+        with ReadSessionLocal() as session:
+            assert _served_by(session) == "replica1"
+
+        # Once the window has passed the writer goes back to replicas
+        current_user_id_var.set(42)
+        monkeypatch.setattr(write_tracker, "sticky_seconds", 0)
+        with ReadSessionLocal() as session:
+            assert _served_by(session) == "replica1"
+    finally:
+        current_user_id_var.reset(token)
+        write_tracker.clear()
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append(message)
+
+
+def test_writes_reach_other_workers():
+    this_worker, other_worker = WriteTracker(60), WriteTracker(60)
+    this_worker._redis = _FakeRedis()
+    this_worker._publish(42)
+
+    for message in this_worker._redis.published:
+        other_worker._handle_write({"type": "message", "data": message.encode()})
+    assert other_worker.wrote_recently(42)
+    assert not other_worker.wrote_recently(7)
+
+
+def test_async_read_sessions_use_replicas(databases):
+    async_engines = {
+        name: create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool)
+        for name, engine in databases.items()
+    }
+    router = ReplicaRouter(
+        async_engines["primary"].sync_engine,
+        [async_engines["replica1"].sync_engine, async_engines["replica2"].sync_engine],
+        WriteTracker(10),
+        ping_engines=[databases["replica1"], databases["replica2"]],
+    )
+    # Checked from a plain thread, through the sync engines
+    router.check_health()
+    assert all(healthy for healthy, _ in router._health.values())
+    AsyncReadSessionLocal = async_sessionmaker(sync_session_class=ReadSession, router=router)
+
+    async def read_twice():
+        served = []
+        for _ in range(2):
+            async with AsyncReadSessionLocal() as session:
+                served.append((await session.execute(select(User.email))).scalar_one().split("@")[0])
+        for engine in async_engines.values():
+            await engine.dispose()
+        return served
+
+    assert asyncio.run(read_twice()) == ["replica1", "replica2"]
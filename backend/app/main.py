@@ -1,37 +1,25 @@
+import asyncio
 import logging
-import sys
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from app.core.process_pool import shutdown_process_pool
+from app.core.threadpool import configure_thread_limiter, thread_limiter_stats
 from app.api import api_router
-from app.db.database import get_db_context
+from app.db.database import get_db_context, db_manager
 from app.db.seed_data import seed_mock_data, seed_admin_user
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.query_counter_middleware import QueryCounterMiddleware
+from app.utils.file_gc import run_file_gc
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
-# Set up logging with custom formatter to include request ID
-class CustomFormatter(logging.Formatter):
-    def format(self, record):
-        # Add request_id to the log record if it exists
-        if hasattr(record, 'request_id'):
-            record.request_id = record.request_id
-        else:
-            record.request_id = 'N/A'
-        return super().format(record)
-
-# Set up logging
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format="%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
-# Get the root logger and set the custom formatter
-root_logger = logging.getLogger()
-for handler in root_logger.handlers:
-    handler.setFormatter(CustomFormatter("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s"))
+# Set up logging: records go through a queue to a background writer thread
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -44,9 +32,16 @@ app = FastAPI(
     redoc_url=f"{settings.API_V1_STR}/redoc",
 )
 
+# Add SQL query counting / N+1 detection middleware (inside logging, so
+# its warnings carry the request id)
+app.add_middleware(QueryCounterMiddleware)
+
 # Add logging middleware
 app.add_middleware(LoggingMiddleware)
 
+# Add request metrics middleware
+app.add_middleware(MetricsMiddleware)
+
 # Set up CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -54,6 +49,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include API routes
@@ -67,9 +63,22 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get(f"{settings.API_V1_STR}/health/threadpool")
+async def threadpool_health():
+    """Token usage and queue depth of the worker threads running sync endpoints"""
+    return thread_limiter_stats()
+
+@app.get(f"{settings.API_V1_STR}/metrics", include_in_schema=False)
+async def metrics():
+    """Process metrics in the Prometheus text exposition format"""
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application on startup"""
+    configure_thread_limiter()
+    if settings.FILE_GC_INTERVAL_SECONDS > 0:
+        app.state.file_gc = asyncio.create_task(run_file_gc())
     logger.info(f"MOCK_MODE: {settings.MOCK_MODE}")
     logger.info(f"SEED_DATA: {settings.SEED_DATA}")
     if settings.MOCK_MODE:
@@ -89,6 +98,16 @@ async def startup_event():
         except Exception as e:
             logger.error(f"Error seeding admin user: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled database connections on shutdown"""
+    file_gc = getattr(app.state, "file_gc", None)
+    if file_gc is not None:
+        file_gc.cancel()
+    shutdown_process_pool()
+    await db_manager.close_async_engine()
+    db_manager.close_engine()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,14 +1,26 @@
-import time
 import logging
-from fastapi import Request, Response
-from fastapi.routing import APIRoute
-import uuid
+import os
+import time
+
+from app.core.context import debug_sampled_var, request_id_var, request_timings_var
+from app.core.logging_config import should_sample_debug
+from app.core.timing import format_server_timing, serialization_ms
 
 # Create a logger for the middleware
 logger = logging.getLogger("backend.middleware")
 
 
 class LoggingMiddleware:
+    """
+    Pure ASGI middleware that logs each request and reports where its time
+    went. Everything is read from the ASGI scope; no Request object is built.
+
+    The request id, DEBUG sampling decision and per-phase timings live in
+    contextvars for the duration of the request. The response carries the
+    id as `X-Request-ID` and the timings as a `Server-Timing` header
+    (auth, db, serialization, total), readable in browser devtools.
+    """
+
     def __init__(self, app):
         self.app = app
 
@@ -17,38 +29,43 @@ class LoggingMiddleware:
             await self.app(scope, receive, send)
             return
 
-        # Generate a unique request ID
-        request_id = str(uuid.uuid4())[:8]
-        
-        # Create a logger adapter with the request ID
-        request_logger = logging.LoggerAdapter(logger, {"request_id": request_id})
-        
-        # Store start time
-        start_time = time.time()
-        
-        # Create request object
-        request = Request(scope, receive)
-        
-        # Log request start
-        request_logger.info(f"REQUEST START - {request.method} {request.url.path} - Client: {request.client.host}")
-        
-        # Store response status for logging
+        request_id = os.urandom(4).hex()
+        timings = {}
+        request_id_token = request_id_var.set(request_id)
+        sampled_token = debug_sampled_var.set(should_sample_debug(scope["path"]))
+        timings_token = request_timings_var.set(timings)
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        logger.info("REQUEST START - %s %s - Client: %s", method, path, client[0] if client else None)
+
         response_status = None
-        
-        async def send_with_logging(message):
+
+        async def send_with_timing(message):
             nonlocal response_status
             if message["type"] == "http.response.start":
                 response_status = message["status"]
+                response_start = time.perf_counter()
+                serialization = serialization_ms(timings, response_start)
+                if serialization is not None:
+                    timings["serialization"] = serialization
+                timings["total"] = (response_start - start_time) * 1000
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode()),
+                    (b"server-timing", format_server_timing(timings).encode()),
+                ]
             await send(message)
-        
+
         try:
-            await self.app(scope, receive, send_with_logging)
+            await self.app(scope, receive, send_with_timing)
         finally:
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log request completion
+            duration = time.perf_counter() - start_time
             if response_status:
-                request_logger.info(f"REQUEST END - {request.method} {request.url.path} - Status: {response_status} - Duration: {duration:.3f}s")
+                logger.info("REQUEST END - %s %s - Status: %s - Duration: %.3fs", method, path, response_status, duration)
             else:
-                request_logger.info(f"REQUEST END - {request.method} {request.url.path} - Duration: {duration:.3f}s")
\ No newline at end of file
+                logger.info("REQUEST END - %s %s - Duration: %.3fs", method, path, duration)
+            request_timings_var.reset(timings_token)
+            debug_sampled_var.reset(sampled_token)
+            request_id_var.reset(request_id_token)
@@ -0,0 +1,68 @@
+import time
+
+from app.core.metrics import http_request_duration_seconds, http_requests_in_flight, http_requests_total
+
+# Route label for requests that matched no route, so unknown paths
+# (scanners, typos) cannot create unbounded label values
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope) -> str:
+    """
+    Return the template of the route that served the request, e.g.
+    /api/v1/projects/{project_id}, from the route the router matched
+    (`scope["route"].path_format`).
+
+    Routes of included routers keep their own path ("/{project_id}"); the
+    part of the request path their pattern does not cover is the routers'
+    (literal) prefix, which is put back in front. Anything else is
+    "unmatched", so raw values never become labels.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    path_regex = getattr(route, "path_regex", None)
+    path = scope.get("path", "")
+    if path_regex is None or path_regex.match(path):
+        return template
+    for index, char in enumerate(path):
+        if char == "/" and index and path_regex.match(path[index:]):
+            return path[:index] + template
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Record per-route latency, status counts and in-flight requests.
+
+    Requests are labelled with the route template (e.g.
+    /api/v1/projects/{project_id}) that the router stores in the scope,
+    never with the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start_time = time.perf_counter()
+        http_requests_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            labels = {"method": scope["method"], "route": route_template(scope)}
+            http_request_duration_seconds.observe(time.perf_counter() - start_time, **labels)
+            http_requests_total.inc(status=str(status_code), **labels)
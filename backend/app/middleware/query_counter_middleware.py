@@ -0,0 +1,56 @@
+import logging
+import re
+
+from app.core.config import settings
+from app.core.metrics import db_n_plus_one_total, db_queries_per_request
+from app.db.query_counter import count_queries
+from app.middleware.metrics_middleware import route_template
+
+logger = logging.getLogger("backend.middleware")
+
+_SELECT_LIST = re.compile(r"^SELECT .+? FROM ", re.DOTALL)
+
+
+def _shape(statement: str) -> str:
+    """Statement on one line with the column list elided, for log lines."""
+    return _SELECT_LIST.sub("SELECT ... FROM ", " ".join(statement.split()))[:300]
+
+
+class QueryCounterMiddleware:
+    """
+    Count SQL statements per request and flag likely N+1 patterns.
+
+    A statement shape (its SQL text) executed `DB_N_PLUS_ONE_THRESHOLD` or
+    more times in one request is logged as a warning and counted in
+    `db_n_plus_one_total`. Lazy relationship loads during serialization
+    show up this way. With `DEBUG` on, the response also carries the
+    statement count as `X-DB-Queries`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as stats:
+            async def send_with_count(message):
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-queries", str(stats.count).encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_count)
+            finally:
+                route = route_template(scope)
+                db_queries_per_request.observe(stats.count, method=scope["method"], route=route)
+                for statement, count in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+                    db_n_plus_one_total.inc(method=scope["method"], route=route)
+                    logger.warning(
+                        "Possible N+1 query on %s %s: %d identical statements: %s",
+                        scope["method"], route, count, _shape(statement),
+                    )
@@ -4,3 +4,5 @@ from app.models.application import Application
 from app.models.message import Message
 from app.models.project_file import ProjectFile
 from app.models.payment import Payment
+from app.models.conversation import Conversation
+from app.models.multipart_upload import MultipartUpload
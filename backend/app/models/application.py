@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, func, Enum, UniqueConstraint
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, func, Enum, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -28,6 +28,13 @@ class Application(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('project_id', 'creative_id', name='unique_project_creative'),
+        Index('ix_applications_project_created_at', 'project_id', 'created_at', 'id'),
+        Index('ix_applications_creative_created_at', 'creative_id', 'created_at', 'id'),
+        Index(
+            'ix_applications_project_pending', 'project_id',
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
     )
     
     def __repr__(self):
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint, CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.database import Base
+
+class Conversation(Base):
+    """
+    Materialized summary of the messages exchanged between two users.
+
+    One row per user pair, stored with ``user_a_id < user_b_id``. The row is
+    kept current by the message endpoints (see ``app.db.conversations``) so
+    the inbox is an indexed range read instead of a scan over ``messages``.
+    """
+    __tablename__ = "conversations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_a_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_b_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    last_message_id = Column(UUID(as_uuid=True), ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)
+    last_at = Column(DateTime, nullable=False)
+    # Unread messages addressed to user_a / user_b respectively
+    unread_count_a = Column(Integer, default=0, nullable=False)
+    unread_count_b = Column(Integer, default=0, nullable=False)
+
+    # Relationships
+    last_message = relationship("Message")
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('user_a_id', 'user_b_id', name='unique_conversation_pair'),
+        CheckConstraint('user_a_id < user_b_id', name='ordered_conversation_pair'),
+        Index('ix_conversations_user_a_last_at', 'user_a_id', 'last_at'),
+        Index('ix_conversations_user_b_last_at', 'user_b_id', 'last_at'),
+    )
+
+    def __repr__(self):
+        return f"<Conversation {self.user_a_id}:{self.user_b_id}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, func, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, func, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -23,5 +23,18 @@ class Message(Base):
     project = relationship("Project", backref="messages")
     application = relationship("Application", backref="messages")
     
+    # Indexes matching the filters in app/api/endpoints/messages.py
+    __table_args__ = (
+        Index('ix_messages_sender_created_at', 'sender_id', 'created_at', 'id'),
+        Index('ix_messages_recipient_created_at', 'recipient_id', 'created_at', 'id'),
+        Index('ix_messages_project_created_at', 'project_id', 'created_at', 'id'),
+        Index('ix_messages_application_created_at', 'application_id', 'created_at', 'id'),
+        Index(
+            'ix_messages_recipient_unread', 'recipient_id', 'sender_id',
+            postgresql_where=text('is_read = false'),
+            sqlite_where=text('is_read = 0'),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Message {self.id}>"
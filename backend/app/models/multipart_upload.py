@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+import uuid
+
+from app.db.database import Base
+
+class MultipartUpload(Base):
+    """
+    An upload sent in numbered parts, possibly in parallel and over several
+    connections, and assembled into a ProjectFile on completion.
+
+    Received parts live on disk (see ``app.utils.file_storage``); the row
+    only records who is uploading what, so any worker can take the next part.
+    """
+    __tablename__ = "multipart_uploads"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    uploader_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename = Column(String, nullable=False)
+    file_type = Column(String, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    
+    # Relationships
+    project = relationship("Project")
+    uploader = relationship("User")
+    
+    def __repr__(self):
+        return f"<MultipartUpload {self.filename}>"
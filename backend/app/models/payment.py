@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, func, Enum, Integer
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, func, Enum, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -28,5 +28,13 @@ class Payment(Base):
     client = relationship("User", foreign_keys=[client_id], backref="sent_payments")
     creative = relationship("User", foreign_keys=[creative_id], backref="received_payments")
     
+    # Indexes matching the filters in app/api/endpoints/payments.py
+    __table_args__ = (
+        Index('ix_payments_project_created_at', 'project_id', 'created_at', 'id'),
+        Index('ix_payments_client_created_at', 'client_id', 'created_at', 'id'),
+        Index('ix_payments_creative_created_at', 'creative_id', 'created_at', 'id'),
+        Index('ix_payments_stripe_payment_intent_id', 'stripe_payment_intent_id'),
+    )
+    
     def __repr__(self):
         return f"<Payment {self.id}>"
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, func, Enum, ARRAY
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, func, Enum, ARRAY, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 import uuid
 
 from app.db.database import Base
+from app.db.fulltext import install_project_search
 
 class Project(Base):
     __tablename__ = "projects"
@@ -16,7 +17,7 @@ class Project(Base):
     budget_min = Column(Float, nullable=True)
     budget_max = Column(Float, nullable=True)
     timeline_weeks = Column(Integer, nullable=True)
-    required_skills = Column(ARRAY(String), nullable=True)
+    required_skills = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=True)
     status = Column(
         Enum("draft", "active", "hired", "completed", "cancelled", name="project_status"),
         default="active",
@@ -26,9 +27,30 @@ class Project(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
+    # Filled in by full-text search queries (with_expression), else None
+    search_rank = query_expression()
+    search_snippet = query_expression()
+    
     # Relationships
     client = relationship("User", foreign_keys=[client_id], backref="created_projects")
     hired_creative = relationship("User", foreign_keys=[hired_creative_id], backref="hired_projects")
     
+    # Indexes matching the filters in app/api/endpoints/projects.py
+    __table_args__ = (
+        Index('ix_projects_created_at', 'created_at', 'id'),
+        Index('ix_projects_client_created_at', 'client_id', 'created_at', 'id'),
+        Index('ix_projects_client_status', 'client_id', 'status'),
+        Index('ix_projects_status_created_at', 'status', 'created_at', 'id'),
+        Index('ix_projects_hired_creative_id', 'hired_creative_id'),
+        # GET /projects/search: category filter, budget sort, skills overlap
+        Index('ix_projects_category_status_created_at', 'category', 'status', 'created_at', 'id'),
+        Index('ix_projects_status_budget', 'status', func.coalesce(budget_max, 0.0), 'id'),
+        Index('ix_projects_required_skills', 'required_skills', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<Project {self.title}>"
+
+
+# Title/description search: tsvector column on PostgreSQL, FTS5 on SQLite
+install_project_search(Project.__table__)
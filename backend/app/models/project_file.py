@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -13,8 +13,11 @@ class ProjectFile(Base):
     uploader_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     filename = Column(String, nullable=False)
     file_url = Column(String, nullable=False)
-    file_size = Column(Integer, nullable=True)
+    file_size = Column(BigInteger, nullable=True)
     file_type = Column(String, nullable=True)
+    # Hex SHA-256 of the content, computed while uploading. The bytes are
+    # stored once per hash; these rows are the blob's references
+    sha256 = Column(String(64), nullable=True, index=True)
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, String, Boolean, Float, DateTime, func, Enum, ARRAY, Integer
+from sqlalchemy import Column, String, Boolean, Float, DateTime, func, Enum, ARRAY, JSON, Integer, Index, text
 import uuid
 
 from app.db.database import Base
 
+_CREATIVES_PG = "role = 'creative' AND is_active = true"
+_CREATIVES_SQLITE = "role = 'creative' AND is_active = 1"
+
 class User(Base):
     __tablename__ = "users"
     
@@ -18,8 +21,8 @@ class User(Base):
     bio = Column(String, nullable=True)
     location = Column(String, nullable=True)
     website = Column(String, nullable=True)
-    skills = Column(ARRAY(String), nullable=True)
-    portfolio_links = Column(ARRAY(String), nullable=True)
+    skills = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=True)
+    portfolio_links = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=True)
     hourly_rate = Column(Float, nullable=True)
     availability = Column(String, nullable=True)
 
@@ -28,5 +31,32 @@ class User(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
+    # Partial indexes for the creative directory (GET /users/creatives); the
+    # predicate matches the endpoint's role/is_active filter
+    __table_args__ = (
+        Index(
+            'ix_users_creatives_created_at', 'created_at', 'id',
+            postgresql_where=text(_CREATIVES_PG), sqlite_where=text(_CREATIVES_SQLITE),
+        ),
+        Index(
+            'ix_users_creatives_type_created_at', 'creative_type', 'created_at', 'id',
+            postgresql_where=text(_CREATIVES_PG), sqlite_where=text(_CREATIVES_SQLITE),
+        ),
+        Index(
+            'ix_users_creatives_hourly_rate', 'hourly_rate',
+            postgresql_where=text(_CREATIVES_PG), sqlite_where=text(_CREATIVES_SQLITE),
+        ),
+        # Case-insensitive prefix search on location
+        Index(
+            'ix_users_creatives_location', func.lower(location).label('location_lower'),
+            postgresql_ops={'location_lower': 'varchar_pattern_ops'},
+            postgresql_where=text(_CREATIVES_PG), sqlite_where=text(_CREATIVES_SQLITE),
+        ),
+        Index(
+            'ix_users_creatives_skills', 'skills',
+            postgresql_using='gin', postgresql_where=text(_CREATIVES_PG),
+        ).ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<User {self.email}>"
@@ -13,7 +13,7 @@ from app.schemas.application import (
 from app.schemas.message import (
     Message, MessageCreate, MessageUpdate, MessageInDB,
     MessageWithSender, MessageWithRecipient, MessageWithUsers,
-    Conversation
+    MessageReadRequest, MessageReadResult, Conversation
 )
 from app.schemas.project_file import (
     ProjectFile, ProjectFileCreate, ProjectFileUpdate, ProjectFileInDB,
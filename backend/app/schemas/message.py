@@ -18,6 +18,17 @@ class MessageCreate(MessageBase):
 class MessageUpdate(BaseModel):
     is_read: Optional[bool] = None
 
+# Properties to receive via API when marking a thread or project read
+class MessageReadRequest(BaseModel):
+    other_user_id: Optional[int] = None
+    project_id: Optional[UUID4] = None
+    application_id: Optional[UUID4] = None
+    up_to: Optional[datetime] = None
+
+# Result of marking messages read
+class MessageReadResult(BaseModel):
+    marked_count: int
+
 # Properties shared by models stored in DB
 class MessageInDBBase(MessageBase):
     id: UUID4
@@ -2,6 +2,7 @@ from typing import Optional, List, Any
 from datetime import datetime
 from pydantic import BaseModel, UUID4, Field, validator
 
+from app.db.fulltext import render_snippet
 from app.schemas.user import User
 
 # Shared properties
@@ -51,6 +52,16 @@ class ProjectInDBBase(ProjectBase):
 class Project(ProjectInDBBase):
     pass
 
+# Properties to return via API from project search; rank and snippet are
+# set when searching with `q`
+class ProjectSearchResult(Project):
+    search_rank: Optional[float] = None
+    search_snippet: Optional[str] = None
+
+    @validator('search_snippet')
+    def highlight_snippet(cls, v):
+        return render_snippet(v)
+
 # Properties to return via API with client info
 class ProjectWithClient(Project):
     client: User
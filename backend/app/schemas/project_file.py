@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, Field, UUID4
 
 from app.schemas.user import User
 from app.schemas.project import Project
@@ -25,6 +25,7 @@ class ProjectFileInDBBase(ProjectFileBase):
     id: UUID4
     project_id: UUID4
     uploader_id: int
+    sha256: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -47,6 +48,30 @@ class ProjectFileWithDetails(ProjectFile):
     uploader: User
     project: Project
 
+# Properties to receive via API when starting a multipart upload
+class MultipartUploadCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    file_type: Optional[str] = None
+
+# A part received for a multipart upload
+class UploadedPart(BaseModel):
+    part_number: int
+    size: int
+    sha256: Optional[str] = None
+
+# Properties to return via API for a multipart upload
+class MultipartUpload(BaseModel):
+    id: UUID4
+    project_id: UUID4
+    filename: str
+    file_type: Optional[str] = None
+    created_at: datetime
+    max_part_size: int
+    max_parts: int
+    # Parts received so far; resume by sending the missing ones
+    parts: List[UploadedPart] = []
+    received_bytes: int = 0
+
 # Properties stored in DB
 class ProjectFileInDB(ProjectFileInDBBase):
     pass
@@ -59,6 +59,40 @@ class UserInDBBase(BaseModel):
 class User(UserInDBBase):
     pass
 
+# Public profile listed in the creative directory
+class CreativeProfile(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    creative_type: Optional[str] = None
+    bio: Optional[str] = None
+    location: Optional[str] = None
+    profile_image_url: Optional[str] = None
+    skills: Optional[List[str]] = None
+    hourly_rate: Optional[float] = None
+    availability: Optional[str] = None
+    is_verified: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Number of matching creatives with one creative_type or skill
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class CreativeFacets(BaseModel):
+    total: int
+    creative_type: List[FacetCount]
+    skills: List[FacetCount]
+
+# One page of the creative directory; facets are only computed for the
+# first page (no cursor)
+class CreativeDirectory(BaseModel):
+    items: List[CreativeProfile]
+    facets: Optional[CreativeFacets] = None
+
 # Properties stored in DB
 class UserInDB(UserInDBBase):
     hashed_password: str
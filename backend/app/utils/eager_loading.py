@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import MANYTOONE, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The Pydantic model inside an annotation like `User`, `Optional[User]` or `List[User]`."""
+    if get_origin(annotation) is None:
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return annotation
+        return None
+    for arg in get_args(annotation):
+        schema = _nested_schema(arg)
+        if schema is not None:
+            return schema
+    return None
+
+
+def _loader_options(model: Any, schema: Type[BaseModel], seen: Tuple[Type[BaseModel], ...]) -> Tuple[LoaderOption, ...]:
+    relationships = sa_inspect(model).relationships
+    options = []
+    for name, field in schema.model_fields.items():
+        relationship = relationships.get(name)
+        if relationship is None:
+            continue
+
+        attribute = getattr(model, name)
+        if relationship.uselist:
+            # Collections: one extra SELECT ... WHERE fk IN (...) for the page
+            option = selectinload(attribute)
+        else:
+            # Single objects: joined into the same statement; a LIMIT stays
+            # correct because the join cannot multiply rows
+            required = relationship.direction is MANYTOONE and all(
+                not column.nullable for column in relationship.local_columns
+            )
+            option = joinedload(attribute, innerjoin=required)
+
+        nested = _nested_schema(field.annotation)
+        if nested is not None and nested not in seen:
+            children = _loader_options(relationship.mapper.class_, nested, seen + (nested,))
+            if children:
+                option = option.options(*children)
+        options.append(option)
+    return tuple(options)
+
+
+@lru_cache(maxsize=None)
+def eager_load(model: Any, schema: Union[Type[BaseModel], Any]) -> Tuple[LoaderOption, ...]:
+    """
+    Loader options for every relationship of `model` that the response
+    schema serializes, recursively for nested schemas.
+
+    Pass the endpoint's response model (a schema or `List[schema]`) so
+    serialization never triggers a lazy load per row:
+
+        query.options(*eager_load(Application, ApplicationWithProject))
+    """
+    root = _nested_schema(schema)
+    if root is None:
+        return ()
+    return _loader_options(model, root, (root,))
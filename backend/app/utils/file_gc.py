@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Set
+
+from anyio import to_thread
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db_context
+from app.models.multipart_upload import MultipartUpload
+from app.models.project_file import ProjectFile
+from app.utils.file_storage import (
+    delete_trashed_blob,
+    iter_blobs,
+    iter_multipart_uploads,
+    iter_trashed_blobs,
+    multipart_mtime,
+    remove_multipart_upload,
+    remove_temporary_files,
+    restore_blob,
+    trash_blob,
+)
+
+logger = logging.getLogger(__name__)
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+# Hashes looked up per query
+_BATCH_SIZE = 500
+
+
+def _referenced(db: Session, hashes) -> Set[str]:
+    query = select(ProjectFile.sha256).where(ProjectFile.sha256.in_(list(hashes))).distinct()
+    return set(db.execute(query).scalars())
+
+
+def collect_unreferenced_blobs(db: Session, grace_seconds: float) -> int:
+    """
+    Delete stored blobs that no ProjectFile refers to; returns how many.
+
+    A blob's references are the ProjectFile rows with its SHA-256, so
+    deleting the last such row is all it takes to free it. Blobs modified
+    within `grace_seconds` are kept: they may belong to an upload whose row
+    is not committed yet, or have just been reused by a deduplicated
+    upload (see `touch_blob`).
+
+    An unreferenced blob is moved to the trash before it is deleted, then
+    checked again: a reference committed or a reuse made before the move
+    puts it back. After the move, uploads can no longer reuse it.
+    """
+    # Left in the trash by a sweep that died; they are judged again below
+    for sha256, trashed in iter_trashed_blobs():
+        if _SHA256.match(sha256):
+            restore_blob(sha256, trashed)
+
+    cutoff = time.time() - grace_seconds
+    candidates = [sha256 for sha256, mtime in iter_blobs() if mtime < cutoff and _SHA256.match(sha256)]
+    removed = 0
+    for start in range(0, len(candidates), _BATCH_SIZE):
+        batch = candidates[start:start + _BATCH_SIZE]
+        referenced = _referenced(db, batch)
+        trash = {}
+        for sha256 in batch:
+            if sha256 not in referenced:
+                trashed = trash_blob(sha256)
+                if trashed is not None:
+                    trash[sha256] = trashed
+        if not trash:
+            continue
+        referenced = _referenced(db, trash)
+        for sha256, (trashed, mtime) in trash.items():
+            if sha256 in referenced or mtime >= cutoff:
+                restore_blob(sha256, trashed)
+            else:
+                delete_trashed_blob(trashed)
+                removed += 1
+    return removed
+
+
+def expire_multipart_uploads(db: Session, ttl_seconds: float) -> int:
+    """
+    Abort multipart uploads that got no part for `ttl_seconds`, deleting
+    their rows and parts; returns how many. Parts left on disk without a
+    row (a worker died between the two) are removed once as old.
+
+    A completion in progress has just claimed its parts (see
+    `claim_parts`), so its upload is never stale.
+    """
+    cutoff = time.time() - ttl_seconds
+    created_before = datetime.utcnow() - timedelta(seconds=ttl_seconds)
+
+    def stale(upload_id) -> bool:
+        mtime = multipart_mtime(upload_id)
+        return mtime is None or mtime < cutoff
+
+    old = db.execute(select(MultipartUpload.id).where(MultipartUpload.created_at < created_before)).scalars()
+    expired = [upload_id for upload_id in old if stale(upload_id)]
+    for start in range(0, len(expired), _BATCH_SIZE):
+        db.execute(delete(MultipartUpload).where(MultipartUpload.id.in_(expired[start:start + _BATCH_SIZE])))
+    db.commit()
+    for upload_id in expired:
+        remove_multipart_upload(upload_id)
+
+    on_disk = [upload_id for upload_id in iter_multipart_uploads() if stale(upload_id)]
+    orphaned = 0
+    for start in range(0, len(on_disk), _BATCH_SIZE):
+        batch = on_disk[start:start + _BATCH_SIZE]
+        known = set(db.execute(select(MultipartUpload.id).where(MultipartUpload.id.in_(batch))).scalars())
+        for upload_id in batch:
+            if upload_id not in known:
+                remove_multipart_upload(upload_id)
+                orphaned += 1
+    return len(expired) + orphaned
+
+
+def _sweep() -> Dict[str, int]:
+    with get_db_context() as db:
+        return {
+            "unreferenced blobs": collect_unreferenced_blobs(db, settings.FILE_GC_GRACE_SECONDS),
+            "stale multipart uploads": expire_multipart_uploads(db, settings.MULTIPART_UPLOAD_TTL_SECONDS),
+            "stale temporary files": remove_temporary_files(time.time() - settings.UPLOAD_TMP_TTL_SECONDS),
+        }
+
+
+async def run_file_gc() -> None:
+    """
+    Every FILE_GC_INTERVAL_SECONDS, until cancelled: sweep unreferenced
+    blobs, abandoned multipart uploads and temporary files left by crashes.
+    """
+    while True:
+        await asyncio.sleep(settings.FILE_GC_INTERVAL_SECONDS)
+        try:
+            removed = await to_thread.run_sync(_sweep)
+        except Exception as e:
+            logger.error(f"File garbage collection failed: {e}")
+            continue
+        for what, count in removed.items():
+            if count:
+                logger.info(f"File garbage collection removed {count} {what}")
@@ -0,0 +1,358 @@
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple
+
+from anyio import to_thread
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FileTooLargeError(Exception):
+    """The upload grew past the allowed size; nothing was kept."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds the {max_size} byte limit")
+        self.max_size = max_size
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size: int
+    sha256: str
+
+
+# Project files are content-addressed: the bytes live once under their
+# SHA-256 (blobs/ab/abcdef...), however many ProjectFile rows refer to them.
+# Blobs no row refers to any more are removed by `app.utils.file_gc`.
+
+def blobs_directory() -> str:
+    return os.path.join(settings.UPLOAD_DIRECTORY, "blobs")
+
+
+def blob_path(sha256: str) -> str:
+    """Where the bytes with this (lowercase hex) SHA-256 are kept."""
+    return os.path.join(blobs_directory(), sha256[:2], sha256)
+
+
+def _temporary_directory() -> str:
+    return os.path.join(settings.UPLOAD_DIRECTORY, "tmp")
+
+
+def _temporary_path() -> str:
+    directory = _temporary_directory()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, uuid.uuid4().hex)
+
+
+def remove_temporary_files(older_than: float) -> int:
+    """
+    Delete temporary files last written before `older_than` (a timestamp),
+    left behind by crashed workers; returns how many. Uploads in progress
+    write a block at a time, so their files stay fresh.
+    """
+    try:
+        entries = list(os.scandir(_temporary_directory()))
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    for entry in entries:
+        try:
+            if not entry.is_file() or entry.stat().st_mtime >= older_than:
+                continue
+        except FileNotFoundError:
+            continue
+        _discard(entry.path)
+        removed += 1
+    return removed
+
+
+def _write_block(file: BinaryIO, digest, block: bytes) -> None:
+    # hashlib and file writes release the GIL on large blocks
+    digest.update(block)
+    file.write(block)
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def receive_file(chunks: AsyncIterator[bytes], max_size: int) -> StoredFile:
+    """
+    Write an upload to a temporary file as it arrives.
+
+    The body is collected into blocks of `UPLOAD_CHUNK_SIZE` bytes, and each
+    block is hashed and written from a worker thread. Memory use stays at
+    about one block per upload, whatever the file size. The upload is
+    abandoned with `FileTooLargeError` as soon as it passes `max_size`. The
+    temporary file is removed on any error; on success, move it into place
+    with `commit_file`.
+    """
+    path = _temporary_path()
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    file = await to_thread.run_sync(open, path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLargeError(max_size)
+            buffer += chunk
+            while len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                block = bytes(buffer[:settings.UPLOAD_CHUNK_SIZE])
+                del buffer[:settings.UPLOAD_CHUNK_SIZE]
+                await to_thread.run_sync(_write_block, file, digest, block)
+        if buffer:
+            await to_thread.run_sync(_write_block, file, digest, bytes(buffer))
+        await to_thread.run_sync(file.close)
+    except BaseException:
+        await to_thread.run_sync(file.close)
+        await to_thread.run_sync(_discard, path)
+        raise
+    return StoredFile(path=path, size=size, sha256=digest.hexdigest())
+
+
+def commit_file(stored: StoredFile, destination: str) -> None:
+    """Move a received file to its permanent path (same filesystem, atomic)."""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(stored.path, destination)
+    stored.path = destination
+
+
+def discard_file(stored: StoredFile) -> None:
+    _discard(stored.path)
+
+
+def touch_blob(sha256: str) -> bool:
+    """
+    Mark a blob as just used, so a running garbage collection sweep leaves
+    it alone while a new reference to it is recorded. False if there is no
+    such blob.
+    """
+    try:
+        os.utime(blob_path(sha256))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def store_blob(stored: StoredFile) -> bool:
+    """
+    Move a received file into the blob store under its SHA-256.
+
+    When those bytes are already stored, the received copy is dropped
+    instead; returns whether a new blob was written.
+    """
+    destination = blob_path(stored.sha256)
+    if touch_blob(stored.sha256):
+        discard_file(stored)
+        stored.path = destination
+        return False
+    commit_file(stored, destination)
+    return True
+
+
+_TRASH = ".trash"
+
+
+def iter_blobs() -> Iterator[Tuple[str, float]]:
+    """(SHA-256, modification time) of every stored blob."""
+    for entry in _iter_blob_entries():
+        if entry.name.startswith("."):
+            continue
+        try:
+            yield entry.name, entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
+
+
+def _iter_blob_entries() -> Iterator[os.DirEntry]:
+    try:
+        prefixes = list(os.scandir(blobs_directory()))
+    except FileNotFoundError:
+        return
+    for prefix in prefixes:
+        if prefix.is_dir():
+            yield from os.scandir(prefix.path)
+
+
+def trash_blob(sha256: str) -> Optional[Tuple[str, float]]:
+    """
+    Move a blob aside before deleting it and return its new path and
+    mtime, or None if it is gone already.
+
+    From then on `touch_blob` misses it, so uploads store the bytes again
+    instead of reusing them; a reuse that came just before the move shows
+    in the returned mtime.
+    """
+    path = blob_path(sha256)
+    trashed = os.path.join(os.path.dirname(path), f".{sha256}.{uuid.uuid4().hex}{_TRASH}")
+    try:
+        os.rename(path, trashed)
+    except FileNotFoundError:
+        return None
+    return trashed, os.stat(trashed).st_mtime
+
+
+def restore_blob(sha256: str, trashed: str) -> None:
+    """Put a trashed blob back, unless its bytes were stored again meanwhile."""
+    try:
+        # Unlike a rename, a link never replaces a newer copy
+        os.link(trashed, blob_path(sha256))
+    except (FileExistsError, FileNotFoundError):
+        # Stored again, or restored by another worker's sweep
+        pass
+    _discard(trashed)
+
+
+def delete_trashed_blob(trashed: str) -> None:
+    _discard(trashed)
+
+
+def iter_trashed_blobs() -> Iterator[Tuple[str, str]]:
+    """(SHA-256, path) of every trashed blob."""
+    for entry in _iter_blob_entries():
+        if entry.name.startswith(".") and entry.name.endswith(_TRASH):
+            yield entry.name[1:].split(".", 1)[0], entry.path
+
+
+# Multipart uploads: each part is received like a single upload and then
+# renamed into the upload's directory, so a listed part is always complete.
+
+_CLAIMED = ".assembling"
+
+
+def _multipart_root() -> str:
+    return os.path.join(settings.UPLOAD_DIRECTORY, "multipart")
+
+
+def multipart_directory(upload_id: uuid.UUID) -> str:
+    return os.path.join(_multipart_root(), str(upload_id))
+
+
+def part_path(upload_id: uuid.UUID, part_number: int) -> str:
+    return os.path.join(multipart_directory(upload_id), f"{part_number:05d}")
+
+
+def list_parts(directory: str) -> List[Tuple[int, int]]:
+    """(part number, size) of every part in an upload's directory, in order."""
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return []
+    return sorted((int(entry.name), entry.stat().st_size) for entry in entries if entry.name.isdigit())
+
+
+def _copy_into(source: BinaryIO, destination: BinaryIO, size: int) -> None:
+    # copy_file_range moves the bytes inside the kernel, advancing both file
+    # positions; where it is unsupported (non-Linux, some filesystems) the
+    # rest is copied through a buffer
+    copied = 0
+    try:
+        while copied < size:
+            count = os.copy_file_range(source.fileno(), destination.fileno(), size - copied)
+            if count == 0:
+                break
+            copied += count
+        return
+    except (AttributeError, OSError):
+        source.seek(copied)
+    shutil.copyfileobj(source, destination, settings.UPLOAD_CHUNK_SIZE)
+
+
+def claim_parts(upload_id: uuid.UUID) -> str:
+    """
+    Move an upload's parts aside for assembly and return their directory.
+    The rename is atomic, so only one of two concurrent completions gets
+    the parts; the other sees FileNotFoundError.
+    """
+    directory = multipart_directory(upload_id)
+    claimed = f"{directory}{_CLAIMED}"
+    os.rename(directory, claimed)
+    # Renaming keeps the directory's mtime; mark the claim as current
+    os.utime(claimed)
+    return claimed
+
+
+def release_parts(upload_id: uuid.UUID, claimed: str) -> None:
+    """Give claimed parts back, e.g. after a failed assembly, so it can be retried."""
+    os.rename(claimed, multipart_directory(upload_id))
+
+
+def assemble_parts(directory: str, parts: List[Tuple[int, int]]) -> StoredFile:
+    """
+    Concatenate parts into one temporary file (blocking; run it in a worker
+    thread).
+
+    The parts are copied with copy_file_range and hashed through mmap, so
+    their bytes are never read into Python buffers, however large the file.
+    """
+    path = _temporary_path()
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        # Unbuffered, so kernel copies and fallback writes stay in order
+        with open(path, "wb", buffering=0) as destination:
+            for part_number, part_size in parts:
+                with open(os.path.join(directory, f"{part_number:05d}"), "rb") as source:
+                    if part_size:
+                        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                            digest.update(mapped)
+                    _copy_into(source, destination, part_size)
+                size += part_size
+    except BaseException:
+        _discard(path)
+        raise
+    return StoredFile(path=path, size=size, sha256=digest.hexdigest())
+
+
+def remove_parts(directory: str) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def multipart_mtime(upload_id: uuid.UUID) -> Optional[float]:
+    """When a part of the upload was last stored or claimed; None without parts."""
+    directory = multipart_directory(upload_id)
+    mtimes = []
+    for path in (directory, f"{directory}{_CLAIMED}"):
+        try:
+            mtimes.append(os.stat(path).st_mtime)
+        except FileNotFoundError:
+            continue
+    return max(mtimes, default=None)
+
+
+def iter_multipart_uploads() -> Iterator[uuid.UUID]:
+    """Ids of the uploads with parts on disk, claimed or not."""
+    try:
+        entries = list(os.scandir(_multipart_root()))
+    except FileNotFoundError:
+        return
+    seen = set()
+    for entry in entries:
+        name = entry.name[:-len(_CLAIMED)] if entry.name.endswith(_CLAIMED) else entry.name
+        try:
+            upload_id = uuid.UUID(name)
+        except ValueError:
+            continue
+        if upload_id not in seen:
+            seen.add(upload_id)
+            yield upload_id
+
+
+def remove_multipart_upload(upload_id: uuid.UUID) -> None:
+    """Delete an upload's parts, claimed or not."""
+    directory = multipart_directory(upload_id)
+    remove_parts(directory)
+    remove_parts(f"{directory}{_CLAIMED}")
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import warnings
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from anyio import to_thread
+
+from app.core.config import settings
+from app.core.process_pool import discard_broken_process_pool, get_process_pool
+
+logger = logging.getLogger(__name__)
+
+# Resized copies of an uploaded image: name -> (max width, max height, crop).
+# Cropped derivatives fill the box (square avatars); the others fit in it.
+DERIVATIVES: Dict[str, Tuple[int, int, bool]] = {
+    "thumbnail": (128, 128, True),
+    "card": (400, 400, True),
+    "full": (1200, 1200, False),
+}
+# Encodings of every derivative, best compression first. AVIF is skipped
+# where Pillow was built without it.
+IMAGE_FORMATS = ("avif", "webp")
+_SAVE_OPTIONS = {
+    "avif": {"quality": 55, "speed": 6},
+    "webp": {"quality": 80, "method": 4},
+}
+# Images with more pixels are refused when opened, before decoding
+# (decompression bombs)
+MAX_IMAGE_PIXELS = 50_000_000
+
+MANIFEST = "manifest.json"
+ORIGINAL = "original"
+_VERSION = re.compile(r"^[0-9a-f]{16}$")
+
+
+def generate_derivatives(source: str, directory: str) -> Dict[str, dict]:
+    """
+    Write every derivative of the image at `source` into `directory` and
+    describe them: {name: {"width", "height", "files": {format: filename}}}.
+
+    CPU-bound; runs in a worker process (see `app.core.process_pool`).
+    Derivatives carry no EXIF or other metadata from the original, such as
+    a camera's GPS position. Raises if the file is not a readable image.
+    """
+    from PIL import Image, ImageOps, features
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    formats = [f for f in IMAGE_FORMATS if f != "avif" or features.check("avif")]
+    largest = max(max(width, height) for width, height, _ in DERIVATIVES.values())
+
+    with warnings.catch_warnings():
+        # Up to twice MAX_IMAGE_PIXELS Pillow only warns; refuse those too
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        with Image.open(source) as image:
+            # JPEGs can decode at 1/2, 1/4 or 1/8 scale, much faster than full size
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    derivatives = {}
+    for name, (width, height, crop) in DERIVATIVES.items():
+        if crop:
+            # Never upscale: a small original gives a smaller square
+            side = min(width, height, *image.size)
+            resized = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((width, height), Image.Resampling.LANCZOS)
+        files = {}
+        for image_format in formats:
+            filename = f"{name}.{image_format}"
+            resized.save(os.path.join(directory, filename), image_format.upper(), **_SAVE_OPTIONS[image_format])
+            files[image_format] = filename
+        derivatives[name] = {"width": resized.width, "height": resized.height, "files": files}
+    return derivatives
+
+
+def write_manifest(directory: str, manifest: dict) -> None:
+    path = os.path.join(directory, MANIFEST)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(f"{path}.tmp", path)
+
+
+# Avatars live in avatars/<user id>/<version>/: the original, the
+# derivatives and a manifest. A new upload gets a new version, so every
+# URL is immutable and can be cached indefinitely.
+
+def avatars_directory(user_id: int) -> str:
+    return os.path.join(settings.UPLOAD_DIRECTORY, "avatars", str(user_id))
+
+
+def avatar_directory(user_id: int, version: str) -> str:
+    return os.path.join(avatars_directory(user_id), version)
+
+
+def avatar_url(user_id: int, version: str, filename: str = MANIFEST) -> str:
+    return f"{settings.API_V1_STR}/users/{user_id}/avatar/{version}/{filename}"
+
+
+def avatar_file_path(user_id: int, version: str, filename: str) -> Optional[str]:
+    """Path of a servable avatar file, or None for anything else (e.g. the original)."""
+    servable = {MANIFEST} | {f"{name}.{f}" for name in DERIVATIVES for f in IMAGE_FORMATS}
+    if not _VERSION.match(version) or filename not in servable:
+        return None
+    return os.path.join(avatar_directory(user_id, version), filename)
+
+
+def save_avatar_original(user_id: int, file: BinaryIO) -> str:
+    """
+    Store an uploaded avatar as a new version, with a "processing"
+    manifest, and return the version (blocking; run it in a worker thread).
+    """
+    # Hex nanosecond timestamps: newer versions sort after older ones
+    version = f"{time.time_ns():016x}"
+    directory = avatar_directory(user_id, version)
+    os.makedirs(directory)
+    with open(os.path.join(directory, ORIGINAL), "wb") as destination:
+        shutil.copyfileobj(file, destination, settings.UPLOAD_CHUNK_SIZE)
+    write_manifest(directory, {"status": "processing", "derivatives": {}})
+    return version
+
+
+def _remove_older_versions(user_id: int, version: str) -> None:
+    try:
+        versions: List[str] = os.listdir(avatars_directory(user_id))
+    except FileNotFoundError:
+        return
+    for other in versions:
+        if _VERSION.match(other) and other < version:
+            shutil.rmtree(avatar_directory(user_id, other), ignore_errors=True)
+
+
+async def process_avatar(user_id: int, version: str) -> None:
+    """
+    Generate an avatar version's derivatives in the process pool, then
+    publish them in its manifest and drop the user's older versions.
+    Meant to run as a background task, after the upload's response.
+    """
+    directory = avatar_directory(user_id, version)
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    cancelled = None
+    try:
+        derivatives = await loop.run_in_executor(
+            pool, generate_derivatives, os.path.join(directory, ORIGINAL), directory
+        )
+    except asyncio.CancelledError as e:
+        # The job was cancelled with the pool (shutdown), or this task was;
+        # only the latter is passed on, once the manifest says "failed"
+        if asyncio.current_task().cancelling():
+            cancelled = e
+        logger.warning(f"Processing of avatar {version} of user {user_id} was cancelled")
+        manifest = {"status": "failed", "derivatives": {}}
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            discard_broken_process_pool(pool)
+        logger.error(f"Could not process avatar {version} of user {user_id}: {e!r}")
+        manifest = {"status": "failed", "derivatives": {}}
+    else:
+        for derivative in derivatives.values():
+            derivative["urls"] = {
+                image_format: avatar_url(user_id, version, filename)
+                for image_format, filename in derivative.pop("files").items()
+            }
+        manifest = {"status": "ready", "derivatives": derivatives}
+        logger.info(f"Processed avatar {version} of user {user_id}")
+    try:
+        await to_thread.run_sync(write_manifest, directory, manifest)
+    except FileNotFoundError:
+        # A newer upload has already removed this version
+        logger.info(f"Avatar {version} of user {user_id} was replaced while processing")
+    else:
+        await to_thread.run_sync(_remove_older_versions, user_id, version)
+    if cancelled is not None:
+        raise cancelled
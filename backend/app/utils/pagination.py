@@ -0,0 +1,153 @@
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query as ORMQuery
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(position: Any, id: Any) -> str:
+    """Encode a row's (sort value, id) position, e.g. (created_at, id), as an opaque cursor."""
+    if isinstance(position, datetime):
+        position = position.isoformat()
+    payload = json.dumps([position, str(id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a cursor produced by `encode_cursor` into its raw (position, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return position, id
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Invalid pagination cursor {cursor!r}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+class CursorParams:
+    """
+    Keyset pagination query parameters (use as a FastAPI dependency).
+    `limit` is clamped to `settings.MAX_PAGE_SIZE`.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1),
+    ):
+        self.cursor = cursor
+        self.limit = min(limit, settings.MAX_PAGE_SIZE)
+
+
+class Keyset:
+    """
+    Order of a keyset-paginated listing: `column`, then `id` as the
+    tie-breaker, both descending or both ascending. `position(row)` reads
+    a row's value of `column` for the next page's cursor, and `row_id(row)`
+    its id (`row.id` by default).
+
+    `column` must not be NULL for any row (wrap nullable columns in
+    `coalesce`), and an index on (column, id) keeps every page a range read.
+    """
+
+    def __init__(
+        self,
+        column: Any,
+        id: Any,
+        position: Callable[[Any], Any],
+        descending: bool = True,
+        row_id: Callable[[Any], Any] = lambda row: row.id,
+    ):
+        self.column = column
+        self.id = id
+        self.position = position
+        self.descending = descending
+        self.row_id = row_id
+
+    @classmethod
+    def newest_first(cls, model: Any) -> "Keyset":
+        return cls(model.created_at, model.id, lambda row: row.created_at)
+
+    def _decode(self, cursor: str) -> Tuple[Any, Any]:
+        position, id = decode_cursor(cursor)
+        try:
+            # `encode_cursor` writes ids as strings and positions as scalars;
+            # anything else was not made by us
+            if not isinstance(id, str) or isinstance(position, (bool, list, dict)):
+                raise TypeError("Unexpected cursor value types")
+            python_type = self.column.type.python_type
+            if python_type is datetime:
+                position = datetime.fromisoformat(position)
+            else:
+                position = python_type(position)
+            id = self.id.type.python_type(id)
+        except (ValueError, TypeError, NotImplementedError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        return position, id
+
+    def apply(self, query: Any, params: CursorParams) -> Any:
+        """Seek past the cursor and order/limit a Query or Select for one page."""
+        order = tuple_(self.column, self.id)
+        if params.cursor:
+            after = tuple_(*self._decode(params.cursor))
+            query = query.filter(order < after if self.descending else order > after)
+        if self.descending:
+            query = query.order_by(self.column.desc(), self.id.desc())
+        else:
+            query = query.order_by(self.column.asc(), self.id.asc())
+        # Fetch one extra row to learn whether another page follows
+        return query.limit(params.limit + 1)
+
+    def finish_page(self, rows: List[Any], params: CursorParams, response: Response) -> List[Any]:
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(self.position(rows[-1]), self.row_id(rows[-1]))
+        return rows
+
+
+def paginate(
+    query: ORMQuery, model: Any, params: CursorParams, response: Response, keyset: Optional[Keyset] = None
+) -> List[Any]:
+    """
+    Return one page of `query`, newest first, ordered by (created_at, id),
+    or in the order of `keyset` when given.
+
+    The page starts strictly after `params.cursor`, so each page is an index
+    range read no matter how deep it is. When more rows follow, the cursor of
+    the last returned row is set on the `X-Next-Cursor` response header.
+    """
+    keyset = keyset or Keyset.newest_first(model)
+    rows = keyset.apply(query, params).all()
+    return keyset.finish_page(rows, params, response)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    params: CursorParams,
+    response: Response,
+    keyset: Optional[Keyset] = None,
+) -> List[Any]:
+    """`paginate` for a `select()` statement executed on an AsyncSession."""
+    keyset = keyset or Keyset.newest_first(model)
+    result = await db.execute(keyset.apply(stmt, params))
+    return keyset.finish_page(list(result.scalars().all()), params, response)
@@ -0,0 +1,72 @@
+from typing import List
+
+import pytest
+
+from app.models.application import Application
+from app.models.message import Message
+from app.models.payment import Payment
+from app.models.project import Project
+from app.schemas.application import ApplicationWithDetails
+from app.schemas.payment import Payment as PaymentSchema
+from app.utils.eager_loading import eager_load
+
+PAGE = 6
+
+
+def _loaded_paths(options):
+    return sorted(str(option.path) for option in options)
+
+
+def test_options_follow_schema_relationships():
+    assert _loaded_paths(eager_load(Application, List[ApplicationWithDetails])) == [
+        "ORM Path[Mapper[Application(applications)] -> Application.creative -> Mapper[User(users)]]",
+        "ORM Path[Mapper[Application(applications)] -> Application.project -> Mapper[Project(projects)]]",
+    ]
+    assert eager_load(Payment, PaymentSchema) == ()
+
+
+@pytest.fixture
+def busy_project(db, make_user):
+    """A client's project with applications, payments and messages from distinct creatives."""
+    client_user = make_user()
+    project = Project(client_id=client_user.id, title="Logo", description="New logo", category="design")
+    db.add(project)
+    db.commit()
+    creatives = [make_user(role="creative") for _ in range(PAGE)]
+    for creative in creatives:
+        db.add(Application(project_id=project.id, creative_id=creative.id, cover_letter="Hi", status="pending"))
+        db.add(Payment(project_id=project.id, client_id=client_user.id, creative_id=creative.id, amount=100, status="pending"))
+        db.add(Message(sender_id=creative.id, recipient_id=client_user.id, content="Hello", is_read=True))
+    db.commit()
+    # Serve the requests from an empty identity map, like a fresh session
+    db.expunge_all()
+    return client_user, project, creatives
+
+
+def test_list_endpoints_load_relationships_without_n_plus_one(client, login, busy_project, query_budget):
+    client_user, project, creatives = busy_project
+    login(client_user)
+
+    # project check + one page query each
+    with query_budget(2):
+        applications = client.get(f"/api/v1/applications/project/{project.id}").json()
+    with query_budget(2):
+        payments = client.get(f"/api/v1/payments/project/{project.id}").json()
+    with query_budget(1):
+        messages = client.get("/api/v1/messages/").json()
+
+    creative_ids = sorted(creative.id for creative in creatives)
+    assert sorted(a["creative"]["id"] for a in applications) == creative_ids
+    assert {p["project"]["id"] for p in payments} == {str(project.id)}
+    assert sorted(p["creative"]["id"] for p in payments) == creative_ids
+    assert sorted(m["sender"]["id"] for m in messages) == creative_ids
+
+
+def test_my_applications_load_projects(client, login, busy_project, query_budget):
+    _, project, creatives = busy_project
+    login(creatives[0])
+
+    with query_budget(1):
+        applications = client.get("/api/v1/applications/me").json()
+
+    assert [a["project"]["id"] for a in applications] == [str(project.id)]
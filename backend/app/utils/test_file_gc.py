@@ -0,0 +1,174 @@
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.multipart_upload import MultipartUpload
+from app.models.project import Project
+from app.models.project_file import ProjectFile
+from app.utils import file_gc
+from app.utils.file_gc import collect_unreferenced_blobs, expire_multipart_uploads
+from app.utils.file_storage import (
+    blob_path,
+    claim_parts,
+    multipart_directory,
+    part_path,
+    remove_temporary_files,
+    touch_blob,
+    trash_blob,
+)
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path))
+    return tmp_path
+
+
+def _blob(body: bytes, age: float = 0) -> str:
+    sha256 = hashlib.sha256(body).hexdigest()
+    path = blob_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+    _age(path, age)
+    return sha256
+
+
+def _age(path: str, age: float) -> None:
+    then = time.time() - age
+    os.utime(path, (then, then))
+
+
+def _project(db, user) -> Project:
+    project = Project(client_id=user.id, title="Shoot", description="A shoot", category="photography")
+    db.add(project)
+    db.commit()
+    return project
+
+
+def test_sweep_removes_only_old_unreferenced_blobs(db, make_user):
+    user = make_user(role="client")
+    project = _project(db, user)
+
+    referenced = _blob(b"referenced", age=7200)
+    db.add(ProjectFile(
+        id=uuid.uuid4(), project_id=project.id, uploader_id=user.id, filename="a.pdf",
+        file_url="/a", file_size=10, sha256=referenced,
+    ))
+    db.commit()
+    orphaned = _blob(b"orphaned", age=7200)
+    # Written by an upload whose row is not committed yet
+    fresh = _blob(b"fresh")
+    # Old, but just reused by a deduplicated upload
+    reused = _blob(b"reused", age=7200)
+    assert touch_blob(reused)
+
+    assert collect_unreferenced_blobs(db, grace_seconds=3600) == 1
+    assert not os.path.exists(blob_path(orphaned))
+    for sha256 in (referenced, fresh, reused):
+        assert os.path.exists(blob_path(sha256))
+
+
+def _add_file(db, project, user, sha256) -> None:
+    db.add(ProjectFile(
+        id=uuid.uuid4(), project_id=project.id, uploader_id=user.id, filename="a.pdf",
+        file_url="/a", file_size=10, sha256=sha256,
+    ))
+    db.commit()
+
+
+def test_sweep_puts_back_blobs_reused_while_it_ran(db, make_user, monkeypatch):
+    user = make_user(role="client")
+    project = _project(db, user)
+    recorded = _blob(b"recorded", age=7200)
+    touched = _blob(b"touched", age=7200)
+    deleted = _blob(b"deleted", age=7200)
+
+    def _trash_blob(sha256):
+        # Between the reference check and the move: one upload commits its
+        # row, another reuses the blob and has not committed yet
+        if sha256 == recorded:
+            _add_file(db, project, user, recorded)
+        elif sha256 == touched:
+            touch_blob(touched)
+        return trash_blob(sha256)
+
+    monkeypatch.setattr(file_gc, "trash_blob", _trash_blob)
+    assert collect_unreferenced_blobs(db, grace_seconds=3600) == 1
+    assert os.path.exists(blob_path(recorded))
+    assert os.path.exists(blob_path(touched))
+    assert not os.path.exists(blob_path(deleted))
+    assert os.listdir(os.path.dirname(blob_path(deleted))) == []
+
+
+def test_sweep_restores_blobs_left_in_the_trash(db, make_user):
+    user = make_user(role="client")
+    project = _project(db, user)
+    sha256 = _blob(b"interrupted", age=7200)
+    _add_file(db, project, user, sha256)
+    # A sweep died between moving the blob and checking it again
+    trashed, _ = trash_blob(sha256)
+
+    assert collect_unreferenced_blobs(db, grace_seconds=3600) == 0
+    assert os.path.exists(blob_path(sha256))
+    assert not os.path.exists(trashed)
+
+
+def _multipart_upload(db, project, user, age: float, part_age: float = None) -> uuid.UUID:
+    upload = MultipartUpload(
+        project_id=project.id, uploader_id=user.id, filename="cut.mov",
+        created_at=datetime.utcnow() - timedelta(seconds=age),
+    )
+    db.add(upload)
+    db.commit()
+    if part_age is not None:
+        path = part_path(upload.id, 1)
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(b"part")
+        _age(os.path.dirname(path), part_age)
+    return upload.id
+
+
+def test_sweep_expires_abandoned_multipart_uploads(db, make_user):
+    user = make_user(role="client")
+    project = _project(db, user)
+    day = 24 * 3600
+    abandoned = _multipart_upload(db, project, user, age=2 * day, part_age=2 * day)
+    never_sent = _multipart_upload(db, project, user, age=2 * day)
+    # Started long ago, but a part arrived recently
+    resumed = _multipart_upload(db, project, user, age=2 * day, part_age=60)
+    # Being completed right now
+    completing = _multipart_upload(db, project, user, age=2 * day, part_age=2 * day)
+    claim_parts(completing)
+    recent = _multipart_upload(db, project, user, age=60)
+    # Parts whose row is already gone
+    orphan = uuid.uuid4()
+    os.makedirs(multipart_directory(orphan))
+    _age(multipart_directory(orphan), 2 * day)
+
+    assert expire_multipart_uploads(db, ttl_seconds=day) == 3
+    remaining = {upload_id for (upload_id,) in db.query(MultipartUpload.id)}
+    assert remaining == {resumed, completing, recent}
+    for upload_id in (abandoned, orphan):
+        assert not os.path.exists(multipart_directory(upload_id))
+    assert os.path.exists(multipart_directory(resumed))
+    assert os.path.exists(f"{multipart_directory(completing)}.assembling")
+
+
+def test_sweep_removes_stale_temporary_files(upload_dir):
+    os.makedirs(upload_dir / "tmp")
+    stale, in_progress = str(upload_dir / "tmp" / "a"), str(upload_dir / "tmp" / "b")
+    for path in (stale, in_progress):
+        with open(path, "wb") as f:
+            f.write(b"partial upload")
+    _age(stale, 7200)
+
+    assert remove_temporary_files(time.time() - 3600) == 1
+    assert not os.path.exists(stale)
+    assert os.path.exists(in_progress)
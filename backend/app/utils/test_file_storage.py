@@ -0,0 +1,77 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.utils import file_storage
+from app.utils.file_storage import FileTooLargeError, commit_file, receive_file
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 4)
+    return tmp_path
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def test_received_in_fixed_size_blocks(upload_dir, monkeypatch):
+    blocks = []
+    write_block = file_storage._write_block
+
+    def recording_write(file, digest, block):
+        blocks.append(len(block))
+        write_block(file, digest, block)
+
+    monkeypatch.setattr(file_storage, "_write_block", recording_write)
+    stored = asyncio.run(receive_file(_chunks(b"ab", b"cdefghi", b"jk"), max_size=100))
+
+    assert blocks == [4, 4, 3]
+    assert stored.size == 11
+    assert stored.sha256 == hashlib.sha256(b"abcdefghijk").hexdigest()
+    destination = str(upload_dir / "project_files" / "x")
+    commit_file(stored, destination)
+    with open(destination, "rb") as f:
+        assert f.read() == b"abcdefghijk"
+
+
+def test_oversized_upload_is_discarded(upload_dir):
+    with pytest.raises(FileTooLargeError):
+        asyncio.run(receive_file(_chunks(b"abcd", b"efgh"), max_size=6))
+    assert os.listdir(upload_dir / "tmp") == []
+
+
+def _write_parts(directory, parts):
+    directory.mkdir(parents=True)
+    for number, body in enumerate(parts, start=1):
+        (directory / f"{number:05d}").write_bytes(body)
+
+
+def test_assemble_falls_back_when_kernel_copy_stops(upload_dir, monkeypatch):
+    directory = upload_dir / "multipart" / "upload"
+    parts = [b"first part", b"", b"second part"]
+    _write_parts(directory, parts)
+    copy_file_range = os.copy_file_range
+    calls = []
+
+    def flaky_copy(source, destination, count):
+        # Copy 3 bytes of the first part, then act like an unsupported filesystem
+        calls.append(count)
+        if len(calls) > 1:
+            raise OSError("not supported")
+        return copy_file_range(source, destination, 3)
+
+    monkeypatch.setattr(file_storage.os, "copy_file_range", flaky_copy)
+    stored = file_storage.assemble_parts(str(directory), file_storage.list_parts(str(directory)))
+
+    body = b"".join(parts)
+    with open(stored.path, "rb") as f:
+        assert f.read() == body
+    assert stored.size == len(body)
+    assert stored.sha256 == hashlib.sha256(body).hexdigest()
@@ -0,0 +1,85 @@
+import asyncio
+import io
+import json
+import os
+import shutil
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.core.config import settings
+from app.utils import images
+from app.utils.images import MANIFEST, avatar_directory, generate_derivatives, process_avatar, save_avatar_original
+
+
+class _StubPool(Executor):
+    """Executor whose jobs end with `outcome` instead of running."""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.shut_down = False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.outcome(future)
+        return future
+
+    def shutdown(self, wait=True, **kwargs):
+        self.shut_down = True
+
+
+def _process(monkeypatch, tmp_path, outcome):
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path))
+    pool = _StubPool(outcome)
+    monkeypatch.setattr(images, "get_process_pool", lambda: pool)
+    version = save_avatar_original(1, io.BytesIO(b"image"))
+    asyncio.run(process_avatar(1, version))
+    return pool, os.path.join(avatar_directory(1, version), MANIFEST)
+
+
+def _manifest(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_broken_pool_fails_the_avatar_and_is_discarded(monkeypatch, tmp_path):
+    pool, manifest = _process(monkeypatch, tmp_path, lambda future: future.set_exception(BrokenProcessPool()))
+    assert pool.shut_down
+    assert _manifest(manifest) == {"status": "failed", "derivatives": {}}
+
+
+def test_cancelled_job_fails_the_avatar(monkeypatch, tmp_path):
+    pool, manifest = _process(monkeypatch, tmp_path, lambda future: future.cancel())
+    assert not pool.shut_down
+    assert _manifest(manifest) == {"status": "failed", "derivatives": {}}
+
+
+def test_version_removed_while_processing_is_left_alone(monkeypatch, tmp_path):
+    def replaced(future):
+        # A newer upload removed this version's directory meanwhile
+        shutil.rmtree(os.path.join(tmp_path, "avatars", "1"))
+        future.set_exception(FileNotFoundError())
+
+    _, manifest = _process(monkeypatch, tmp_path, replaced)
+    assert not os.path.exists(manifest)
+
+
+def test_derivatives_are_resized_without_upscaling_or_metadata(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    source = tmp_path / "original"
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    Image.new("RGB", (300, 200), "red").save(source, "JPEG", exif=exif)
+
+    derivatives = generate_derivatives(str(source), str(tmp_path))
+
+    assert (derivatives["thumbnail"]["width"], derivatives["thumbnail"]["height"]) == (128, 128)
+    # Smaller than the card and full boxes: cropped square / kept as is
+    assert (derivatives["card"]["width"], derivatives["card"]["height"]) == (200, 200)
+    assert (derivatives["full"]["width"], derivatives["full"]["height"]) == (300, 200)
+    webp = derivatives["thumbnail"]["files"]["webp"]
+    with Image.open(os.path.join(tmp_path, webp)) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (128, 128)
+        assert not thumbnail.getexif()
@@ -0,0 +1,21 @@
+import argparse
+import sys
+import os
+
+# Add the app directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
+
+from app.db.database import get_db_context
+from app.db.conversations import rebuild_conversations
+
+def backfill_conversations(batch_size: int):
+    """Rebuild the conversations table from the messages table."""
+    with get_db_context() as db:
+        written = rebuild_conversations(db, batch_size=batch_size)
+    print(f"Rebuilt {written} conversations")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the materialized conversations table")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Users whose conversations are rebuilt per transaction")
+    args = parser.parse_args()
+    backfill_conversations(args.batch_size)
@@ -0,0 +1,128 @@
+"""
+Benchmark: /health latency while the API is handling a login storm.
+
+Runs the app in-process on one event loop (like a single uvicorn worker)
+against a throwaway SQLite database, samples /health latency on its own,
+then again while concurrent logins are in flight. With bcrypt running in
+the hashing pool the two p99s should stay close; with hashing on the event
+loop the storm p99 grows to several bcrypt rounds.
+
+Usage: python benchmarks/login_storm.py [--logins 50] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.main import app
+from app.db.database import Base, get_db, get_async_db
+from app.models.user import User
+from app.auth.password import get_password_hash
+
+EMAIL = "storm@example.com"
+PASSWORD = "password123"
+
+
+def setup_database():
+    path = os.path.join(tempfile.mkdtemp(), "login_storm.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+    with SessionLocal() as db:
+        db.add(User(
+            email=EMAIL,
+            hashed_password=get_password_hash(PASSWORD),
+            first_name="Storm",
+            last_name="User",
+            role="client",
+            is_active=True,
+        ))
+        db.commit()
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    AsyncSessionLocal = async_sessionmaker(
+        bind=create_async_engine(f"sqlite+aiosqlite:///{path}"),
+        expire_on_commit=False,
+    )
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def sample_health(client, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/v1/health")
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def login_storm(client, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/api/v1/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+
+
+async def main(logins: int, concurrency: int):
+    setup_database()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        idle = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_health(client, stop, idle))
+        await asyncio.sleep(1)
+        stop.set()
+        await sampler
+
+        storm = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_health(client, stop, storm))
+        start = time.perf_counter()
+        await login_storm(client, logins, concurrency)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await sampler
+
+    print(f"{logins} logins (concurrency {concurrency}) in {elapsed:.2f}s")
+    print(f"/health idle:  p50={percentile(idle, 50):.1f}ms p99={percentile(idle, 99):.1f}ms ({len(idle)} samples)")
+    print(f"/health storm: p50={percentile(storm, 50):.1f}ms p99={percentile(storm, 99):.1f}ms ({len(storm)} samples)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure /health latency during a login storm")
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency))
@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.main import app as fastapi_app
+from app.db.database import Base, get_db, get_async_db, get_read_db, get_async_read_db
+from app.auth.middleware import get_current_user
+from app.models.user import User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite engine on a throwaway file with the full schema created."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine):
+    """aiosqlite engine on the same database file as `engine`."""
+    # NullPool: TestClient runs each request on a fresh event loop
+    async_engine = create_async_engine(
+        engine.url.set(drivername="sqlite+aiosqlite"),
+        poolclass=NullPool,
+    )
+    yield async_engine
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Database session bound to the test engine."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(db, async_engine):
+    """API client whose DB dependencies use the test database."""
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    fastapi_app.dependency_overrides[get_db] = lambda: db
+    fastapi_app.dependency_overrides[get_async_db] = _get_async_db
+    fastapi_app.dependency_overrides[get_read_db] = lambda: db
+    fastapi_app.dependency_overrides[get_async_read_db] = _get_async_db
+    yield TestClient(fastapi_app)
+    fastapi_app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def login():
+    """Authenticate subsequent API calls as the given user."""
+    def _login(user: User) -> None:
+        fastapi_app.dependency_overrides[get_current_user] = lambda: user
+    return _login
+
+
+@pytest.fixture
+def make_user(db):
+    """Create and persist a user; keyword arguments override the defaults."""
+    counter = {"n": 0}
+
+    def _make_user(**overrides) -> User:
+        counter["n"] += 1
+        data = {
+            "email": f"user{counter['n']}@example.com",
+            "hashed_password": "not-a-real-hash",
+            "first_name": "Test",
+            "last_name": f"User{counter['n']}",
+            "role": "client",
+            "is_active": True,
+            "is_verified": True,
+        }
+        data.update(overrides)
+        user = User(**data)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    return _make_user
+
+
+@pytest.fixture
+def query_log(engine, async_engine):
+    """List that collects every SQL statement executed on the test engines."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _record)
+    yield statements
+    for target in (engine, async_engine.sync_engine):
+        event.remove(target, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def query_budget(query_log):
+    """
+    Context manager failing the test when its block runs more than
+    `max_queries` SQL statements, e.g. `with query_budget(3): client.get(...)`.
+    """
+    @contextmanager
+    def _query_budget(max_queries: int):
+        start = len(query_log)
+        yield
+        statements = query_log[start:]
+        if len(statements) > max_queries:
+            listing = "\n".join(f"  {' '.join(statement.split())[:200]}" for statement in statements)
+            pytest.fail(f"Ran {len(statements)} SQL statements, budget is {max_queries}:\n{listing}")
+    return _query_budget